@@ -0,0 +1,68 @@
+# benchmarks/bench_entry_memory.py
+"""
+Memory benchmark: per-entry footprint of the old 18-key dict versus the slotted AdmissionEntry.
+
+Builds N synthetic entries both ways and measures the memory allocated with tracemalloc.
+Field values are created up front and shared by both layouts, so only the container
+overhead is compared.
+
+Usage (from module_2): python -m benchmarks.bench_entry_memory [--entries N]
+"""
+import argparse
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scrape import AdmissionEntry, MISSING_VALUE, _JSON_KEY_TO_ATTR  # noqa: E402
+
+# Fields a typical GradCafe row fills in; everything else stays missing
+USUALLY_FILLED = ["University", "URL Link", "Program Field", "Program Degree Level", "Date Added",
+                  "Applicant Status", "Decision Date String", "Decision Full Text", "Program Start Term"]
+SOMETIMES_FILLED = ["GPA", "Student Status", "GRE Total or General", "Comments"]
+
+
+def _synthetic_values(entry_count, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for n in range(entry_count):
+        row = {key: f"{key} {n}" for key in USUALLY_FILLED}
+        row.update({key: f"{key} {n}" for key in SOMETIMES_FILLED if rng.random() < 0.5})
+        rows.append(row)
+    return rows
+
+
+def _as_dicts(rows):
+    return [{key: row.get(key, MISSING_VALUE) for key in _JSON_KEY_TO_ATTR} for row in rows]
+
+
+def _as_records(rows):
+    return [AdmissionEntry(**{attr: row.get(key) for key, attr in _JSON_KEY_TO_ATTR.items()}) for row in rows]
+
+
+def _measure(build, rows):
+    tracemalloc.start()
+    entries = build(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return current
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--entries", type=int, default=100_000, help="number of synthetic entries (default: 100000)")
+    args = arg_parser.parse_args()
+
+    rows = _synthetic_values(args.entries)
+    dict_bytes = _measure(_as_dicts, rows)
+    record_bytes = _measure(_as_records, rows)
+    print(f"{args.entries:,} entries")
+    print(f"dict entries:           {dict_bytes / 2**20:8.1f} MiB ({dict_bytes / args.entries:6.0f} bytes/entry)")
+    print(f"AdmissionEntry records: {record_bytes / 2**20:8.1f} MiB ({record_bytes / args.entries:6.0f} bytes/entry)")
+    print(f"reduction: {1 - record_bytes / dict_bytes:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_parse_workers.py
+"""
+Parse-stage scaling benchmark: pages/sec for a crawl replayed from a local cache with 0..N parse worker processes.
+
+Fills a temporary ResponseCache with survey pages of about 20 entries each, built from the test
+fixtures, and then runs iter_scrape_pages offline. With no network involved, parsing is the bottleneck.
+
+Usage (from module_2): python -m benchmarks.bench_parse_workers [--pages N] [--workers 0 1 2 4]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from http_cache import ResponseCache  # noqa: E402
+from scrape import _build_page_url, iter_scrape_pages  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+BASE_URL = "https://www.thegradcafe.com/survey/"
+
+
+def _split_table(page):
+    # -> (everything up to and including <tbody ...>, the table rows, </tbody> and everything after)
+    rows_start = page.index(">", page.index("<tbody")) + 1
+    rows_end = page.index("</tbody>")
+    return page[:rows_start], page[rows_start:rows_end], page[rows_end:]
+
+
+def _build_page_body():
+    # Splice the table rows of both fixture pages together a few times to get a realistically sized page
+    head, rows_1, tail = _split_table((FIXTURES_DIR / "survey_page_1.html").read_text())
+    _, rows_2, _ = _split_table((FIXTURES_DIR / "survey_page_2.html").read_text())
+    return (head + (rows_1 + rows_2) * 3 + tail).encode("utf-8")
+
+
+def _run(cache, pages, parse_workers, parser):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        entry_count = sum(len(entries) for _, entries in iter_scrape_pages(
+            BASE_URL, max_pages=pages, max_entries=10**9, concurrency=4, parser=parser,
+            cache=cache, offline=True, parse_workers=parse_workers))
+    return pages / (time.perf_counter() - start), entry_count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--pages", type=int, default=400, help="pages in the replayed crawl (default: 400)")
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4],
+                            help="parse worker counts to try; 0 parses inline (default: 0 1 2 4)")
+    arg_parser.add_argument("--parser", default="html.parser", help="BeautifulSoup backend (default: html.parser)")
+    args = arg_parser.parse_args()
+
+    body = _build_page_body()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ResponseCache(cache_dir, max_bytes=len(body) * (args.pages + 1))
+        for page_num in range(1, args.pages + 1):
+            cache.put(_build_page_url(BASE_URL, page_num), body)
+        print(f"{args.pages} cached pages, {os.cpu_count()} CPUs, parser={args.parser}")
+        baseline = None
+        for parse_workers in args.workers:
+            pages_per_sec, entry_count = _run(cache, args.pages, parse_workers, args.parser)
+            baseline = baseline or pages_per_sec
+            label = "inline" if parse_workers == 0 else f"{parse_workers} worker{'s' if parse_workers > 1 else ''}"
+            print(f"{label:>10}: {pages_per_sec:8.1f} pages/sec ({entry_count} entries, {pages_per_sec / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
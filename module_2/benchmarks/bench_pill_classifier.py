@@ -0,0 +1,125 @@
+# benchmarks/bench_pill_classifier.py
+"""
+Microbenchmark for the pill classifier in scrape._parse_entry_details.
+
+Replays the pill strings in tests/fixtures/pill_corpus.json through the current
+classifier and through the original per-pill re.search cascade (kept below as
+_legacy_parse_entry_details) and prints pills/sec for both.
+
+Usage (from module_2): python -m benchmarks.bench_pill_classifier [--rounds N]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scrape import AdmissionEntry, _parse_entry_details  # noqa: E402
+
+CORPUS_PATH = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "pill_corpus.json"
+
+
+class _Pill:
+    """Stands in for a bs4 pill div so that only classification is timed, not tree traversal."""
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def get_text(self, strip=False):
+        return self.text.strip() if strip else self.text
+
+
+def _legacy_parse_entry_details(elements_to_search, entry_data_dict):
+    for detail_div in elements_to_search:
+        text_content = detail_div.get_text(strip=True)
+        parsed_this_detail = False
+
+        if entry_data_dict.get("GPA", "N/A") == "N/A":
+            gpa_match = re.search(r'GPA\s*([\d\.]+)(?:\s*/\s*[\d\.]+)?', text_content, re.IGNORECASE)
+            if gpa_match: entry_data_dict["GPA"] = gpa_match.group(1); parsed_this_detail = True
+        if parsed_this_detail: continue
+
+        if "GRE" in text_content.upper():
+            updated_any_gre = False
+            if entry_data_dict.get("GRE Verbal", "N/A") == "N/A":
+                v_match = re.search(r'V\s*[:\s]?\s*(\d{2,3})', text_content, re.IGNORECASE)
+                if v_match: entry_data_dict["GRE Verbal"] = v_match.group(1); updated_any_gre = True
+            if entry_data_dict.get("GRE Quant", "N/A") == "N/A":
+                q_match = re.search(r'Q\s*[:\s]?\s*(\d{2,3})', text_content, re.IGNORECASE)
+                if q_match: entry_data_dict["GRE Quant"] = q_match.group(1); updated_any_gre = True
+            if entry_data_dict.get("GRE AWA", "N/A") == "N/A":
+                aw_match = re.search(r'AW\s*[:\s]?\s*(\d\.\d|\d)', text_content, re.IGNORECASE)
+                if aw_match: entry_data_dict["GRE AWA"] = aw_match.group(1); updated_any_gre = True
+            if not updated_any_gre and entry_data_dict.get("GRE Total or General", "N/A") == "N/A":
+                general_gre_match = re.search(r'GRE\s+(\d{3})', text_content, re.IGNORECASE)
+                if general_gre_match: entry_data_dict["GRE Total or General"] = general_gre_match.group(1); updated_any_gre = True
+            if updated_any_gre: parsed_this_detail = True
+        if parsed_this_detail: continue
+
+        if entry_data_dict.get("TOEFL", "N/A") == "N/A":
+            toefl_match = re.search(r'TOEFL\s*[:\s]?\s*(\d{2,3})', text_content, re.IGNORECASE)
+            if toefl_match: entry_data_dict["TOEFL"] = toefl_match.group(1); parsed_this_detail = True
+        if parsed_this_detail: continue
+
+        if entry_data_dict.get("Program Start Term", "N/A") == "N/A":
+            term_match = re.search(r'(Fall|Spring|Summer|Winter)\s*(\d{4})', text_content, re.IGNORECASE)
+            if term_match: entry_data_dict["Program Start Term"] = f"{term_match.group(1)} {term_match.group(2)}"; parsed_this_detail = True
+        if parsed_this_detail: continue
+
+        if entry_data_dict.get("Student Status", "N/A") == "N/A":
+            if "international" in text_content.lower(): entry_data_dict["Student Status"] = "International"; parsed_this_detail = True
+        if parsed_this_detail: continue
+
+        decision_keywords = ["accepted", "rejected", "wait listed", "admitted", "denied"]
+        if any(keyword in text_content.lower() for keyword in decision_keywords):
+            if entry_data_dict.get("Applicant Status") == "Other" or entry_data_dict.get("Applicant Status") == "N/A" or \
+               text_content.lower() != entry_data_dict.get("Decision Full Text","").lower():
+                entry_data_dict["Decision Full Text"] = text_content
+                status_match = re.match(r'(Accepted|Rejected|Wait listed|Admitted|Denied|Other)(?:\s+on\s+(.*))?', text_content, re.IGNORECASE)
+                if status_match:
+                    entry_data_dict["Applicant Status"] = status_match.group(1).strip()
+                    entry_data_dict["Decision Date String"] = status_match.group(2).strip() if status_match.group(2) else "N/A"
+                else: entry_data_dict["Applicant Status"] = "Other"
+            parsed_this_detail = True
+        if parsed_this_detail: continue
+
+        if entry_data_dict.get("Comments Cue", "N/A") == "N/A":
+            if "see more" in text_content.lower() or "report" in text_content.lower():
+                entry_data_dict["Comments Cue"] = text_content; parsed_this_detail = True
+
+
+def _empty_entry_dict():
+    return AdmissionEntry().to_dict()
+
+
+def _time_classifier(classify, make_entry, cases, rounds):
+    pill_count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for initial, pills in cases:
+            entry = make_entry(initial)
+            classify(pills, entry)
+            pill_count += len(pills)
+    return pill_count / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--rounds", type=int, default=2000, help="passes over the corpus (default: 2000)")
+    args = arg_parser.parse_args()
+
+    corpus = json.loads(CORPUS_PATH.read_text())
+    cases = [(case["initial"], [_Pill(text) for text in case["pills"]]) for case in corpus]
+    print(f"Corpus: {len(cases)} pill groups, {sum(len(p) for _, p in cases)} pills, {args.rounds} rounds")
+    before = _time_classifier(_legacy_parse_entry_details, lambda initial: {**_empty_entry_dict(), **initial}, cases, args.rounds)
+    after = _time_classifier(_parse_entry_details, AdmissionEntry.from_dict, cases, args.rounds)
+    print(f"before (re.search cascade): {before:12,.0f} pills/sec")
+    print(f"after  (precompiled table): {after:12,.0f} pills/sec")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
 import re
 
-def clean_data(entries_list):
+def iter_clean_data(entries):
     """
-    Performs data cleaning on the list of scraped admission entries.
+    Generator version of clean_data: takes any iterable of scraped admission entries (AdmissionEntry
+    records or dicts) and yields each one cleaned as a dict, so the scrape -> clean -> save pipeline never holds the whole dataset.
     - Removes "Other Misc Details" key (as it was removed from collection).
     - Ensures "Comments" is a string (N/A if no actual comments).
     """
-    # print(f"Cleaning {len(entries_list)} entries...") # Optional progress message
-    cleaned_entries = []
-    for entry in entries_list:
+    for entry in entries:
+        # Records from scrape.py (AdmissionEntry) are turned into the JSON output dict here
+        if hasattr(entry, "to_dict"): entry = entry.to_dict()
+
         # "Other Misc Details" is no longer added, so no need to pop if get_empty_admission_entry is source
         # However, if it somehow slipped in, this would remove it:
         entry.pop("Other Misc Details", None) 
@@ -23,5 +25,11 @@ def clean_data(entries_list):
             # This is just a placeholder, actual date cleaning can be complex
             pass 
 
-        cleaned_entries.append(entry)
-    return cleaned_entries
\ No newline at end of file
+        yield entry
+
+def clean_data(entries_list):
+    """
+    Performs data cleaning on the list of scraped admission entries (see iter_clean_data).
+    """
+    # print(f"Cleaning {len(entries_list)} entries...") # Optional progress message
+    return list(iter_clean_data(entries_list))
@@ -0,0 +1,61 @@
+"""
+Declarative mapping from the scraper's output to the record layout module_5/load_data.py loads into the
+applicants table. Both sides use this one table: scrape.py (AdmissionEntry.to_loader_dict) to hand records
+straight to the loader, and load_data.py to read a scraper output file as it is, without a re-shaping pass.
+FIELD_MAP is compiled once at import into one mapper for AdmissionEntry records and one for JSON dicts.
+"""
+import datetime
+from functools import lru_cache
+
+MISSING_VALUE = "N/A" # same marker as scrape.MISSING_VALUE, which the loader also reads as missing
+SCRAPED_DATE_FORMAT = "%B %d, %Y" # "Date Added" as GradCafe shows it, e.g. "May 28, 2025"
+SCRAPER_MARKER_KEY = "Program Field" # only scraper output has this key (the loader calls it "Program Name")
+
+# (loader key, scraper JSON key, AdmissionEntry attribute, coercion) in the loader's column order.
+# "text" passes the value through; "date" turns a scraped date into the ISO date the loader expects.
+FIELD_MAP = (
+    ("University", "University", "university", "text"),
+    ("Program Name", "Program Field", "program_field", "text"),
+    ("Degree", "Program Degree Level", "program_degree_level", "text"),
+    ("Applicant Status", "Applicant Status", "applicant_status", "text"),
+    ("Decision Date", "Decision Date String", "decision_date_string", "text"),
+    ("Date Added", "Date Added", "date_added", "date"),
+    ("Semester Start", "Program Start Term", "program_start_term", "text"),
+    ("Student Type", "Student Status", "student_status", "text"),
+    ("GPA", "GPA", "gpa", "text"),
+    ("GRE Total", "GRE Total or General", "gre_total_or_general", "text"),
+    ("GRE V", "GRE Verbal", "gre_verbal", "text"),
+    ("GRE Q", "GRE Quant", "gre_quant", "text"),
+    ("GRE AW", "GRE AWA", "gre_awa", "text"),
+    ("Comment", "Comments", "comments", "text"),
+    ("URL", "URL Link", "url_link", "text"),
+)
+
+@lru_cache(maxsize=4096) # a scrape only spans a few hundred distinct dates, and strptime is slow
+def _scraped_date_to_iso(value):
+    try:
+        return datetime.datetime.strptime(value.strip(), SCRAPED_DATE_FORMAT).date().isoformat()
+    except (ValueError, AttributeError):
+        return MISSING_VALUE
+
+_COERCIONS = {"text": None, "date": _scraped_date_to_iso} # None: the value is used as is
+
+def _compile(source_column, read):
+    # Resolves names and coercions once, so mapping a record is a single loop over ready-made steps
+    steps = tuple((row[0], row[source_column], _COERCIONS[row[3]]) for row in FIELD_MAP)
+
+    def to_loader_record(entry):
+        record = {}
+        for loader_key, source, coerce in steps:
+            value = read(entry, source)
+            if value is None: value = MISSING_VALUE
+            record[loader_key] = coerce(value) if coerce else value
+        return record
+    return to_loader_record
+
+loader_record_from_dict = _compile(1, dict.get) # scraper JSON dict (e.g. a line of the output file) -> loader record
+loader_record_from_entry = _compile(2, getattr) # scrape.AdmissionEntry -> loader record
+
+def is_scraper_record(record):
+    """True if `record` is a dict in the scraper's output format rather than the loader's."""
+    return isinstance(record, dict) and SCRAPER_MARKER_KEY in record
@@ -1,25 +1,128 @@
 import json
+import os
 
-def save_data(entries_list, filename):
-    """Saves the list of entry dictionaries to a JSON file."""
-    # print(f"Saving {len(entries_list)} entries to {filename}...") # Optional
+from json_stream import iter_json_records # the streaming reader module_5's loader uses too
+
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+def is_jsonl_filename(filename):
+    """True if `filename` should hold newline-delimited JSON (one entry per line) rather than a JSON array."""
+    return filename.lower().endswith(JSONL_EXTENSIONS)
+
+class JsonLinesWriter:
+    """
+    Append-only writer for newline-delimited JSON: one entry per line, flushed after every batch
+    so that readers can follow the file while the scrape is still running.
+    """
+    def __init__(self, filename, append=True):
+        self.filename = filename
+        self.entries_written = 0
+        self._file = open(filename, 'a' if append else 'w', encoding='utf-8')
+
+    def write_entries(self, entries):
+        for entry in entries:
+            self._file.write(json.dumps(entry) + "\n")
+            self.entries_written += 1
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def truncate_jsonl(filename, keep_entries):
+    """Cuts a JSON Lines file back to its first `keep_entries` entries (e.g. to drop pages written after the last checkpoint)."""
+    with open(filename, 'rb+') as f:
+        for _ in range(keep_entries):
+            if not f.readline(): return
+        f.truncate(f.tell())
+
+def _write_json_array(entries, f):
+    # Streams entries out in exactly the layout json.dump(entries_list, f, indent=2) would produce
+    entry_count = 0
+    f.write("[")
+    for entry in entries:
+        f.write(",\n  " if entry_count else "\n  ")
+        f.write(json.dumps(entry, indent=2).replace("\n", "\n  "))
+        entry_count += 1
+    f.write("\n]" if entry_count else "]")
+    return entry_count
+
+def save_data(entries, filename):
+    """
+    Saves entry dictionaries to a JSON file (or a JSON Lines file for .jsonl/.ndjson names).
+    `entries` can be any iterable, including a generator: it is written out one entry at a time into a
+    temporary file that then replaces `filename`, so it may safely be read from `filename` itself.
+    Returns the number of entries written.
+    """
+    temp_filename = f"{filename}.tmp"
     try:
-        with open(filename, 'w') as f:
-            json.dump(entries_list, f, indent=2)
-        print(f"JSON file ready at {filename} (Total entries: {len(entries_list)})")
+        if is_jsonl_filename(filename):
+            with JsonLinesWriter(temp_filename, append=False) as writer:
+                writer.write_entries(entries)
+            entry_count = writer.entries_written
+        else:
+            with open(temp_filename, 'w') as f:
+                entry_count = _write_json_array(entries, f)
+        os.replace(temp_filename, filename)
+        print(f"JSON file ready at {filename} (Total entries: {entry_count})")
+        return entry_count
     except IOError:
         print(f"Error: Could not write to file {filename}")
+    return 0
+
+def iter_data(filename, partial=False):
+    """
+    Yields entries one at a time from a JSON array file or a JSON Lines file (detected from the content).
+    A last line without a newline is read like any other. With partial=True, for following a JSON Lines file
+    that is still being written, such a line is skipped instead if it does not decode (the writer is mid-entry).
+    Raises FileNotFoundError / json.JSONDecodeError like json.load.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        yield from iter_json_records(f, partial=partial)
 
 def load_data(filename):
-    """Loads data from a JSON file."""
+    """Loads data from a JSON or JSON Lines file."""
     print(f"Loading data from {filename}...")
     try:
-        with open(filename, 'r') as f:
-            entries_list = json.load(f)
+        entries_list = list(iter_data(filename))
         print(f"Successfully loaded {len(entries_list)} entries.")
         return entries_list
     except FileNotFoundError:
         print(f"Error: File {filename} not found.")
     except json.JSONDecodeError:
         print(f"Error: Could not decode JSON from {filename}.")
-    return []
\ No newline at end of file
+    return []
+
+def save_checkpoint(filename, last_page, new_entries, output_entries):
+    """
+    Atomically writes the crawl checkpoint: the last completed page, how many entries the crawl has
+    collected so far and how many entries the (JSON Lines) file they were streamed to held at that point.
+    """
+    checkpoint = {"last_page": last_page, "new_entries": new_entries, "output_entries": output_entries}
+    temp_filename = f"{filename}.tmp"
+    try:
+        with open(temp_filename, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_filename, filename) # a crash mid-write never leaves a truncated checkpoint behind
+    except IOError:
+        print(f"Error: Could not write checkpoint file {filename}")
+
+def load_checkpoint(filename):
+    """Returns the checkpoint dict written by save_checkpoint, or None if there is no usable checkpoint."""
+    try:
+        with open(filename, 'r') as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        print(f"No checkpoint found at {filename}.")
+        return None
+    except json.JSONDecodeError:
+        checkpoint = None
+    if not isinstance(checkpoint, dict) or not all(isinstance(checkpoint.get(key), int) for key in ("last_page", "new_entries", "output_entries")):
+        print(f"Error: Checkpoint file {filename} is corrupt. Ignoring it.")
+        return None
+    return checkpoint
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_TTL_SECONDS = 6 * 60 * 60 # How long a cached page is served without asking the server again
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024 # Least recently used pages are evicted beyond this total body size
+
+CachedResponse = namedtuple("CachedResponse", ["url", "body", "etag", "last_modified", "fetched_at"])
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache keyed by URL.
+    Each page is stored as <sha256>.body (raw bytes) plus <sha256>.json (URL, ETag, Last-Modified,
+    fetch time and size). The metadata file's mtime records the last access and drives LRU eviction
+    once the bodies exceed `max_bytes`. Safe to share between fetch threads.
+    """
+    def __init__(self, directory, ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = {} # key -> [last_access, size]
+        os.makedirs(directory, exist_ok=True)
+        for filename in os.listdir(directory):
+            if not filename.endswith(".json"): continue
+            key = filename[:-len(".json")]
+            try:
+                with open(self._meta_path(key), 'r') as f:
+                    size = json.load(f)["size"]
+                self._index[key] = [os.path.getmtime(self._meta_path(key)), size]
+            except (OSError, ValueError, KeyError):
+                self._remove_files(key) # unreadable entry; drop it
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return sum(size for _, size in self._index.values())
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, f"{key}.body")
+
+    def _remove_files(self, key):
+        for path in (self._meta_path(key), self._body_path(key)):
+            try: os.remove(path)
+            except FileNotFoundError: pass
+
+    def get(self, url):
+        """Returns the CachedResponse for `url` (fresh or not), or None if it is not cached."""
+        key = self._key(url)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            try:
+                with open(self._meta_path(key), 'r') as f:
+                    meta = json.load(f)
+                with open(self._body_path(key), 'rb') as f:
+                    body = f.read()
+            except (OSError, ValueError):
+                self._remove_files(key)
+                del self._index[key]
+                self.misses += 1
+                return None
+            now = time.time()
+            os.utime(self._meta_path(key), (now, now))
+            self._index[key][0] = now
+            self.hits += 1
+        return CachedResponse(meta["url"], body, meta.get("etag"), meta.get("last_modified"), meta["fetched_at"])
+
+    def is_fresh(self, cached_response):
+        return time.time() - cached_response.fetched_at < self.ttl_seconds
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Stores a freshly fetched page, then evicts least recently used pages if over `max_bytes`."""
+        key = self._key(url)
+        with self._lock:
+            self._write_atomic(self._body_path(key), body)
+            self._write_meta(key, url, etag, last_modified, len(body))
+            self._evict()
+
+    def refresh(self, cached_response):
+        """Marks a cached page as just validated by the server (after a 304 Not Modified)."""
+        key = self._key(cached_response.url)
+        with self._lock:
+            if key in self._index:
+                self._write_meta(key, cached_response.url, cached_response.etag, cached_response.last_modified, len(cached_response.body))
+
+    def _write_meta(self, key, url, etag, last_modified, size):
+        now = time.time()
+        meta = {"url": url, "etag": etag, "last_modified": last_modified, "fetched_at": now, "size": size}
+        self._write_atomic(self._meta_path(key), json.dumps(meta).encode("utf-8"))
+        self._index[key] = [now, size]
+
+    def _write_atomic(self, path, data):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _evict(self):
+        total_bytes = sum(size for _, size in self._index.values())
+        for key, (_, size) in sorted(self._index.items(), key=lambda item: item[1][0]):
+            if total_bytes <= self.max_bytes: break
+            self._remove_files(key)
+            del self._index[key]
+            total_bytes -= size
@@ -0,0 +1,177 @@
+# module_2/json_stream.py
+"""
+Incremental reader for the files the scraper writes: a single JSON array or
+JSON Lines.
+
+`json.load` parses the whole file into one list before the first record can
+be cleaned, so a multi-GB scrape archive runs out of memory before a single
+row is loaded. `iter_json_array` reads the file a chunk at a time and decodes
+one element at a time with the C scanner behind `json.load`, so memory use is
+bounded by the chunk size plus the largest single element, whatever the size
+of the file. `iter_json_records` also reads JSON Lines files (one record per
+line), the other format the scraper writes.
+
+file_ops.py reads through this module, and module_5's load_data.py imports it
+by path like field_map.py, so both modules parse the files the same way.
+"""
+import json
+import re
+
+READ_CHUNK_CHARS = 1 << 20
+
+_scan_once = json.JSONDecoder().scan_once  # pylint: disable=invalid-name
+_WHITESPACE = ' \t\n\r'
+_NON_WHITESPACE = re.compile(r'[^ \t\n\r]')
+_DELIMITER = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9eE.+-]*')  # what the rest of a cut-off number may look like
+
+
+class _ChunkedText:
+    """A sliding window over a text file; text before `pos` has been consumed."""
+
+    def __init__(self, f, chunk_chars):
+        self._f = f
+        self._chunk_chars = chunk_chars
+        self.text = ''
+        self.pos = 0
+
+    def read_more(self):
+        """Appends the next chunk and drops the consumed text; False at end of file."""
+        chunk = self._f.read(self._chunk_chars)
+        if not chunk:
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def next_char(self):
+        """Skips whitespace and returns the next character, or '' at end of file."""
+        while True:
+            match = _NON_WHITESPACE.search(self.text, self.pos)
+            if match:
+                self.pos = match.start()
+                return self.text[self.pos]
+            self.pos = len(self.text)
+            if not self.read_more():
+                return ''
+
+    def next_delimiter(self):
+        """Consumes the ',' or ']' after an element (and any whitespace) and returns it."""
+        match = _DELIMITER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return match.group(1)
+        char = self.next_char()  # the delimiter or what follows it is in the next chunk
+        if char not in (',', ']'):
+            raise self.error("Expecting ',' delimiter")
+        self.pos += 1
+        return char
+
+    def decode_value(self):
+        """Decodes the JSON value at `pos`, reading further chunks until it is complete."""
+        while True:
+            try:
+                value, end = _scan_once(self.text, self.pos)
+            except (StopIteration, json.JSONDecodeError) as e:
+                if self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                    self.next_char()  # whitespace left over at a chunk boundary
+                    continue
+                if self.read_more():
+                    continue  # the value is cut off by the end of the window
+                if isinstance(e, json.JSONDecodeError):
+                    raise
+                raise self.error("Expecting value") from None
+            if (isinstance(value, (int, float)) and _NUMBER_TAIL.fullmatch(self.text, end)
+                    and self.read_more()):
+                continue  # a number cut off by the end of the window goes on in the next chunk
+            self.pos = end
+            return value
+
+    def error(self, message):
+        """Returns a JSONDecodeError pointing at `pos`."""
+        return json.JSONDecodeError(message, self.text, self.pos)
+
+
+def iter_json_array(f, chunk_chars=READ_CHUNK_CHARS):
+    """
+    Yields the elements of the JSON array in a text file one at a time.
+
+    Args:
+        f (io.TextIOBase): The open file, positioned at the start of the array.
+        chunk_chars (int, optional): Characters read from `f` at a time.
+
+    Yields:
+        object: Each element, decoded like `json.load` would decode it.
+
+    Raises:
+        json.JSONDecodeError: If the file does not hold exactly one JSON array;
+                              elements before the error have been yielded.
+    """
+    window = _ChunkedText(f, chunk_chars)
+    if window.next_char() != '[':
+        raise window.error("Expecting '['")
+    window.pos += 1
+    if window.next_char() == ']':
+        window.pos += 1
+    else:
+        text, pos = window.text, window.pos
+        while True:
+            # Fast path: the element and the delimiter after it are both in the window
+            try:
+                value, end = _scan_once(text, pos)
+                match = _DELIMITER.match(text, end)
+            except (StopIteration, json.JSONDecodeError):
+                match = None
+            if match:
+                yield value
+                pos = match.end()
+                if match.group(1) == ']':
+                    window.pos = pos
+                    break
+                continue
+            window.pos = pos
+            yield window.decode_value()
+            if window.next_delimiter() == ']':
+                break
+            text, pos = window.text, window.pos
+    if window.next_char():
+        raise window.error("Extra data")
+
+
+def iter_json_records(f, chunk_chars=READ_CHUNK_CHARS, partial=False):
+    """
+    Yields the records of a JSON array file or a JSON Lines file one at a time.
+
+    The format is told by the first non-whitespace character: '[' starts an
+    array, anything else is read as one JSON value per non-blank line.
+
+    Args:
+        f (io.TextIOBase): The open, seekable file, positioned at its start.
+        chunk_chars (int, optional): Characters read from `f` at a time
+                                     for a JSON array.
+        partial (bool, optional): The JSON Lines file may still be being
+                                  written: a last line with no newline that
+                                  does not decode is skipped, not an error.
+
+    Yields:
+        object: Each record, decoded like `json.loads` would decode it.
+
+    Raises:
+        json.JSONDecodeError: If the array or a line is not valid JSON.
+    """
+    start = f.tell()
+    first_char = _ChunkedText(f, chunk_chars).next_char()
+    f.seek(start)
+    if first_char == '[':
+        yield from iter_json_array(f, chunk_chars)
+        return
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            if partial and not line.endswith('\n'):
+                return  # the writer is in the middle of this record
+            raise
+        yield record
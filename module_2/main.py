@@ -1,35 +1,148 @@
 # main.py
-from scrape import scrape_data # scrape.py contains scrape_data
-from clean import clean_data     # Aclean.py contains clean_data
-from file_ops import save_data, load_data # file_ops.py for these
+import argparse
+import itertools
+import os
+
+from scrape import iter_scrape_pages # scrape.py contains the scraping generators
+from http_cache import ResponseCache
+from clean import iter_clean_data     # clean.py contains the cleaning generator
+from file_ops import (save_data, iter_data, save_checkpoint, load_checkpoint, # file_ops.py for these
+                      is_jsonl_filename, JsonLinesWriter, truncate_jsonl)
 
 # --- Configuration for the main run ---
 BASE_SEARCH_URL = "https://www.thegradcafe.com/survey/"
-OUTPUT_FILENAME = "applicant_data.json"
+OUTPUT_FILENAME = "applicant_data.json" # Use a .jsonl name to stream entries to disk page by page
+PARTIAL_SUFFIX = ".partial.jsonl" # Pages for a .json output are streamed here first, then converted
+CHECKPOINT_FILENAME = "scrape_checkpoint.json"
 MAX_PAGES_TO_SCRAPE = 500  # Adjust as needed
 MAX_ENTRIES_TO_SCRAPE = 10000 # Assignment limit
+FETCH_CONCURRENCY = 4 # Pages fetched in parallel (1 = sequential)
+REQUESTS_PER_SECOND = 2 # Per-host rate limit; None disables it
+HTML_PARSER = "lxml" # "lxml" (fast, C-based) or "html.parser" (pure Python fallback)
+PARSE_WORKERS = 0 # Worker processes for parsing (0 = parse in this process); worth raising for --offline replays
+CACHE_DIR = ".http_cache" # Used by --cache / --offline
+CACHE_TTL_SECONDS = 6 * 60 * 60 # Cached pages younger than this are not re-requested
+CACHE_MAX_BYTES = 512 * 1024 * 1024 # Least recently used pages are evicted beyond this
+
+def _read_known_urls(filename):
+    # Returns the URL Links already in `filename` and how many entries it holds
+    known_urls, entry_count = set(), 0
+    try:
+        for entry in iter_data(filename):
+            entry_count += 1
+            if entry.get("URL Link", "N/A") != "N/A": known_urls.add(entry["URL Link"])
+    except FileNotFoundError:
+        print(f"No previous dataset at {filename}; scraping everything.")
+    return known_urls, entry_count
 
-def main_process():
+def main_process(resume=False, incremental=False, output_filename=None, use_cache=False, offline=False, parse_workers=None):
+    """
+    Runs scrape -> clean -> save as one streaming pipeline: each page flows through iter_clean_data
+    into a JSON Lines work file, so memory use does not grow with the number of entries. For a .jsonl
+    output the work file is the output itself; for a .json output it is converted into a JSON array at the end.
+    """
+    output_filename = output_filename or OUTPUT_FILENAME
+    cache = ResponseCache(CACHE_DIR, CACHE_TTL_SECONDS, CACHE_MAX_BYTES) if use_cache or offline else None
+    stream_output = is_jsonl_filename(output_filename)
+    work_filename = output_filename if stream_output else output_filename + PARTIAL_SUFFIX
     print("Starting GradCafe Scraper...")
-    
-    # Call scrape_data from scrape.py
-    raw_data = scrape_data(BASE_SEARCH_URL, max_pages=MAX_PAGES_TO_SCRAPE, max_entries=MAX_ENTRIES_TO_SCRAPE)
-    
-    if raw_data:
-        # print(f"Raw data contains {len(raw_data)} entries.") # Optional debug
-        
-        # Call clean_data from clean.py
-        cleaned_entries = clean_data(raw_data)
-        # print(f"Cleaned data contains {len(cleaned_entries)} entries.") # Optional debug
-        
-        # Call save_data from file_ops.py
-        save_data(cleaned_entries, OUTPUT_FILENAME)
-        
-        
-    else: 
-        print("No data was scraped.")
-    
+
+    new_entry_count = 0
+    work_entry_count = 0 # entries already in the work file before this run appends to it
+    start_page = 1
+    checkpoint = load_checkpoint(CHECKPOINT_FILENAME) if resume else None
+    if checkpoint:
+        try:
+            truncate_jsonl(work_filename, checkpoint["output_entries"]) # drop anything written after the checkpoint
+        except FileNotFoundError:
+            # The entries the checkpoint counts are gone, so the crawl has to start over
+            print(f"Work file {work_filename} not found; ignoring the checkpoint and starting from page 1.")
+            checkpoint = None
+    if checkpoint:
+        start_page = checkpoint["last_page"] + 1
+        new_entry_count = checkpoint["new_entries"]
+        work_entry_count = checkpoint["output_entries"]
+        print(f"Resuming after page {checkpoint['last_page']} with {new_entry_count} entries already collected.")
+
+    # In incremental mode, stop at the first entry we already have from the previous run
+    known_urls = None
+    if incremental:
+        known_urls, previous_entry_count = _read_known_urls(output_filename)
+        if stream_output and not checkpoint: work_entry_count = previous_entry_count
+
+    # An incremental .jsonl run appends after the previous entries; a .json run puts them in front (see below)
+    writer = JsonLinesWriter(work_filename, append=bool(checkpoint) or (incremental and stream_output))
+    last_completed_page = start_page - 1
+    failed_pages = [] # a fetch failure ends the crawl early, so the run is not complete
+
+    def save_progress():
+        save_checkpoint(CHECKPOINT_FILENAME, last_completed_page, new_entry_count, work_entry_count + writer.entries_written)
+
+    remaining_entries = MAX_ENTRIES_TO_SCRAPE - new_entry_count
+    try:
+        if start_page <= MAX_PAGES_TO_SCRAPE and remaining_entries > 0:
+            # Call iter_scrape_pages from scrape.py
+            pages = iter_scrape_pages(BASE_SEARCH_URL, max_pages=MAX_PAGES_TO_SCRAPE, max_entries=remaining_entries,
+                                      concurrency=FETCH_CONCURRENCY, requests_per_second=REQUESTS_PER_SECOND,
+                                      parser=HTML_PARSER, start_page=start_page, known_urls=known_urls,
+                                      cache=cache, offline=offline,
+                                      parse_workers=PARSE_WORKERS if parse_workers is None else parse_workers,
+                                      on_fetch_failure=failed_pages.append)
+            for page_num, page_entries in pages:
+                writer.write_entries(iter_clean_data(page_entries))
+                new_entry_count += len(page_entries)
+                last_completed_page = page_num
+                save_progress() # only a few numbers, so cheap enough to do every page
+    except BaseException:
+        # Keep whatever was completed so that --resume can pick up from here
+        save_progress()
+        print(f"\nScrape interrupted. Checkpoint saved after page {last_completed_page}; rerun with --resume.")
+        raise
+    finally:
+        writer.close()
+
+    if failed_pages:
+        # Keep the checkpoint and work file, as after a crash, so that --resume retries the failed page
+        save_progress()
+        print(f"\nCould not fetch page {failed_pages[0]}. Checkpoint saved after page {last_completed_page}; rerun with --resume.")
+        return
+
+    if stream_output:
+        print(f"JSON Lines file ready at {output_filename} (New entries: {new_entry_count})")
+
+    elif new_entry_count:
+        # Newest results come first on GradCafe, so new entries go in front of the previous dataset
+        entries = iter_data(work_filename)
+        if incremental and os.path.exists(output_filename):
+            print(f"Adding {new_entry_count} new entries to the previous dataset.")
+            entries = itertools.chain(entries, iter_data(output_filename))
+        save_data(entries, output_filename)
+
+    else:
+        print("No new data was scraped." if incremental else "No data was scraped.")
+
+    if cache: print(f"HTTP cache: {cache.hits} hits, {cache.misses} misses ({cache.total_bytes / 2**20:.1f} MiB in {CACHE_DIR})")
+    if not stream_output and os.path.exists(work_filename): os.remove(work_filename)
+    if os.path.exists(CHECKPOINT_FILENAME): os.remove(CHECKPOINT_FILENAME) # only reached after a complete run
     print("\nScraping process finished.")
 
+def _parse_args():
+    arg_parser = argparse.ArgumentParser(description="Scrape GradCafe admission results.")
+    arg_parser.add_argument("--resume", action="store_true",
+                            help=f"continue from the last completed page recorded in {CHECKPOINT_FILENAME}")
+    arg_parser.add_argument("--incremental", action="store_true",
+                            help="only fetch entries newer than those already in the output file")
+    arg_parser.add_argument("--output", default=OUTPUT_FILENAME,
+                            help=f"output file (default: {OUTPUT_FILENAME}); a .jsonl name streams entries page by page")
+    arg_parser.add_argument("--cache", action="store_true",
+                            help=f"keep fetched pages in {CACHE_DIR} and revalidate them with conditional requests")
+    arg_parser.add_argument("--offline", action="store_true",
+                            help=f"replay pages from {CACHE_DIR} only, without any network access")
+    arg_parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                            help=f"worker processes for HTML parsing (default: {PARSE_WORKERS}, i.e. parse in this process)")
+    return arg_parser.parse_args()
+
 if __name__ == '__main__':
-    main_process()
\ No newline at end of file
+    args = _parse_args()
+    main_process(resume=args.resume, incremental=args.incremental, output_filename=args.output,
+                 use_cache=args.cache, offline=args.offline, parse_workers=args.parse_workers)
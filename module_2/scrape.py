@@ -1,135 +1,290 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, FeatureNotFound
+import random
 import re
-from urllib.parse import urljoin
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+from field_map import loader_record_from_entry
 
 # --- Constants for scrape.py --- 
 GRADCAFE_BASE_URL = "https://www.thegradcafe.com"
 HTTP_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
+HTTP_TIMEOUT_SECONDS = 10
+HTTP_POOL_SIZE = 10 # Keep-alive connections kept per host by the shared session
+HTTP_MAX_RETRIES = 4 # Retries after the first attempt for 429/5xx responses and timeouts
+HTTP_BACKOFF_BASE_SECONDS = 1.0 # Delay before the first retry; doubles on every further retry
+HTTP_BACKOFF_MAX_SECONDS = 30.0
+HTTP_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+PARSER_BACKENDS = ("lxml", "html.parser") # BeautifulSoup tree builders, fastest first; html.parser is always available
+DEFAULT_PARSER = "lxml"
 DETAIL_DIV_CLASSES = "tw-inline-flex tw-items-center tw-rounded-md tw-bg-stone-50 tw-px-2 tw-py-1 tw-text-xs tw-font-medium tw-text-stone-700 tw-ring-1 tw-ring-inset tw-ring-stone-600/20".split()
 
+# --- Entry record ---
+MISSING_VALUE = "N/A" # what a missing field is written as in the JSON output
+
+@dataclass(slots=True)
+class AdmissionEntry:
+    """
+    One scraped admission result. Fields are None until the parsers find a value, and
+    slots keep each record far smaller than the 18-key dict it replaces.
+    Use to_dict() for the JSON output format (original key names, "N/A" for missing fields), or
+    to_loader_dict() for the record module_5/load_data.py loads (see field_map.py).
+    """
+    university: str | None = None
+    url_link: str | None = None
+    program_field: str | None = None
+    program_degree_level: str | None = None
+    date_added: str | None = None
+    applicant_status: str | None = None
+    decision_date_string: str | None = None
+    decision_full_text: str | None = None
+    gpa: str | None = None
+    gre_verbal: str | None = None
+    gre_quant: str | None = None
+    gre_awa: str | None = None
+    gre_total_or_general: str | None = None
+    toefl: str | None = None
+    student_status: str | None = None
+    program_start_term: str | None = None
+    comments_cue: str | None = None
+    comments: str | None = None
+
+    def to_dict(self):
+        return {key: MISSING_VALUE if getattr(self, attr) is None else getattr(self, attr) for key, attr in _JSON_KEY_TO_ATTR.items()}
+
+    def to_loader_dict(self):
+        return loader_record_from_entry(self)
+
+    @classmethod
+    def from_dict(cls, entry_dict):
+        return cls(**{_JSON_KEY_TO_ATTR[key]: None if value == MISSING_VALUE else value for key, value in entry_dict.items()})
+
+# JSON output key for each AdmissionEntry field, in output order
+_JSON_KEY_TO_ATTR = dict(zip(
+    ["University", "URL Link", "Program Field", "Program Degree Level", "Date Added", "Applicant Status",
+     "Decision Date String", "Decision Full Text", "GPA", "GRE Verbal", "GRE Quant", "GRE AWA",
+     "GRE Total or General", "TOEFL", "Student Status", "Program Start Term", "Comments Cue", "Comments"],
+    [field.name for field in fields(AdmissionEntry)]))
+
 # --- "Private" Helper Functions ---
-def _get_empty_admission_entry():
-    return {
-        "University": "N/A", "URL Link": "N/A", "Program Field": "N/A", "Program Degree Level": "N/A",
-        "Date Added": "N/A", "Applicant Status": "N/A", "Decision Date String": "N/A",
-        "Decision Full Text": "N/A", "GPA": "N/A", "GRE Verbal": "N/A", "GRE Quant": "N/A",
-        "GRE AWA": "N/A", "GRE Total or General": "N/A", "TOEFL": "N/A", "Student Status": "N/A",
-        "Program Start Term": "N/A", "Comments Cue": "N/A", "Comments": "N/A"
-    }
-
-def _fetch_page_soup(url):
+_available_parsers = {"html.parser": True}
+
+def _resolve_parser(parser):
+    """Returns `parser` if its tree builder is installed, otherwise falls back to 'html.parser'."""
+    if parser not in PARSER_BACKENDS: raise ValueError(f"Unknown parser backend '{parser}'. Choose one of: {', '.join(PARSER_BACKENDS)}")
+    if parser not in _available_parsers:
+        try: BeautifulSoup("", parser); _available_parsers[parser] = True
+        except FeatureNotFound:
+            print(f"Parser backend '{parser}' is not installed. Falling back to 'html.parser'.")
+            _available_parsers[parser] = False
+    return parser if _available_parsers[parser] else "html.parser"
+
+def _make_soup(html, parser="html.parser"):
+    return BeautifulSoup(html, parser)
+
+_session = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+def configure_session(pool_size=HTTP_POOL_SIZE):
+    """Replaces the shared HTTP session with a new one holding up to `pool_size` pooled connections per host."""
+    global _session, _session_pool_size
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    with _session_lock:
+        previous_session, _session = _session, session
+        _session_pool_size = pool_size
+    if previous_session: previous_session.close()
+    return session
+
+def _get_session():
+    with _session_lock:
+        session = _session
+    return session or configure_session()
+
+def _backoff_delay(attempt, retry_after=None):
+    # Exponential backoff with "equal jitter": half the capped delay is fixed, half is random.
+    # A numeric Retry-After header from the server wins if it asks for longer.
+    capped_delay = min(HTTP_BACKOFF_MAX_SECONDS, HTTP_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    delay = capped_delay / 2 + random.uniform(0, capped_delay / 2)
+    if retry_after and retry_after.isdigit(): delay = max(delay, min(float(retry_after), HTTP_BACKOFF_MAX_SECONDS))
+    return delay
+
+def _fetch_page_html(url, cache=None, offline=False, rate_limiter=None):
+    """
+    Returns the raw HTML bytes of `url`, or None if it could not be fetched.
+    With a ResponseCache, fresh pages are served from disk and stale ones are revalidated with
+    If-None-Match / If-Modified-Since. In offline mode only the cache is used, however old the page.
+    """
     # print(f"Fetching URL: {url}") # minimal for this module
-    try:
-        response = requests.get(url, headers=HTTP_HEADERS, timeout=10)
-        response.raise_for_status()
-        # print("Successfully fetched the page.")
-        return BeautifulSoup(response.content, 'html.parser')
-    except requests.exceptions.Timeout: print(f"Error: The request timed out for {url}")
-    except requests.exceptions.HTTPError as e: print(f"Error: HTTP Error occurred for {url}: {e}")
-    except requests.exceptions.RequestException as e: print(f"Error: Could not fetch URL {url}: {e}")
-    except Exception as e: print(f"An unexpected error occurred during fetch for {url}: {e}")
+    cached = cache.get(url) if cache else None
+    if cached and (offline or cache.is_fresh(cached)): return cached.body
+    if offline: print(f"Error: {url} is not in the cache and offline mode is on."); return None
+
+    conditional_headers = {}
+    if cached and cached.etag: conditional_headers['If-None-Match'] = cached.etag
+    if cached and cached.last_modified: conditional_headers['If-Modified-Since'] = cached.last_modified
+    session = _get_session()
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        retry_after = None
+        if rate_limiter: rate_limiter.wait(url)
+        try:
+            response = session.get(url, headers=conditional_headers, timeout=HTTP_TIMEOUT_SECONDS)
+            if response.status_code == 304 and cached:
+                cache.refresh(cached)
+                return cached.body
+            if response.status_code not in HTTP_RETRY_STATUS_CODES:
+                response.raise_for_status()
+                # print("Successfully fetched the page.")
+                if cache: cache.put(url, response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                return response.content
+            retry_after = response.headers.get('Retry-After')
+            print(f"Warning: HTTP {response.status_code} for {url} (attempt {attempt + 1}/{HTTP_MAX_RETRIES + 1})")
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            print(f"Warning: The request timed out or the connection failed for {url} (attempt {attempt + 1}/{HTTP_MAX_RETRIES + 1})")
+        except requests.exceptions.HTTPError as e: print(f"Error: HTTP Error occurred for {url}: {e}"); return None
+        except requests.exceptions.RequestException as e: print(f"Error: Could not fetch URL {url}: {e}"); return None
+        except Exception as e: print(f"An unexpected error occurred during fetch for {url}: {e}"); return None
+        if attempt < HTTP_MAX_RETRIES: time.sleep(_backoff_delay(attempt, retry_after))
+    print(f"Error: Giving up on {url} after {HTTP_MAX_RETRIES + 1} attempts.")
     return None
 
-def _parse_entry_details(elements_to_search, entry_data_dict):
+def _fetch_page_soup(url, parser="html.parser", **fetch_options):
+    html = _fetch_page_html(url, **fetch_options)
+    return _make_soup(html, parser) if html is not None else None
+
+# --- Pill classifier (patterns compiled once at import) ---
+_GPA_RE = re.compile(r'GPA\s*([\d\.]+)(?:\s*/\s*[\d\.]+)?', re.IGNORECASE)
+_GRE_VERBAL_RE = re.compile(r'V\s*[:\s]?\s*(\d{2,3})', re.IGNORECASE)
+_GRE_QUANT_RE = re.compile(r'Q\s*[:\s]?\s*(\d{2,3})', re.IGNORECASE)
+_GRE_AWA_RE = re.compile(r'AW\s*[:\s]?\s*(\d\.\d|\d)', re.IGNORECASE)
+_GRE_GENERAL_RE = re.compile(r'GRE\s+(\d{3})', re.IGNORECASE)
+_TOEFL_RE = re.compile(r'TOEFL\s*[:\s]?\s*(\d{2,3})', re.IGNORECASE)
+_TERM_RE = re.compile(r'(Fall|Spring|Summer|Winter)\s*(\d{4})', re.IGNORECASE)
+_DECISION_KEYWORD_RE = re.compile(r'accepted|rejected|wait listed|admitted|denied')  # matched against lowercased text
+_DECISION_STATUS_RE = re.compile(r'(Accepted|Rejected|Wait listed|Admitted|Denied|Other)(?:\s+on\s+(.*))?', re.IGNORECASE)
+_COMMENTS_CUE_RE = re.compile(r'see more|report')  # matched against lowercased text
+_RESULT_LINK_RE = re.compile(r'^/result/\d+')
+
+def _set_decision(entry, decision_text):
+    status_match = _DECISION_STATUS_RE.match(decision_text)
+    if status_match:
+        entry.applicant_status = status_match.group(1).strip()
+        entry.decision_date_string = status_match.group(2).strip() if status_match.group(2) else None
+        return True
+    return False
+
+# Each handler takes (text, lowered_text, entry) and returns True when it claimed the pill.
+def _pill_gpa(text, lowered, entry):
+    if entry.gpa is not None: return False
+    gpa_match = _GPA_RE.search(text)
+    if gpa_match: entry.gpa = gpa_match.group(1); return True
+    return False
+
+def _pill_gre(text, lowered, entry):
+    if "gre" not in lowered: return False
+    updated_any_gre = False
+    if entry.gre_verbal is None:
+        v_match = _GRE_VERBAL_RE.search(text)
+        if v_match: entry.gre_verbal = v_match.group(1); updated_any_gre = True
+    if entry.gre_quant is None:
+        q_match = _GRE_QUANT_RE.search(text)
+        if q_match: entry.gre_quant = q_match.group(1); updated_any_gre = True
+    if entry.gre_awa is None:
+        aw_match = _GRE_AWA_RE.search(text)
+        if aw_match: entry.gre_awa = aw_match.group(1); updated_any_gre = True
+    if not updated_any_gre and entry.gre_total_or_general is None:
+        general_gre_match = _GRE_GENERAL_RE.search(text)
+        if general_gre_match: entry.gre_total_or_general = general_gre_match.group(1); updated_any_gre = True
+    return updated_any_gre
+
+def _pill_toefl(text, lowered, entry):
+    if entry.toefl is not None: return False
+    toefl_match = _TOEFL_RE.search(text)
+    if toefl_match: entry.toefl = toefl_match.group(1); return True
+    return False
+
+def _pill_term(text, lowered, entry):
+    if entry.program_start_term is not None: return False
+    term_match = _TERM_RE.search(text)
+    if term_match: entry.program_start_term = f"{term_match.group(1)} {term_match.group(2)}"; return True
+    return False
+
+def _pill_student_status(text, lowered, entry):
+    if entry.student_status is None and "international" in lowered:
+        entry.student_status = "International"; return True
+    return False
+
+def _pill_decision(text, lowered, entry):
+    if not _DECISION_KEYWORD_RE.search(lowered): return False
+    if entry.applicant_status is None or entry.applicant_status == "Other" or \
+       lowered != (entry.decision_full_text or "").lower():
+        entry.decision_full_text = text
+        if not _set_decision(entry, text): entry.applicant_status = "Other"
+    return True
+
+def _pill_comments_cue(text, lowered, entry):
+    if entry.comments_cue is None and _COMMENTS_CUE_RE.search(lowered):
+        entry.comments_cue = text; return True
+    return False
+
+# Order matters: a pill is claimed by the first handler that accepts it.
+_PILL_HANDLERS = (_pill_gpa, _pill_gre, _pill_toefl, _pill_term, _pill_student_status, _pill_decision, _pill_comments_cue)
+
+def _parse_entry_details(elements_to_search, entry):
     for detail_div in elements_to_search:
         text_content = detail_div.get_text(strip=True)
-        parsed_this_detail = False
-
-        if entry_data_dict.get("GPA", "N/A") == "N/A":
-            gpa_match = re.search(r'GPA\s*([\d\.]+)(?:\s*/\s*[\d\.]+)?', text_content, re.IGNORECASE)
-            if gpa_match: entry_data_dict["GPA"] = gpa_match.group(1); parsed_this_detail = True
-        if parsed_this_detail: continue
-
-        if "GRE" in text_content.upper():
-            updated_any_gre = False
-            if entry_data_dict.get("GRE Verbal", "N/A") == "N/A":
-                v_match = re.search(r'V\s*[:\s]?\s*(\d{2,3})', text_content, re.IGNORECASE)
-                if v_match: entry_data_dict["GRE Verbal"] = v_match.group(1); updated_any_gre = True
-            if entry_data_dict.get("GRE Quant", "N/A") == "N/A":
-                q_match = re.search(r'Q\s*[:\s]?\s*(\d{2,3})', text_content, re.IGNORECASE)
-                if q_match: entry_data_dict["GRE Quant"] = q_match.group(1); updated_any_gre = True
-            if entry_data_dict.get("GRE AWA", "N/A") == "N/A":
-                aw_match = re.search(r'AW\s*[:\s]?\s*(\d\.\d|\d)', text_content, re.IGNORECASE)
-                if aw_match: entry_data_dict["GRE AWA"] = aw_match.group(1); updated_any_gre = True
-            if not updated_any_gre and entry_data_dict.get("GRE Total or General", "N/A") == "N/A":
-                general_gre_match = re.search(r'GRE\s+(\d{3})', text_content, re.IGNORECASE)
-                if general_gre_match: entry_data_dict["GRE Total or General"] = general_gre_match.group(1); updated_any_gre = True
-            if updated_any_gre: parsed_this_detail = True
-        if parsed_this_detail: continue
-
-        if entry_data_dict.get("TOEFL", "N/A") == "N/A":
-            toefl_match = re.search(r'TOEFL\s*[:\s]?\s*(\d{2,3})', text_content, re.IGNORECASE)
-            if toefl_match: entry_data_dict["TOEFL"] = toefl_match.group(1); parsed_this_detail = True
-        if parsed_this_detail: continue
-
-        if entry_data_dict.get("Program Start Term", "N/A") == "N/A":
-            term_match = re.search(r'(Fall|Spring|Summer|Winter)\s*(\d{4})', text_content, re.IGNORECASE)
-            if term_match: entry_data_dict["Program Start Term"] = f"{term_match.group(1)} {term_match.group(2)}"; parsed_this_detail = True
-        if parsed_this_detail: continue
-
-        if entry_data_dict.get("Student Status", "N/A") == "N/A":
-            if "international" in text_content.lower(): entry_data_dict["Student Status"] = "International"; parsed_this_detail = True
-        if parsed_this_detail: continue
-
-        decision_keywords = ["accepted", "rejected", "wait listed", "admitted", "denied"]
-        if any(keyword in text_content.lower() for keyword in decision_keywords):
-            if entry_data_dict.get("Applicant Status") == "Other" or entry_data_dict.get("Applicant Status") == "N/A" or \
-               text_content.lower() != entry_data_dict.get("Decision Full Text","").lower():
-                entry_data_dict["Decision Full Text"] = text_content
-                status_match = re.match(r'(Accepted|Rejected|Wait listed|Admitted|Denied|Other)(?:\s+on\s+(.*))?', text_content, re.IGNORECASE)
-                if status_match:
-                    entry_data_dict["Applicant Status"] = status_match.group(1).strip()
-                    entry_data_dict["Decision Date String"] = status_match.group(2).strip() if status_match.group(2) else "N/A"
-                else: entry_data_dict["Applicant Status"] = "Other"
-            parsed_this_detail = True
-        if parsed_this_detail: continue
-
-        if entry_data_dict.get("Comments Cue", "N/A") == "N/A":
-            if "see more" in text_content.lower() or "report" in text_content.lower():
-                entry_data_dict["Comments Cue"] = text_content; parsed_this_detail = True
+        lowered_text = text_content.lower()
+        for handler in _PILL_HANDLERS:
+            if handler(text_content, lowered_text, entry): break
 
 def _parse_main_row_data(cells, entry_data):
     if len(cells) > 0:
         school_name_div = cells[0].find('div', class_=lambda c: c and 'tw-font-medium' in c.split() and 'tw-text-gray-900' in c.split())
-        if school_name_div: entry_data["University"] = school_name_div.get_text(strip=True)
+        if school_name_div: entry_data.university = school_name_div.get_text(strip=True)
     if len(cells) > 1:
         program_cell = cells[1]
         program_name_span = program_cell.select_one('div.tw-text-gray-900 span')
-        if program_name_span: entry_data["Program Field"] = program_name_span.get_text(strip=True)
+        if program_name_span: entry_data.program_field = program_name_span.get_text(strip=True)
         degree_level_span = program_cell.find('span', class_='tw-text-gray-500')
         if degree_level_span:
             degree_text = degree_level_span.get_text(strip=True)
             if degree_text.upper() in ["MASTERS", "PHD", "MS", "MA", "MENG", "MFA", "LLM", "MBA"]:
-                entry_data["Program Degree Level"] = degree_text
-        elif entry_data.get("Program Field", "N/A") == "N/A":
-            entry_data["Program Field"] = program_cell.get_text(separator=" ", strip=True)
-    if len(cells) > 2: entry_data["Date Added"] = cells[2].get_text(strip=True)
+                entry_data.program_degree_level = degree_text
+        elif entry_data.program_field is None:
+            entry_data.program_field = program_cell.get_text(separator=" ", strip=True)
+    if len(cells) > 2: entry_data.date_added = cells[2].get_text(strip=True)
     if len(cells) > 3:
         decision_cell = cells[3]
         decision_text_val = ""
         decision_div = decision_cell.find('div', class_=lambda c: c and 'tw-inline-flex' in c.split())
         if decision_div: decision_text_val = decision_div.get_text(strip=True)
         else: decision_text_val = decision_cell.get_text(strip=True)
-        entry_data["Decision Full Text"] = decision_text_val
-        status_match = re.match(r'(Accepted|Rejected|Wait listed|Admitted|Denied|Other)(?:\s+on\s+(.*))?', decision_text_val, re.IGNORECASE)
-        if status_match:
-            entry_data["Applicant Status"] = status_match.group(1).strip()
-            entry_data["Decision Date String"] = status_match.group(2).strip() if status_match.group(2) else "N/A"
-        elif decision_text_val: entry_data["Applicant Status"] = "Other"; entry_data["Decision Full Text"] = decision_text_val
+        entry_data.decision_full_text = decision_text_val
+        if not _set_decision(entry_data, decision_text_val) and decision_text_val:
+            entry_data.applicant_status = "Other"; entry_data.decision_full_text = decision_text_val
 
     if len(cells) >= 5:
         actions_cell = cells[4]
-        link_tag = actions_cell.find('a', href=re.compile(r'^/result/\d+'))
+        link_tag = actions_cell.find('a', href=_RESULT_LINK_RE)
         if link_tag:
             href = link_tag.get('href')
-            if href: entry_data["URL Link"] = GRADCAFE_BASE_URL + href
+            if href: entry_data.url_link = GRADCAFE_BASE_URL + href
 
 def _parse_page_entries(soup):
     page_entries = []
-    temp_entry = {}
+    temp_entry = None
     results_table = soup.find('table', class_='tw-min-w-full')
     if not results_table: return page_entries
     table_body = results_table.find('tbody')
@@ -143,13 +298,13 @@ def _parse_page_entries(soup):
         is_detail_or_comment_row = (len(cells) == 1 and 'tw-border-none' in current_row_classes and cells[0].get('colspan'))
 
         if is_main_data_row:
-            if temp_entry.get('University') and temp_entry['University'] != "N/A":
+            if temp_entry and temp_entry.university:
                 page_entries.append(temp_entry)
-            temp_entry = _get_empty_admission_entry() # Use helper
+            temp_entry = AdmissionEntry()
             _parse_main_row_data(cells, temp_entry) # Use helper
         
         elif is_detail_or_comment_row:
-            if temp_entry.get('University') and temp_entry['University'] != "N/A":
+            if temp_entry and temp_entry.university:
                 detail_cell = cells[0]
                 detail_divs_found = detail_cell.find_all('div', class_=DETAIL_DIV_CLASSES)
                 pill_texts_in_this_cell = []
@@ -177,39 +332,154 @@ def _parse_page_entries(soup):
                 full_prose_comment = "\n".join(filter(None, actual_comment_segments)).strip()
                 if full_prose_comment:
                     is_just_a_parsed_value = False
-                    parsed_values_for_check = [temp_entry.get(k) for k in ["GPA", "GRE Verbal", "GRE Quant", "GRE AWA", "GRE Total or General", "TOEFL", "Student Status", "Program Start Term", "Decision Full Text", "Comments Cue"]]
+                    parsed_values_for_check = [temp_entry.gpa, temp_entry.gre_verbal, temp_entry.gre_quant, temp_entry.gre_awa, temp_entry.gre_total_or_general,
+                                               temp_entry.toefl, temp_entry.student_status, temp_entry.program_start_term, temp_entry.decision_full_text, temp_entry.comments_cue]
                     for val in parsed_values_for_check:
-                        if val and val != "N/A" and str(val).strip() == full_prose_comment: is_just_a_parsed_value = True; break
+                        if val and str(val).strip() == full_prose_comment: is_just_a_parsed_value = True; break
                     if not is_just_a_parsed_value and len(full_prose_comment) > 15 : 
-                        temp_entry["Comments"] = full_prose_comment
+                        temp_entry.comments = full_prose_comment
 
-    if temp_entry.get('University') and temp_entry['University'] != "N/A":
+    if temp_entry and temp_entry.university:
         page_entries.append(temp_entry)
     return page_entries
 
-# --- Public Scraping Function ---
-def scrape_data(initial_search_url, max_pages, max_entries):
+def _build_page_url(initial_search_url, page_num):
+    if page_num == 1: return initial_search_url
+    if initial_search_url.endswith('?'): return f"{initial_search_url}p={page_num}"
+    elif '?' not in initial_search_url: return f"{initial_search_url}?p={page_num}"
+    else: return f"{initial_search_url}&p={page_num}"
+
+class _HostRateLimiter:
+    """Spaces out requests to the same host so that at most `requests_per_second` start per second."""
+    def __init__(self, requests_per_second=None):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.min_interval: return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now: time.sleep(slot - now)
+
+def _iter_fetched_pages(initial_search_url, start_page, max_pages, concurrency, fetch_options):
+    """
+    Fetch stage: yields (page_num, url, html_bytes_or_None) for pages start_page..max_pages in page order
+    while up to `concurrency` pages are in flight. Closing the generator early cancels any fetches that have not started yet.
+    """
+    page_nums = iter(range(start_page, max_pages + 1))
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        try:
+            def submit_next():
+                page_num = next(page_nums, None)
+                if page_num is None: return
+                url = _build_page_url(initial_search_url, page_num)
+                in_flight.append((page_num, url, executor.submit(_fetch_page_html, url, **fetch_options)))
+            for _ in range(max(1, concurrency)): submit_next()
+            while in_flight:
+                page_num, url, future = in_flight.popleft()
+                yield page_num, url, future.result()
+                submit_next() # only once the consumer wants more, so concurrency=1 never fetches past a stop
+        finally:
+            for _, _, future in in_flight: future.cancel()
+
+def _parse_page_html(html, parser):
+    # Runs in parse worker processes, so it takes and returns only picklable values
+    return _parse_page_entries(_make_soup(html, parser))
+
+def _iter_parsed_pages(fetched_pages, parser, parse_workers, parse_queue_size):
+    """
+    Parse stage: yields (page_num, url, entries_or_None) in page order. With parse_workers > 0, pages are
+    parsed in a ProcessPoolExecutor (parsing is CPU-bound and holds the GIL, so threads would not help).
+    At most `parse_queue_size` fetched pages wait for or sit in the pool; the fetch stage is only asked
+    for more once there is room, which is what keeps a fast fetcher from running ahead of slow parsing.
+    """
+    if not parse_workers:
+        for page_num, url, html in fetched_pages:
+            yield page_num, url, _parse_page_html(html, parser) if html is not None else None
+        return
+
+    pending = deque() # the bounded queue between the stages: (page_num, url, parse future or None)
+    with ProcessPoolExecutor(max_workers=parse_workers) as executor:
+        try:
+            for page_num, url, html in fetched_pages:
+                pending.append((page_num, url, executor.submit(_parse_page_html, html, parser) if html is not None else None))
+                if html is None: break # a failed fetch ends the crawl; no point fetching further
+                while len(pending) >= parse_queue_size:
+                    page_num, url, future = pending.popleft()
+                    yield page_num, url, future.result() if future else None
+            while pending:
+                page_num, url, future = pending.popleft()
+                yield page_num, url, future.result() if future else None
+        finally:
+            for _, _, future in pending:
+                if future: future.cancel()
+
+# --- Public Scraping Functions ---
+def iter_scrape_pages(initial_search_url, max_pages, max_entries, concurrency=1, requests_per_second=None, parser=DEFAULT_PARSER,
+                      start_page=1, known_urls=None, cache=None, offline=False, parse_workers=0, parse_queue_size=None,
+                      on_fetch_failure=None):
+    """
+    Generator over (page_num, page_entries) for survey pages start_page..max_pages, stopping once
+    `max_entries` have been yielded. With concurrency > 1, pages are fetched ahead on a bounded
+    thread pool but are still parsed and yielded in page order. `requests_per_second` caps the request
+    rate per host and `parser` picks the BeautifulSoup tree builder (see PARSER_BACKENDS). If
+    `known_urls` is given, the crawl stops at the first entry whose "URL Link" is in it (that entry and
+    the rest are dropped). `cache` is an optional http_cache.ResponseCache; with `offline=True` every
+    page is replayed from it and the network is never touched.
+    Fetching (threads) and parsing are separate stages: with parse_workers > 0 pages are parsed in that
+    many worker processes, with at most `parse_queue_size` pages (default: 2 per worker) queued between the stages.
+    A page that cannot be fetched ends the crawl; `on_fetch_failure(page_num)` is called first, so callers can tell
+    that apart from reaching the end of the results.
+    """
+    print(f"Starting scrape. Pages: {start_page}-{max_pages}, Max entries: {max_entries}, Concurrency: {concurrency}")
+    if not initial_search_url: return
+
+    if _session is None or concurrency > _session_pool_size: configure_session(pool_size=max(HTTP_POOL_SIZE, concurrency))
+    parser = _resolve_parser(parser)
+    fetch_options = {"cache": cache, "offline": offline, "rate_limiter": _HostRateLimiter(requests_per_second)}
+    fetched_pages = _iter_fetched_pages(initial_search_url, start_page, max_pages, concurrency, fetch_options)
+    parsed_pages = _iter_parsed_pages(fetched_pages, parser, parse_workers, parse_queue_size or 2 * parse_workers)
+    total_entries = 0
+    try:
+        for page_num, current_page_url, page_entries in parsed_pages:
+            print(f"\n--- Scraping Page {page_num} from URL: {current_page_url} ---")
+            if page_entries is None:
+                print(f"Failed to fetch page {page_num}. Assuming end of results or issue.")
+                if on_fetch_failure: on_fetch_failure(page_num)
+                break
+
+            if not page_entries and page_num > 1: print(f"Found no entries on page {page_num}. Assuming end of actual results."); break
+            reached_known_entry = False
+            if known_urls:
+                for i, entry in enumerate(page_entries):
+                    if entry.url_link in known_urls: page_entries = page_entries[:i]; reached_known_entry = True; break
+            total_entries += len(page_entries)
+            print(f"Parsed {len(page_entries)} entries from this page. Total entries so far: {total_entries}")
+            yield page_num, page_entries
+            if reached_known_entry: print("Reached an entry that is already in the previous dataset. Stopping."); break
+            if total_entries >= max_entries: print(f"Reached entry limit of {max_entries}. Stopping."); break
+            if page_num == max_pages: print(f"Reached max_pages limit of {max_pages}. Stopping further pagination."); break
+    finally:
+        parsed_pages.close()
+        fetched_pages.close()
+
+def iter_scrape_data(initial_search_url, max_pages, max_entries, **scrape_options):
+    """Generator over individual entries, in page order; takes the same options as iter_scrape_pages."""
+    for _, page_entries in iter_scrape_pages(initial_search_url, max_pages, max_entries, **scrape_options):
+        yield from page_entries
+
+def scrape_data(initial_search_url, max_pages, max_entries, on_page=None, **scrape_options):
+    """
+    Returns the list of all scraped entries (see iter_scrape_pages for the options).
+    `on_page(page_num, page_entries)` is called after every completed page.
+    """
     all_entries = []
-    current_page_url = initial_search_url
-    print(f"Starting scrape. Max pages: {max_pages}, Max entries: {max_entries}")
-
-    for page_num in range(1, max_pages + 1):
-        if page_num > 1:
-            separator = '&' if '?' in initial_search_url else '?'
-            if initial_search_url.endswith('?'): current_page_url = f"{initial_search_url}p={page_num}"
-            elif '?' not in initial_search_url : current_page_url = f"{initial_search_url}?p={page_num}"
-            else: current_page_url = f"{initial_search_url}&p={page_num}"
-        
-        if not current_page_url: break
-        print(f"\n--- Scraping Page {page_num} from URL: {current_page_url} ---")
-        soup = _fetch_page_soup(current_page_url) # Use helper
-        if not soup: print(f"Failed to fetch page {page_num}. Assuming end of results or issue."); break
-        
-        page_entries = _parse_page_entries(soup) # Use helper
-        
-        if not page_entries and page_num > 1: print(f"Found no entries on page {page_num}. Assuming end of actual results."); break
+    for page_num, page_entries in iter_scrape_pages(initial_search_url, max_pages, max_entries, **scrape_options):
         all_entries.extend(page_entries)
-        print(f"Parsed {len(page_entries)} entries from this page. Total entries so far: {len(all_entries)}")
-        if len(all_entries) >= max_entries: print(f"Reached entry limit of {max_entries}. Stopping."); break
-        if page_num == max_pages: print(f"Reached max_pages limit of {max_pages}. Stopping further pagination."); break
-    return all_entries
\ No newline at end of file
+        if on_page: on_page(page_num, page_entries)
+    return all_entries
@@ -0,0 +1,86 @@
+# tests/conftest.py
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+FIXTURE_PAGES = {1: "survey_page_1.html", 2: "survey_page_2.html"}
+
+
+def read_fixture(name):
+    """Returns the raw bytes of a saved GradCafe page."""
+    return (FIXTURES_DIR / name).read_bytes()
+
+
+class GradCafeStandIn(ThreadingHTTPServer):
+    """A local HTTP server that serves canned GradCafe survey pages by `?p=` number."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SurveyHandler)
+        self.requested_pages = []
+        self.client_ports = set()
+        self.queued_errors = {}
+        self.not_modified_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def survey_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/survey/"
+
+
+    def fail_page(self, page_num, *status_codes):
+        """Makes the next requests for `page_num` answer with `status_codes`, one per request."""
+        self.queued_errors.setdefault(page_num, []).extend(status_codes)
+
+
+class _SurveyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page_num = int(query.get("p", ["1"])[0])
+        with self.server.lock:
+            self.server.requested_pages.append(page_num)
+            self.server.client_ports.add(self.client_address[1])
+            queued = self.server.queued_errors.get(page_num)
+            status_code = queued.pop(0) if queued else None
+        if status_code:
+            self.send_response(status_code)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = f'"page-{page_num}"'
+        if self.headers.get("If-None-Match") == etag:
+            with self.server.lock:
+                self.server.not_modified_count += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = read_fixture(FIXTURE_PAGES.get(page_num, "survey_page_empty.html"))
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def gradcafe_server():
+    """Runs a GradCafe stand-in for the duration of one test."""
+    server = GradCafeStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,28 @@
+# tests/test_clean.py
+
+import types
+
+import pytest
+from clean import clean_data, iter_clean_data
+
+
+@pytest.mark.clean
+def test_iter_clean_data_is_lazy():
+    """Tests that the cleaning generator only pulls entries as they are consumed."""
+    pulled = []
+
+    def source():
+        for n in range(3):
+            pulled.append(n)
+            yield {"University": f"U{n}", "Comments": ["a", "b"], "Other Misc Details": "x"}
+
+    cleaned = iter_clean_data(source())
+    assert isinstance(cleaned, types.GeneratorType)
+    assert next(cleaned) == {"University": "U0", "Comments": "a; b"}
+    assert pulled == [0]
+
+
+@pytest.mark.clean
+def test_clean_data_wrapper_returns_list():
+    """Tests that clean_data still returns a list of cleaned entries."""
+    assert clean_data([{"Comments": []}]) == [{"Comments": "N/A"}]
@@ -0,0 +1,52 @@
+# tests/test_field_map.py
+
+import json
+
+import pytest
+import scrape
+from field_map import FIELD_MAP, MISSING_VALUE, is_scraper_record, loader_record_from_dict, loader_record_from_entry
+from scrape import AdmissionEntry, _make_soup, _parse_page_entries
+from tests.conftest import FIXTURES_DIR, read_fixture
+
+LOADER_KEYS = ["University", "Program Name", "Degree", "Applicant Status", "Decision Date", "Date Added", "Semester Start",
+               "Student Type", "GPA", "GRE Total", "GRE V", "GRE Q", "GRE AW", "Comment", "URL"]
+
+
+@pytest.mark.field_map
+def test_table_matches_the_scraper_output():
+    """Tests that every mapped scraper key and attribute exists, in AdmissionEntry's own pairing."""
+    assert MISSING_VALUE == scrape.MISSING_VALUE
+    for _, json_key, attr, _ in FIELD_MAP:
+        assert scrape._JSON_KEY_TO_ATTR[json_key] == attr
+    assert [row[0] for row in FIELD_MAP] == LOADER_KEYS
+
+
+@pytest.mark.field_map
+def test_fixture_entries_map_to_loader_records():
+    """Tests that parsed entries and their JSON dicts map to the same loader record."""
+    entries = _parse_page_entries(_make_soup(read_fixture("survey_page_1.html"), "html.parser"))
+    first = entries[0].to_loader_dict()
+    assert list(first) == LOADER_KEYS
+    assert first["Program Name"] == "Computer Science" and first["Degree"] == "Masters"
+    assert first["Date Added"] == "2025-05-28" and first["Decision Date"] == "27 May"
+    assert first["GRE V"] == "160" and first["GRE AW"] == "4.5" and first["GRE Total"] == "328"
+    assert first["Student Type"] == "International" and first["GRE Q"] == MISSING_VALUE
+    assert [loader_record_from_dict(entry.to_dict()) for entry in entries] == [entry.to_loader_dict() for entry in entries]
+
+    expected = json.loads((FIXTURES_DIR / "expected_entries.json").read_text())["survey_page_1.html"]
+    assert [loader_record_from_dict(entry) for entry in expected] == [entry.to_loader_dict() for entry in entries]
+
+
+@pytest.mark.field_map
+def test_missing_and_malformed_values_become_missing():
+    """Tests that unset fields, absent keys and unparseable dates map to N/A."""
+    assert set(loader_record_from_entry(AdmissionEntry()).values()) == {MISSING_VALUE}
+    assert set(loader_record_from_dict({"Program Field": "CS", "Date Added": "yesterday"}).values()) == {"CS", MISSING_VALUE}
+
+
+@pytest.mark.field_map
+def test_is_scraper_record():
+    """Tests that scraper output is told apart from loader-format records."""
+    assert is_scraper_record(AdmissionEntry(program_field="CS").to_dict())
+    assert not is_scraper_record(AdmissionEntry(program_field="CS").to_loader_dict())
+    assert not is_scraper_record([])
@@ -0,0 +1,121 @@
+# tests/test_file_ops.py
+
+import json
+import os
+import types
+
+import pytest
+from file_ops import JsonLinesWriter, iter_data, load_data, save_data, truncate_jsonl
+
+ENTRIES = [{"University": f"University {n}", "URL Link": f"https://www.thegradcafe.com/result/{n}"} for n in range(5)]
+
+
+@pytest.mark.file_ops
+@pytest.mark.parametrize("filename", ["data.json", "data.jsonl"])
+def test_save_and_load_round_trip(tmp_path, filename):
+    """Tests that both output formats load back to the same entries."""
+    path = str(tmp_path / filename)
+    save_data(ENTRIES, path)
+    assert load_data(path) == ENTRIES
+
+
+@pytest.mark.file_ops
+def test_json_array_output_is_unchanged(tmp_path):
+    """Tests that .json output is still an indented JSON array."""
+    path = tmp_path / "data.json"
+    save_data(ENTRIES, str(path))
+    assert path.read_text() == json.dumps(ENTRIES, indent=2)
+
+
+@pytest.mark.file_ops
+def test_jsonl_output_has_one_entry_per_line(tmp_path):
+    """Tests that .jsonl output holds one JSON document per line."""
+    path = tmp_path / "data.jsonl"
+    save_data(ENTRIES, str(path))
+    assert [json.loads(line) for line in path.read_text().splitlines()] == ENTRIES
+
+
+@pytest.mark.file_ops
+def test_writer_appends_batches(tmp_path):
+    """Tests that the writer appends page batches and that readers see each batch once it is written."""
+    path = str(tmp_path / "data.jsonl")
+    with JsonLinesWriter(path, append=False) as writer:
+        writer.write_entries(ENTRIES[:2])
+        assert list(iter_data(path)) == ENTRIES[:2]
+        writer.write_entries(ENTRIES[2:])
+    with JsonLinesWriter(path) as writer:
+        writer.write_entries(ENTRIES[:1])
+    assert writer.entries_written == 1
+    assert list(iter_data(path)) == ENTRIES + ENTRIES[:1]
+
+
+@pytest.mark.file_ops
+def test_iter_data_is_lazy_and_skips_partial_line(tmp_path):
+    """Tests that the reader is a generator and, in partial mode, ignores a last line that is still being written."""
+    path = tmp_path / "data.jsonl"
+    path.write_text(json.dumps(ENTRIES[0]) + "\n" + json.dumps(ENTRIES[1])[:10])
+    entries = iter_data(str(path), partial=True)
+    assert isinstance(entries, types.GeneratorType)
+    assert list(entries) == ENTRIES[:1]
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_data(str(path)))
+
+
+@pytest.mark.file_ops
+@pytest.mark.parametrize("partial", [False, True])
+def test_iter_data_reads_last_line_without_newline(tmp_path, partial):
+    """Tests that a complete JSON Lines file missing its final newline loads every entry."""
+    path = tmp_path / "data.jsonl"
+    path.write_text("\n".join(json.dumps(entry) for entry in ENTRIES))
+    assert list(iter_data(str(path), partial=partial)) == ENTRIES
+    assert load_data(str(path)) == ENTRIES
+
+
+@pytest.mark.file_ops
+def test_format_is_detected_from_content(tmp_path):
+    """Tests that a JSON array is recognised even without a .json name (and with leading whitespace)."""
+    path = tmp_path / "data.txt"
+    path.write_text("\n  " + json.dumps(ENTRIES))
+    assert list(iter_data(str(path))) == ENTRIES
+
+
+@pytest.mark.file_ops
+def test_truncate_jsonl(tmp_path):
+    """Tests that truncation keeps exactly the first N entries."""
+    path = str(tmp_path / "data.jsonl")
+    save_data(ENTRIES, path)
+    truncate_jsonl(path, 3)
+    assert load_data(path) == ENTRIES[:3]
+    truncate_jsonl(path, 10)
+    assert load_data(path) == ENTRIES[:3]
+
+
+@pytest.mark.file_ops
+@pytest.mark.parametrize("filename", ["data.json", "data.jsonl"])
+def test_save_data_streams_from_a_generator(tmp_path, filename):
+    """Tests that save_data accepts a generator and writes the same file as it would for a list."""
+    from_list, from_generator = str(tmp_path / ("list_" + filename)), str(tmp_path / ("gen_" + filename))
+    save_data(ENTRIES, from_list)
+    assert save_data((entry for entry in ENTRIES), from_generator) == len(ENTRIES)
+    with open(from_list) as expected, open(from_generator) as actual:
+        assert actual.read() == expected.read()
+
+
+@pytest.mark.file_ops
+def test_save_data_can_rewrite_the_file_it_reads(tmp_path):
+    """Tests that entries streamed out of a file can be saved back over that same file."""
+    path = str(tmp_path / "data.json")
+    save_data(ENTRIES, path)
+    save_data(iter_data(path), path)
+    assert load_data(path) == ENTRIES
+
+
+@pytest.mark.file_ops
+def test_iter_data_streams_json_arrays(tmp_path):
+    """Tests that entries of a JSON array file are yielded before the whole file has been read."""
+    path = str(tmp_path / "data.json")
+    save_data(ENTRIES * 20000, path)
+    entries = iter_data(path)
+    assert next(entries) == ENTRIES[0]
+    assert entries.gi_frame.f_locals["f"].tell() < os.path.getsize(path) // 2
+    entries.close()
@@ -0,0 +1,77 @@
+# tests/test_http_cache.py
+
+import os
+import time
+
+import pytest
+from http_cache import ResponseCache
+from scrape import scrape_data
+
+
+@pytest.mark.cache
+def test_put_and_get_survive_a_new_instance(tmp_path):
+    """Tests that cached pages and their validators are read back from disk by a new cache instance."""
+    ResponseCache(str(tmp_path)).put("https://x.test/a", b"<html>a</html>", etag='"a"', last_modified="Wed, 21 Oct 2025 07:28:00 GMT")
+    cached = ResponseCache(str(tmp_path)).get("https://x.test/a")
+    assert cached.body == b"<html>a</html>"
+    assert cached.etag == '"a"'
+    assert cached.last_modified == "Wed, 21 Oct 2025 07:28:00 GMT"
+
+
+@pytest.mark.cache
+def test_ttl_decides_freshness(tmp_path):
+    """Tests that entries older than the TTL are reported stale but are still returned."""
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+    cache.put("https://x.test/a", b"a")
+    assert cache.is_fresh(cache.get("https://x.test/a"))
+    cache.ttl_seconds = 0
+    assert not cache.is_fresh(cache.get("https://x.test/a"))
+
+
+@pytest.mark.cache
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    """Tests that going over max_bytes evicts the page that was used longest ago."""
+    cache = ResponseCache(str(tmp_path), max_bytes=25)
+    cache.put("https://x.test/a", b"a" * 10)
+    time.sleep(0.01)
+    cache.put("https://x.test/b", b"b" * 10)
+    time.sleep(0.01)
+    cache.get("https://x.test/a")
+    cache.put("https://x.test/c", b"c" * 10)
+    assert cache.get("https://x.test/b") is None
+    assert cache.get("https://x.test/a") is not None
+    assert cache.get("https://x.test/c") is not None
+    assert cache.total_bytes == 20
+    assert len(os.listdir(tmp_path)) == 4
+
+
+@pytest.mark.cache
+def test_stale_pages_are_revalidated_with_conditional_requests(gradcafe_server, tmp_path):
+    """Tests that stale pages are revalidated with If-None-Match and that a 304 reuses the cached body."""
+    cache = ResponseCache(str(tmp_path), ttl_seconds=0)
+    first = scrape_data(gradcafe_server.survey_url, max_pages=5, max_entries=100, cache=cache)
+    second = scrape_data(gradcafe_server.survey_url, max_pages=5, max_entries=100, cache=cache)
+    assert second == first
+    assert gradcafe_server.not_modified_count == 3
+
+
+@pytest.mark.cache
+def test_fresh_pages_are_served_without_a_request(gradcafe_server, tmp_path):
+    """Tests that pages within the TTL are served straight from disk."""
+    cache = ResponseCache(str(tmp_path))
+    first = scrape_data(gradcafe_server.survey_url, max_pages=5, max_entries=100, cache=cache)
+    gradcafe_server.requested_pages.clear()
+    assert scrape_data(gradcafe_server.survey_url, max_pages=5, max_entries=100, cache=cache) == first
+    assert gradcafe_server.requested_pages == []
+
+
+@pytest.mark.cache
+def test_offline_replay_needs_no_network(gradcafe_server, tmp_path):
+    """Tests that an offline run replays a whole crawl from the cache after the server is gone."""
+    url = gradcafe_server.survey_url
+    online = scrape_data(url, max_pages=5, max_entries=100, cache=ResponseCache(str(tmp_path), ttl_seconds=0))
+    gradcafe_server.shutdown()
+    gradcafe_server.server_close()
+    offline = scrape_data(url, max_pages=5, max_entries=100, cache=ResponseCache(str(tmp_path), ttl_seconds=0), offline=True)
+    assert len(offline) == 7
+    assert offline == online
@@ -0,0 +1,66 @@
+# tests/test_json_stream.py
+
+import io
+import json
+
+import pytest
+from json_stream import iter_json_array, iter_json_records
+
+ENTRIES = [{"University": f"University {n}", "Comments": "tab\there, \"quoted\" ] , é" * n,
+            "URL Link": f"https://www.thegradcafe.com/result/{n}"} for n in range(5)]
+DOCUMENTS = [
+    [],
+    ENTRIES,
+    [1, 22, 333, -4.5e10, "text with ] and , inside", None, True, [[], {}], {"a": [1, {"b": 2}]}],
+    [{"n": n, "s": "é" * n} for n in range(40)],
+]
+
+
+@pytest.mark.json_stream
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_chars", [1, 3, 64, 1 << 20])
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_iter_json_array_matches_json_load(document, chunk_chars, indent):
+    """Tests that elements come out as json.load decodes them, whatever the chunk boundaries."""
+    text = json.dumps(document, indent=indent)
+    assert list(iter_json_array(io.StringIO(text), chunk_chars=chunk_chars)) == document
+
+
+@pytest.mark.json_stream
+def test_iter_json_array_reads_incrementally():
+    """Tests that the first element is yielded before the rest of the file is read."""
+    stream = io.StringIO(json.dumps(ENTRIES * 100))
+    elements = iter_json_array(stream, chunk_chars=256)
+    assert next(elements) == ENTRIES[0]
+    assert stream.tell() < len(stream.getvalue()) // 10
+
+
+@pytest.mark.json_stream
+@pytest.mark.parametrize("text", ['{"a": 1}', '[1 2]', '[1,]', '[{"a": 1}', '[1] 2', ''])
+def test_iter_json_array_rejects_malformed_input(text):
+    """Tests that anything but a single well-formed array raises like json.load."""
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), chunk_chars=2))
+
+
+@pytest.mark.json_stream
+@pytest.mark.parametrize("chunk_chars", [1, 64])
+def test_iter_json_records_reads_arrays_and_json_lines(chunk_chars):
+    """Tests that a JSON array and a JSON Lines file of the same records read the same."""
+    json_lines = "\n" + "".join(json.dumps(entry) + "\n\n" for entry in ENTRIES)
+    for text in (json.dumps(ENTRIES, indent=2), json_lines, json_lines.rstrip("\n")):
+        assert list(iter_json_records(io.StringIO(text), chunk_chars=chunk_chars)) == ENTRIES
+    assert not list(iter_json_records(io.StringIO("")))
+
+
+@pytest.mark.json_stream
+def test_partial_mode_skips_only_a_half_written_last_line():
+    """Tests that following a live file skips the entry being written, and only that."""
+    complete = "".join(json.dumps(entry) + "\n" for entry in ENTRIES[:2])
+    half_written = complete + json.dumps(ENTRIES[2])[:10]
+    assert list(iter_json_records(io.StringIO(half_written), partial=True)) == ENTRIES[:2]
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(io.StringIO(half_written)))
+    broken_middle = json.dumps(ENTRIES[0])[:10] + "\n" + complete
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(io.StringIO(broken_middle), partial=True))
@@ -0,0 +1,134 @@
+# tests/test_main.py
+
+import json
+
+import pytest
+import main
+import scrape
+from file_ops import load_checkpoint, load_data, save_checkpoint, save_data
+
+
+@pytest.fixture
+def main_config(gradcafe_server, tmp_path, monkeypatch):
+    """Points main.py at the GradCafe stand-in and a temporary output directory."""
+    monkeypatch.setattr(main, "BASE_SEARCH_URL", gradcafe_server.survey_url)
+    monkeypatch.setattr(main, "OUTPUT_FILENAME", str(tmp_path / "applicant_data.json"))
+    monkeypatch.setattr(main, "CHECKPOINT_FILENAME", str(tmp_path / "scrape_checkpoint.json"))
+    monkeypatch.setattr(main, "MAX_PAGES_TO_SCRAPE", 5)
+    monkeypatch.setattr(main, "FETCH_CONCURRENCY", 1)
+    monkeypatch.setattr(main, "REQUESTS_PER_SECOND", None)
+    monkeypatch.setattr(main, "CACHE_DIR", str(tmp_path / "http_cache"))
+    return main
+
+
+def _read_output(config):
+    with open(config.OUTPUT_FILENAME) as f:
+        return json.load(f)
+
+
+@pytest.mark.scrape
+def test_full_run_writes_output_and_removes_work_files(main_config, tmp_path):
+    """Tests that a complete run saves every entry and leaves no checkpoint or partial file behind."""
+    main_config.main_process()
+    assert len(_read_output(main_config)) == 7
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["applicant_data.json"]
+
+
+@pytest.mark.scrape
+def test_checkpoint_is_saved_when_crawl_crashes(main_config, monkeypatch):
+    """Tests that a crash mid-crawl leaves a checkpoint of the pages completed before it."""
+    original_parse = scrape._parse_page_entries
+    calls = []
+
+    def crash_on_second_page(soup):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("simulated crash")
+        return original_parse(soup)
+
+    monkeypatch.setattr(scrape, "_parse_page_entries", crash_on_second_page)
+    with pytest.raises(RuntimeError):
+        main_config.main_process()
+    checkpoint = load_checkpoint(main_config.CHECKPOINT_FILENAME)
+    assert checkpoint == {"last_page": 1, "new_entries": 4, "output_entries": 4}
+    assert len(load_data(main_config.OUTPUT_FILENAME + main_config.PARTIAL_SUFFIX)) == 4
+
+
+@pytest.mark.scrape
+def test_fetch_failure_keeps_checkpoint_for_resume(main_config, gradcafe_server):
+    """Tests that a crawl cut short by a failed fetch keeps its checkpoint, and --resume finishes it."""
+    gradcafe_server.fail_page(2, 404)
+    main_config.main_process()
+    checkpoint = load_checkpoint(main_config.CHECKPOINT_FILENAME)
+    assert checkpoint == {"last_page": 1, "new_entries": 4, "output_entries": 4}
+    gradcafe_server.requested_pages.clear()
+    main_config.main_process(resume=True)
+    assert gradcafe_server.requested_pages == [2, 3]
+    assert len(_read_output(main_config)) == 7
+    assert load_checkpoint(main_config.CHECKPOINT_FILENAME) is None
+
+
+@pytest.mark.scrape
+def test_resume_continues_after_checkpointed_page(main_config, gradcafe_server):
+    """Tests that --resume skips pages already recorded in the checkpoint."""
+    save_data([{"University": "From checkpoint", "URL Link": "N/A"}], main_config.OUTPUT_FILENAME + main_config.PARTIAL_SUFFIX)
+    save_checkpoint(main_config.CHECKPOINT_FILENAME, 1, new_entries=1, output_entries=1)
+    main_config.main_process(resume=True)
+    output = _read_output(main_config)
+    assert 1 not in gradcafe_server.requested_pages
+    assert output[0]["University"] == "From checkpoint"
+    assert len(output) == 4
+
+
+@pytest.mark.scrape
+def test_resume_without_work_file_starts_over(main_config, gradcafe_server):
+    """Tests that --resume ignores a checkpoint whose work file was deleted and crawls from page 1."""
+    save_checkpoint(main_config.CHECKPOINT_FILENAME, 1, new_entries=4, output_entries=4)
+    main_config.main_process(resume=True)
+    assert gradcafe_server.requested_pages == [1, 2, 3]
+    assert len(_read_output(main_config)) == 7
+    assert load_checkpoint(main_config.CHECKPOINT_FILENAME) is None
+
+
+@pytest.mark.scrape
+def test_incremental_stops_at_known_entry(main_config, gradcafe_server):
+    """Tests that an incremental run only fetches pages until it meets an entry from the previous dataset."""
+    previous = [{"University": "Previous", "URL Link": "https://www.thegradcafe.com/result/986096"}]
+    save_data(previous, main_config.OUTPUT_FILENAME)
+    main_config.main_process(incremental=True)
+    output = _read_output(main_config)
+    assert gradcafe_server.requested_pages == [1, 2]
+    assert [e["URL Link"][-6:] for e in output] == ["986101", "986100", "986099", "986098", "986097", "986096"]
+    assert output[-1]["University"] == "Previous"
+
+
+@pytest.mark.scrape
+def test_jsonl_output_is_streamed_page_by_page(main_config, tmp_path):
+    """Tests that a .jsonl output receives each page as it completes and loads back in page order."""
+    output = str(tmp_path / "applicant_data.jsonl")
+    main_config.main_process(output_filename=output)
+    entries = load_data(output)
+    assert [e["URL Link"][-6:] for e in entries] == [str(n) for n in range(986101, 986094, -1)]
+
+
+@pytest.mark.scrape
+def test_jsonl_resume_drops_pages_written_after_checkpoint(main_config, gradcafe_server, tmp_path):
+    """Tests that resuming a streamed crawl truncates the output back to the checkpoint before continuing."""
+    output = str(tmp_path / "applicant_data.jsonl")
+    main_config.main_process(output_filename=output)
+    save_checkpoint(main_config.CHECKPOINT_FILENAME, 1, new_entries=4, output_entries=4)
+    gradcafe_server.requested_pages.clear()
+    main_config.main_process(resume=True, output_filename=output)
+    assert gradcafe_server.requested_pages == [2, 3]
+    assert len(load_data(output)) == 7
+
+
+@pytest.mark.cache
+def test_offline_run_replays_cached_crawl(main_config, gradcafe_server):
+    """Tests that --offline reproduces a cached crawl without requesting anything."""
+    main_config.main_process(use_cache=True)
+    online_output = _read_output(main_config)
+    gradcafe_server.requested_pages.clear()
+    main_config.main_process(offline=True)
+    assert gradcafe_server.requested_pages == []
+    assert _read_output(main_config) == online_output
@@ -0,0 +1,88 @@
+# tests/test_parsing.py
+
+import json
+
+import pytest
+import scrape
+from scrape import AdmissionEntry, _make_soup, _parse_entry_details, _parse_page_entries, _resolve_parser
+from tests.conftest import read_fixture
+
+FIXTURE_PAGE_NAMES = ["survey_page_1.html", "survey_page_2.html", "survey_page_empty.html"]
+
+
+@pytest.mark.parsing
+@pytest.mark.parametrize("page_name", FIXTURE_PAGE_NAMES)
+def test_lxml_and_html_parser_produce_identical_entries(page_name):
+    """Tests that both parser backends extract identical entry dicts from a saved page."""
+    pytest.importorskip("lxml")
+    html = read_fixture(page_name)
+    reference_entries = _parse_page_entries(_make_soup(html, "html.parser"))
+    lxml_entries = _parse_page_entries(_make_soup(html, "lxml"))
+    assert lxml_entries == reference_entries
+
+
+@pytest.mark.parsing
+def test_scrape_data_backends_agree(gradcafe_server):
+    """Tests that a full crawl gives the same result with either backend."""
+    pytest.importorskip("lxml")
+    with_html_parser = scrape.scrape_data(gradcafe_server.survey_url, 5, 100, parser="html.parser")
+    with_lxml = scrape.scrape_data(gradcafe_server.survey_url, 5, 100, parser="lxml")
+    assert len(with_lxml) == 7
+    assert with_lxml == with_html_parser
+
+
+@pytest.mark.parsing
+def test_missing_backend_falls_back_to_html_parser(monkeypatch):
+    """Tests that an uninstalled backend falls back to html.parser."""
+    monkeypatch.setitem(scrape._available_parsers, "lxml", False)
+    assert _resolve_parser("lxml") == "html.parser"
+
+
+@pytest.mark.parsing
+def test_unknown_backend_is_rejected():
+    """Tests that a typo in the backend name is reported instead of silently ignored."""
+    with pytest.raises(ValueError):
+        _resolve_parser("html5")
+
+
+class _Pill:
+    """A stand-in for a pill div: only get_text() is used by the classifier."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def get_text(self, strip=False):
+        return self.text.strip() if strip else self.text
+
+
+@pytest.mark.parsing
+def test_pill_classifier_matches_recorded_fields():
+    """Tests that the pill classifier extracts exactly the fields recorded from the original re.search cascade."""
+    corpus = json.loads(read_fixture("pill_corpus.json"))
+    for case in corpus:
+        entry = AdmissionEntry.from_dict(case["initial"])
+        _parse_entry_details([_Pill(text) for text in case["pills"]], entry)
+        extracted = {key: value for key, value in entry.to_dict().items() if value != "N/A"}
+        assert extracted == case["expected"], case["pills"]
+
+
+@pytest.mark.parsing
+@pytest.mark.parametrize("page_name", ["survey_page_1.html", "survey_page_2.html"])
+def test_fixture_pages_parse_to_recorded_entries(page_name):
+    """Tests that AdmissionEntry.to_dict() reproduces the recorded JSON output, key order included."""
+    expected = json.loads(read_fixture("expected_entries.json"))[page_name]
+    entries = [entry.to_dict() for entry in _parse_page_entries(_make_soup(read_fixture(page_name)))]
+    assert entries == expected
+    assert [list(entry) for entry in entries] == [list(entry) for entry in expected]
+
+
+@pytest.mark.parsing
+def test_admission_entry_round_trips_through_dict():
+    """Tests that missing fields become "N/A" in the output and None again when read back."""
+    entry = AdmissionEntry(university="Johns Hopkins University", gpa="3.85")
+    as_dict = entry.to_dict()
+    assert len(as_dict) == 18
+    assert as_dict["University"] == "Johns Hopkins University"
+    assert as_dict["Comments"] == "N/A"
+    assert AdmissionEntry.from_dict(as_dict) == entry
+    assert not hasattr(entry, "__dict__")
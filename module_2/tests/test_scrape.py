@@ -0,0 +1,141 @@
+# tests/test_scrape.py
+
+import time
+
+import pytest
+import scrape
+from scrape import scrape_data, iter_scrape_data, iter_scrape_pages, _build_page_url, _HostRateLimiter, _backoff_delay
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    """Shrinks retry delays so retry tests run quickly."""
+    monkeypatch.setattr(scrape, "HTTP_BACKOFF_BASE_SECONDS", 0.01)
+
+
+@pytest.mark.scrape
+def test_build_page_url():
+    """Tests that page numbers are appended with the right query separator."""
+    assert _build_page_url("https://x.test/survey/", 1) == "https://x.test/survey/"
+    assert _build_page_url("https://x.test/survey/", 3) == "https://x.test/survey/?p=3"
+    assert _build_page_url("https://x.test/survey/?", 3) == "https://x.test/survey/?p=3"
+    assert _build_page_url("https://x.test/survey/?q=CS", 3) == "https://x.test/survey/?q=CS&p=3"
+
+
+@pytest.mark.scrape
+def test_concurrent_scrape_matches_sequential(gradcafe_server):
+    """Tests that concurrent fetching returns the same entries, in page order, as sequential fetching."""
+    sequential = scrape_data(gradcafe_server.survey_url, max_pages=10, max_entries=100)
+    concurrent = scrape_data(gradcafe_server.survey_url, max_pages=10, max_entries=100, concurrency=4)
+    assert len(sequential) == 7
+    assert concurrent == sequential
+    assert [e.url_link[-6:] for e in concurrent] == [str(n) for n in range(986101, 986094, -1)]
+
+
+@pytest.mark.scrape
+def test_concurrent_scrape_respects_max_entries(gradcafe_server):
+    """Tests that the entry limit still stops the crawl after the page that reaches it."""
+    entries = scrape_data(gradcafe_server.survey_url, max_pages=10, max_entries=2, concurrency=4)
+    assert len(entries) == 4
+
+
+@pytest.mark.scrape
+def test_concurrent_scrape_respects_max_pages(gradcafe_server):
+    """Tests that no page beyond max_pages is requested."""
+    entries = scrape_data(gradcafe_server.survey_url, max_pages=1, max_entries=100, concurrency=4)
+    assert len(entries) == 4
+    assert gradcafe_server.requested_pages == [1]
+
+
+@pytest.mark.scrape
+def test_host_rate_limiter_spaces_requests():
+    """Tests that requests to one host are spaced by the configured interval."""
+    limiter = _HostRateLimiter(requests_per_second=20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait("http://example.test/survey/")
+    assert time.monotonic() - start >= 4 * 0.05 * 0.9
+
+
+@pytest.mark.scrape
+def test_session_reuses_connections(gradcafe_server):
+    """Tests that sequential page fetches share one keep-alive connection."""
+    scrape.configure_session()
+    entries = scrape_data(gradcafe_server.survey_url, max_pages=3, max_entries=100)
+    assert len(entries) == 7
+    assert len(gradcafe_server.requested_pages) == 3
+    assert len(gradcafe_server.client_ports) == 1
+
+
+@pytest.mark.scrape
+def test_transient_errors_are_retried(gradcafe_server, fast_backoff):
+    """Tests that 429/5xx responses cost a retry instead of truncating the crawl."""
+    gradcafe_server.fail_page(2, 503, 429)
+    entries = scrape_data(gradcafe_server.survey_url, max_pages=3, max_entries=100)
+    assert len(entries) == 7
+    assert gradcafe_server.requested_pages.count(2) == 3
+
+
+@pytest.mark.scrape
+def test_retries_give_up_after_limit(gradcafe_server, fast_backoff, monkeypatch):
+    """Tests that a page failing on every attempt still ends the crawl."""
+    monkeypatch.setattr(scrape, "HTTP_MAX_RETRIES", 2)
+    gradcafe_server.fail_page(2, 500, 500, 500)
+    entries = scrape_data(gradcafe_server.survey_url, max_pages=3, max_entries=100)
+    assert len(entries) == 4
+    assert gradcafe_server.requested_pages.count(2) == 3
+
+
+@pytest.mark.scrape
+def test_client_errors_are_not_retried(gradcafe_server, fast_backoff):
+    """Tests that a 404 is reported once rather than retried."""
+    gradcafe_server.fail_page(1, 404)
+    assert scrape_data(gradcafe_server.survey_url, max_pages=3, max_entries=100) == []
+    assert gradcafe_server.requested_pages == [1]
+
+
+@pytest.mark.scrape
+def test_backoff_delay_grows_with_jitter(monkeypatch):
+    """Tests that backoff doubles per attempt, stays within its jitter band and honours Retry-After."""
+    monkeypatch.setattr(scrape, "HTTP_BACKOFF_BASE_SECONDS", 1.0)
+    monkeypatch.setattr(scrape, "HTTP_BACKOFF_MAX_SECONDS", 8.0)
+    for attempt, capped in [(0, 1.0), (1, 2.0), (2, 4.0), (5, 8.0)]:
+        assert capped / 2 <= _backoff_delay(attempt) <= capped
+    assert _backoff_delay(0, retry_after="5") == 5.0
+
+
+@pytest.mark.scrape
+def test_generators_match_list_wrapper(gradcafe_server):
+    """Tests that the page and entry generators yield what scrape_data returns."""
+    entries = scrape_data(gradcafe_server.survey_url, max_pages=5, max_entries=100)
+    pages = list(iter_scrape_pages(gradcafe_server.survey_url, max_pages=5, max_entries=100))
+    assert [page_num for page_num, _ in pages] == [1, 2]
+    assert [entry for _, page_entries in pages for entry in page_entries] == entries
+    assert list(iter_scrape_data(gradcafe_server.survey_url, max_pages=5, max_entries=100, concurrency=2)) == entries
+
+
+@pytest.mark.scrape
+def test_entry_generator_fetches_lazily(gradcafe_server):
+    """Tests that pulling the first entry only fetches the first page."""
+    entries = iter_scrape_data(gradcafe_server.survey_url, max_pages=5, max_entries=100)
+    next(entries)
+    entries.close()
+    assert gradcafe_server.requested_pages == [1]
+
+
+@pytest.mark.scrape
+@pytest.mark.parametrize("parse_workers", [1, 2])
+def test_process_pool_parsing_matches_inline(gradcafe_server, parse_workers):
+    """Tests that parsing in worker processes returns the same entries in the same page order."""
+    inline = scrape_data(gradcafe_server.survey_url, max_pages=10, max_entries=100)
+    pooled = scrape_data(gradcafe_server.survey_url, max_pages=10, max_entries=100, concurrency=3,
+                         parse_workers=parse_workers, parse_queue_size=2)
+    assert pooled == inline
+
+
+@pytest.mark.scrape
+def test_process_pool_parsing_keeps_stop_conditions(gradcafe_server, fast_backoff):
+    """Tests that entry limits and failed fetches still stop a crawl parsed in worker processes."""
+    assert len(scrape_data(gradcafe_server.survey_url, 10, max_entries=2, parse_workers=2)) == 4
+    gradcafe_server.fail_page(2, 404)
+    assert len(scrape_data(gradcafe_server.survey_url, 10, max_entries=100, parse_workers=2)) == 4
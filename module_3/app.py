@@ -6,6 +6,29 @@ import psycopg2
 
 app = Flask(__name__)
 
+# The 7 dashboard metrics in a single aggregate query (columns 0-10, see index()).
+# The original one-query-per-question versions are kept below for ad-hoc use.
+DASHBOARD_QUERY = """
+SELECT
+    COUNT(*) FILTER (WHERE semester_start = 'Fall 2025'),
+    100.0 * COUNT(*) FILTER (WHERE student_type = 'International') / NULLIF(COUNT(*), 0),
+    AVG(gpa), AVG(gre_total), AVG(gre_v), AVG(gre_q), AVG(gre_aw),
+    AVG(gpa) FILTER (WHERE student_type = 'American' AND semester_start = 'Fall 2025'),
+    100.0 * COUNT(*) FILTER (WHERE applicant_status = 'Accepted' AND semester_start = 'Fall 2025')
+        / NULLIF(COUNT(*) FILTER (WHERE semester_start = 'Fall 2025'), 0),
+    AVG(gpa) FILTER (WHERE semester_start = 'Fall 2025' AND applicant_status = 'Accepted'),
+    COUNT(*) FILTER (WHERE university ILIKE '%Johns Hopkins%' AND program_name ILIKE '%Computer Science%' AND degree = 'Masters')
+FROM applicants;
+"""
+
+QUERY_1 = "SELECT COUNT(*) FROM applicants WHERE semester_start = 'Fall 2025';"
+QUERY_2 = "SELECT 100.0 * COUNT(*) FILTER (WHERE student_type = 'International') / COUNT(*) FROM applicants;"
+QUERY_3 = "SELECT AVG(gpa), AVG(gre_total), AVG(gre_v), AVG(gre_q), AVG(gre_aw) FROM applicants;"
+QUERY_4 = "SELECT AVG(gpa) FROM applicants WHERE student_type = 'American' AND semester_start = 'Fall 2025';"
+QUERY_5 = "SELECT 100.0 * COUNT(*) FILTER (WHERE applicant_status = 'Accepted') / NULLIF(COUNT(*), 0) FROM applicants WHERE semester_start = 'Fall 2025';"
+QUERY_6 = "SELECT AVG(gpa) FROM applicants WHERE semester_start = 'Fall 2025' AND applicant_status = 'Accepted';"
+QUERY_7 = "SELECT COUNT(*) FROM applicants WHERE university ILIKE '%Johns Hopkins%' AND program_name ILIKE '%Computer Science%' AND degree = 'Masters';"
+
 def execute_query(query):
     """A reusable function to connect and run a query."""
     db_url = os.environ.get('DATABASE_URL')
@@ -22,26 +45,28 @@ def execute_query(query):
 def index():
     """
     This function runs when a user visits the main page.
-    It executes all 7 queries and passes the results to the HTML template.
+    It computes all 7 answers and passes the results to the HTML template.
     """
     # A list to hold all our question and answer pairs
     query_results = []
 
+    # All 7 answers come from one pass over the table: each metric is an aggregate
+    # with its own FILTER clause, so this is one scan and one round trip instead of 7.
+    result = execute_query(DASHBOARD_QUERY)
+    row = result[0] if result else None
+
     # --- Query 1 ---
-    query_1 = "SELECT COUNT(*) FROM applicants WHERE semester_start = 'Fall 2025';"
-    result_1 = execute_query(query_1)
+    result_1 = [row[0:1]] if row else []
     answer_1 = f"{result_1[0][0]:,}" if result_1 else "Query Failed"
     query_results.append(("1. How many applicants for Fall 2025?", answer_1))
 
     # --- Query 2 ---
-    query_2 = "SELECT 100.0 * COUNT(*) FILTER (WHERE student_type = 'International') / COUNT(*) FROM applicants;"
-    result_2 = execute_query(query_2)
+    result_2 = [row[1:2]] if row else []
     answer_2 = f"{result_2[0][0]:.2f}%" if result_2 and result_2[0][0] is not None else "Query Failed"
     query_results.append(("2. Percentage of International Students:", answer_2))
 
     # --- Query 3 ---
-    query_3 = "SELECT AVG(gpa), AVG(gre_total), AVG(gre_v), AVG(gre_q), AVG(gre_aw) FROM applicants;"
-    result_3 = execute_query(query_3)
+    result_3 = [row[2:7]] if row else []
     answer_3_list = []
     if result_3 and result_3[0] is not None:
         avg_gpa, avg_gre_total, avg_gre_v, avg_gre_q, avg_gre_aw = result_3[0]
@@ -53,26 +78,22 @@ def index():
     query_results.append(("3. Average Scores (All Terms):", " | ".join(answer_3_list) if answer_3_list else "No Data"))
 
     # --- Query 4 ---
-    query_4 = "SELECT AVG(gpa) FROM applicants WHERE student_type = 'American' AND semester_start = 'Fall 2025';"
-    result_4 = execute_query(query_4)
+    result_4 = [row[7:8]] if row else []
     answer_4 = f"{result_4[0][0]:.2f}" if result_4 and result_4[0][0] is not None else "No Data"
     query_results.append(("4. Avg GPA of American Students in Fall 2025:", answer_4))
 
     # --- Query 5 ---
-    query_5 = "SELECT 100.0 * COUNT(*) FILTER (WHERE applicant_status = 'Accepted') / NULLIF(COUNT(*), 0) FROM applicants WHERE semester_start = 'Fall 2025';"
-    result_5 = execute_query(query_5)
+    result_5 = [row[8:9]] if row else []
     answer_5 = f"{result_5[0][0]:.2f}%" if result_5 and result_5[0][0] is not None else "No Data"
     query_results.append(("5. Percent Acceptances for Fall 2025:", answer_5))
 
     # --- Query 6 ---
-    query_6 = "SELECT AVG(gpa) FROM applicants WHERE semester_start = 'Fall 2025' AND applicant_status = 'Accepted';"
-    result_6 = execute_query(query_6)
+    result_6 = [row[9:10]] if row else []
     answer_6 = f"{result_6[0][0]:.2f}" if result_6 and result_6[0][0] is not None else "No Data"
     query_results.append(("6. Avg GPA of Accepted Students in Fall 2025:", answer_6))
 
     # --- Query 7 ---
-    query_7 = "SELECT COUNT(*) FROM applicants WHERE university ILIKE '%Johns Hopkins%' AND program_name ILIKE '%Computer Science%' AND degree = 'Masters';"
-    result_7 = execute_query(query_7)
+    result_7 = [row[10:11]] if row else []
     answer_7 = result_7[0][0] if result_7 else "Query Failed"
     query_results.append(("7. Johns Hopkins Masters in Computer Science Applicants:", answer_7))
 
@@ -7,6 +7,10 @@ applicant data, and populates it from 'applicant_data.json'. This final version
 cleans and validates the data before insertion, checking for valid GRE score 
 ranges and handling data type mismatches.
 
+With LOAD_MODE = 'upsert' the table is kept between runs: a unique index on
+`url` lets new rows be inserted and changed rows be updated in place with
+INSERT ... ON CONFLICT, so the dashboard never sees an empty table.
+
 Prerequisites:
 1.  A `DATABASE_URL` secret must be configured in the Replit environment.
 2.  Required Python packages installed: `psycopg2-binary`.
@@ -24,6 +28,7 @@ import json
 
 # ------------------- CONFIGURATION -------------------
 JSON_FILE_PATH = 'applicant_data.json' 
+LOAD_MODE = 'replace' # 'replace' drops and reloads the table; 'upsert' only writes new or changed rows
 
 # ------------------- SCRIPT EXECUTION -------------------
 
@@ -42,11 +47,12 @@ def main():
 
         with conn.cursor() as cur:
             # --- Step 1: Define and Create the Database Table ---
-            cur.execute("DROP TABLE IF EXISTS applicants;")
-            print("Dropped existing 'applicants' table (if it existed).")
+            if LOAD_MODE == 'replace':
+                cur.execute("DROP TABLE IF EXISTS applicants;")
+                print("Dropped existing 'applicants' table (if it existed).")
 
             create_table_query = """
-            CREATE TABLE applicants (
+            CREATE TABLE IF NOT EXISTS applicants (
                 id SERIAL PRIMARY KEY,
                 university TEXT,
                 program_name TEXT,
@@ -66,7 +72,19 @@ def main():
             );
             """
             cur.execute(create_table_query)
-            print("Table 'applicants' created with the correct schema.")
+            print("Table 'applicants' ready with the correct schema.")
+
+            if LOAD_MODE == 'upsert':
+                # Upserts match rows on their GradCafe link, so it has to be unique.
+                # Rows without a link ('N/A') can't be matched and are left out of the index.
+                cur.execute("SELECT to_regclass('applicants_url_key');")
+                if cur.fetchone()[0] is None:
+                    cur.execute("""
+                    DELETE FROM applicants AS a USING applicants AS b
+                    WHERE a.url = b.url AND a.url <> 'N/A' AND a.id > b.id;
+                    """)
+                    print(f"Removed {cur.rowcount} duplicate rows before adding the url key.")
+                    cur.execute("CREATE UNIQUE INDEX applicants_url_key ON applicants (url) WHERE url <> 'N/A';")
 
             # --- Step 2: Load and Clean JSON Data ---
             print(f"Loading data from file: {JSON_FILE_PATH}")
@@ -136,10 +154,42 @@ def main():
             FROM json_array_elements(%s) AS element;
             """
 
+            if LOAD_MODE == 'upsert':
+                # Same SELECT, but one row per link (the first one in the file wins), and
+                # existing links are only updated when one of their columns actually changed.
+                insert_from_json_query = insert_from_json_query.replace(
+                    "FROM json_array_elements(%s) AS element;", """FROM (
+                SELECT DISTINCT ON (element->>'URL') element FROM json_array_elements(%s)
+                    WITH ORDINALITY AS incoming(element, file_order)
+                WHERE element->>'URL' <> 'N/A'
+                ORDER BY element->>'URL', file_order
+            ) AS unique_links
+            ON CONFLICT (url) WHERE url <> 'N/A' DO UPDATE SET
+                university = EXCLUDED.university, program_name = EXCLUDED.program_name,
+                degree = EXCLUDED.degree, applicant_status = EXCLUDED.applicant_status,
+                decision_date = EXCLUDED.decision_date, date_added = EXCLUDED.date_added,
+                semester_start = EXCLUDED.semester_start, student_type = EXCLUDED.student_type,
+                gpa = EXCLUDED.gpa, gre_total = EXCLUDED.gre_total, gre_v = EXCLUDED.gre_v,
+                gre_q = EXCLUDED.gre_q, gre_aw = EXCLUDED.gre_aw, comment = EXCLUDED.comment
+            WHERE (applicants.university, applicants.program_name, applicants.degree,
+                   applicants.applicant_status, applicants.decision_date, applicants.date_added,
+                   applicants.semester_start, applicants.student_type, applicants.gpa,
+                   applicants.gre_total, applicants.gre_v, applicants.gre_q, applicants.gre_aw,
+                   applicants.comment)
+                IS DISTINCT FROM
+                  (EXCLUDED.university, EXCLUDED.program_name, EXCLUDED.degree,
+                   EXCLUDED.applicant_status, EXCLUDED.decision_date, EXCLUDED.date_added,
+                   EXCLUDED.semester_start, EXCLUDED.student_type, EXCLUDED.gpa,
+                   EXCLUDED.gre_total, EXCLUDED.gre_v, EXCLUDED.gre_q, EXCLUDED.gre_aw,
+                   EXCLUDED.comment);""")
+
             cur.execute(insert_from_json_query, (cleaned_json_data_string,))
 
             conn.commit()
-            print(f"Transaction committed. {cur.rowcount} new records were processed.")
+            if LOAD_MODE == 'upsert':
+                print(f"Transaction committed. {cur.rowcount} new or changed records were written.")
+            else:
+                print(f"Transaction committed. {cur.rowcount} new records were processed.")
 
     except psycopg2.Error as e:
         print(f"A database error occurred: {e}")
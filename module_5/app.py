@@ -4,19 +4,56 @@ This module contains a Flask web application that connects to a PostgreSQL
 database to retrieve and display applicant data.
 """
 
+import asyncio
+import hashlib
 import os
-from flask import Flask, render_template
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from flask import Flask, jsonify, render_template, request
 import psycopg2
 from psycopg2 import sql
 
+import db
+import metrics
+import snapshot
+from query_cache import DEFAULT_TTL_SECONDS, FileBackend, QueryCache
+
 app = Flask(__name__)
+# Pool size can be set through the DB_POOL_MIN / DB_POOL_MAX environment variables
+app.config.from_mapping(DB_POOL_MIN=db.POOL_MIN_CONNECTIONS, DB_POOL_MAX=db.POOL_MAX_CONNECTIONS)
+db.configure_pool(app.config['DB_POOL_MIN'], app.config['DB_POOL_MAX'])
+# Results are cached per data version; set QUERY_CACHE_DIR to share them between workers
+app.config.from_mapping(
+    QUERY_CACHE_TTL=float(os.environ.get('QUERY_CACHE_TTL', DEFAULT_TTL_SECONDS)),
+    QUERY_CACHE_DIR=os.environ.get('QUERY_CACHE_DIR'))
+query_cache = QueryCache(
+    app.config['QUERY_CACHE_TTL'],
+    shared_backend=(FileBackend(app.config['QUERY_CACHE_DIR'])
+                    if app.config['QUERY_CACHE_DIR'] else None))
+# METRICS_BACKEND=snapshot answers the page and /api/metrics from an in-memory
+# snapshot of SNAPSHOT_SOURCE ('database', the default, or a JSON file's path),
+# built on the first request; the SQL path answers while it cannot be built
+app.config.from_mapping(
+    METRICS_BACKEND=os.environ.get('METRICS_BACKEND', 'postgres'),
+    SNAPSHOT_SOURCE=os.environ.get('SNAPSHOT_SOURCE', snapshot.DATABASE_SOURCE))
+snapshot_store = (snapshot.SnapshotStore(app.config['SNAPSHOT_SOURCE'], query_cache.data_version)
+                  if app.config['METRICS_BACKEND'] == 'snapshot' else None)
+# Threads the async page runs its blocking queries on, one per pooled connection
+query_executor = ThreadPoolExecutor(max_workers=app.config['DB_POOL_MAX'],
+                                    thread_name_prefix='dashboard-query')
+
+# /api/metrics parameters matched anywhere in the column (ILIKE '%value%')
+SUBSTRING_FILTERS = ('university', 'program')
 
 def execute_query(query, params=None):
     """
-    Connects to the database, executes a given SQL query, and returns results.
+    Executes a given SQL query on a pooled connection and returns results.
 
     This function is designed to be reusable and securely handles queries
-    by using parameterized inputs.
+    by using parameterized inputs. Connections come from the process-wide
+    pool in db.py, so a page view does not open new database connections,
+    and results are served from `query_cache` until the next data load.
 
     Args:
         query (psycopg2.sql.SQL): The SQL query object to be executed.
@@ -27,42 +64,29 @@ def execute_query(query, params=None):
         list: A list of tuples containing the query results, or an empty
               list if an error occurs or no results are found.
     """
-    db_url = os.environ.get('DATABASE_URL')
     try:
-        with psycopg2.connect(db_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, params)
-                return cur.fetchall()
+        return query_cache.execute(query, params)
     except psycopg2.Error as e:
         print(f"Database query error: {e}")
     return []
 
-# --- Helper functions for each query ---
+# --- Formatters for each query's result ---
 
-def _get_query_1_data(semester):
-    """Fetches the total number of applicants for a given semester."""
+def _format_query_1(result):
+    """Formats the total number of applicants for a given semester."""
     question = "1. How many applicants for Fall 2025?"
-    query = sql.SQL("SELECT COUNT(*) FROM applicants WHERE semester_start = %s;")
-    result = execute_query(query, (semester,))
     answer = f"{result[0][0]:,}" if result else "Query Failed"
     return (question, answer)
 
-def _get_query_2_data():
-    """Fetches the percentage of international students."""
+def _format_query_2(result):
+    """Formats the percentage of international students."""
     question = "2. Percentage of International Students:"
-    query = sql.SQL("SELECT 100.0 * COUNT(*) FILTER"
-                    " (WHERE student_type = 'International') / COUNT(*)"
-                    " FROM applicants;")
-    result = execute_query(query)
     answer = f"{result[0][0]:.2f}%" if result and result[0][0] is not None else "Query Failed"
     return (question, answer)
 
-def _get_query_3_data():
-    """Fetches the average scores across all terms."""
+def _format_query_3(result):
+    """Formats the average scores across all terms."""
     question = "3. Average Scores (All Terms):"
-    query = sql.SQL("SELECT AVG(gpa), AVG(gre_total), AVG(gre_v), AVG(gre_q),"
-                    " AVG(gre_aw) FROM applicants;")
-    result = execute_query(query)
     answer_list = []
     if result and result[0] is not None:
         avg_gpa, avg_gre_total, avg_gre_v, avg_gre_q, avg_gre_aw = result[0]
@@ -74,63 +98,235 @@ def _get_query_3_data():
     answer = " | ".join(answer_list) if answer_list else "No Data"
     return (question, answer)
 
+def _format_query_4(result):
+    """Formats the average GPA for a student type in a given semester."""
+    question = "4. Avg GPA of American Students in Fall 2025:"
+    answer = f"{result[0][0]:.2f}" if result and result[0][0] is not None else "No Data"
+    return (question, answer)
+
+def _format_query_5(result):
+    """Formats the percentage of acceptances for a given semester."""
+    question = "5. Percent Acceptances for Fall 2025:"
+    answer = f"{result[0][0]:.2f}%" if result and result[0][0] is not None else "No Data"
+    return (question, answer)
+
+def _format_query_6(result):
+    """Formats the average GPA of accepted students for a given semester."""
+    question = "6. Avg GPA of Accepted Students in Fall 2025:"
+    answer = f"{result[0][0]:.2f}" if result and result[0][0] is not None else "No Data"
+    return (question, answer)
+
+def _format_query_7(result):
+    """Formats the count of applicants for a specific program."""
+    question = "7. Johns Hopkins Masters in Computer Science Applicants:"
+    answer = result[0][0] if result else "Query Failed"
+    return (question, answer)
+
+QUERY_FORMATTERS = (_format_query_1, _format_query_2, _format_query_3, _format_query_4,
+                    _format_query_5, _format_query_6, _format_query_7)
+
+def _current_snapshot():
+    """
+    Returns the metrics snapshot, building it on first use.
+
+    Returns:
+        snapshot.ApplicantSnapshot: The snapshot, or None if the snapshot
+                                    backend is off or the database it is
+                                    read from cannot be reached.
+    """
+    if snapshot_store is None:
+        return None
+    try:
+        return snapshot_store.current()
+    except psycopg2.Error as e:
+        print(f"Snapshot unavailable, answering from SQL: {e}")
+        return None
+
+def _dashboard_results(**filters):
+    """Answers the seven questions from the snapshot if enabled, else from the database."""
+    current = _current_snapshot()
+    if current is not None:
+        return current.dashboard_results(**filters)
+    return metrics.fetch_dashboard_results(execute_query, **filters)
+
+def _get_dashboard_data(**filters):
+    """
+    Fetches all seven answers with the single aggregate query in metrics.py
+    (or from the in-memory snapshot, see `snapshot_store`).
+
+    Args:
+        **filters: Overrides for metrics.DEFAULT_FILTERS.
+
+    Returns:
+        list: (question, answer) tuples in question order.
+    """
+    results = _dashboard_results(**filters)
+    return [format_result(result) for format_result, result in zip(QUERY_FORMATTERS, results)]
+
+# --- Helper functions for each query (one query each, for ad-hoc use) ---
+
+def _get_query_1_data(semester):
+    """Fetches the total number of applicants for a given semester."""
+    query = sql.SQL("SELECT COUNT(*) FROM applicants WHERE semester_start = %s;")
+    return _format_query_1(execute_query(query, (semester,)))
+
+def _get_query_2_data():
+    """Fetches the percentage of international students."""
+    query = sql.SQL("SELECT 100.0 * COUNT(*) FILTER"
+                    " (WHERE student_type = 'International') / COUNT(*)"
+                    " FROM applicants;")
+    return _format_query_2(execute_query(query))
+
+def _get_query_3_data():
+    """Fetches the average scores across all terms."""
+    query = sql.SQL("SELECT AVG(gpa), AVG(gre_total), AVG(gre_v), AVG(gre_q),"
+                    " AVG(gre_aw) FROM applicants;")
+    return _format_query_3(execute_query(query))
+
 def _get_query_4_data(student_type, semester):
     """Fetches the average GPA for a student type in a given semester."""
-    question = "4. Avg GPA of American Students in Fall 2025:"
     query = sql.SQL("SELECT AVG(gpa) FROM applicants"
                     " WHERE student_type = %s AND semester_start = %s;")
-    result = execute_query(query, (student_type, semester))
-    answer = f"{result[0][0]:.2f}" if result and result[0][0] is not None else "No Data"
-    return (question, answer)
+    return _format_query_4(execute_query(query, (student_type, semester)))
 
 def _get_query_5_data(semester):
     """Fetches the percentage of acceptances for a given semester."""
-    question = "5. Percent Acceptances for Fall 2025:"
     query = sql.SQL("SELECT 100.0 * COUNT(*) FILTER"
                     " (WHERE applicant_status = 'Accepted') / NULLIF(COUNT(*), 0)"
                     " FROM applicants WHERE semester_start = %s;")
-    result = execute_query(query, (semester,))
-    answer = f"{result[0][0]:.2f}%" if result and result[0][0] is not None else "No Data"
-    return (question, answer)
+    return _format_query_5(execute_query(query, (semester,)))
 
 def _get_query_6_data(semester, status):
     """Fetches the average GPA of accepted students for a given semester."""
-    question = "6. Avg GPA of Accepted Students in Fall 2025:"
     query = sql.SQL("SELECT AVG(gpa) FROM applicants"
                     " WHERE semester_start = %s AND applicant_status = %s;")
-    result = execute_query(query, (semester, status))
-    answer = f"{result[0][0]:.2f}" if result and result[0][0] is not None else "No Data"
-    return (question, answer)
+    return _format_query_6(execute_query(query, (semester, status)))
 
 def _get_query_7_data(university, program, degree):
     """Fetches the count of applicants for a specific program."""
-    question = "7. Johns Hopkins Masters in Computer Science Applicants:"
     query = sql.SQL("SELECT COUNT(*) FROM applicants"
                     " WHERE university ILIKE %s AND program_name ILIKE %s"
                     " AND degree = %s;")
-    result = execute_query(query, (university, program, degree))
-    answer = result[0][0] if result else "Query Failed"
-    return (question, answer)
+    return _format_query_7(execute_query(query, (university, program, degree)))
+
+def _question_calls(**filters):
+    """
+    Pairs each of the seven per-question helpers with its arguments.
+
+    Args:
+        **filters: Overrides for metrics.DEFAULT_FILTERS.
+
+    Returns:
+        tuple: (helper, args) for questions 1 to 7.
+    """
+    params = {**metrics.DEFAULT_FILTERS, **filters}
+    return (
+        (_get_query_1_data, (params['semester'],)),
+        (_get_query_2_data, ()),
+        (_get_query_3_data, ()),
+        (_get_query_4_data, (params['student_type'], params['semester'])),
+        (_get_query_5_data, (params['semester'],)),
+        (_get_query_6_data, (params['semester'], params['status'])),
+        (_get_query_7_data, (params['university'], params['program'], params['degree'])),
+    )
+
+async def _get_dashboard_data_concurrently(**filters):
+    """
+    Answers the seven questions with their own queries, all at once.
+
+    Each helper blocks on a pooled connection in `query_executor`, so the
+    answers take as long as the slowest query rather than the sum of all
+    seven round trips.
+
+    Args:
+        **filters: Overrides for metrics.DEFAULT_FILTERS.
+
+    Returns:
+        list: (question, answer) tuples in question order.
+    """
+    loop = asyncio.get_running_loop()
+    return list(await asyncio.gather(*(loop.run_in_executor(query_executor, get_data, *args)
+                                       for get_data, args in _question_calls(**filters))))
 
 @app.route('/')
 def index():
     """
     Handles requests to the main page.
 
-    Executes all required queries by calling helper functions and renders
-    them in the main HTML template.
+    Computes all seven answers in one aggregate query and renders them in
+    the main HTML template.
+    """
+    query_results = _get_dashboard_data()
+
+    return render_template('index.html', query_results=query_results)
+
+@app.route('/async')
+async def index_async():
+    """
+    Async variant of the main page.
+
+    Runs the seven per-question queries concurrently and renders the main
+    HTML template once all of them have completed. Needs Flask's async
+    extra (`pip install "Flask[async]"`).
     """
-    query_results = [
-        _get_query_1_data("Fall 2025"),
-        _get_query_2_data(),
-        _get_query_3_data(),
-        _get_query_4_data("American", "Fall 2025"),
-        _get_query_5_data("Fall 2025"),
-        _get_query_6_data("Fall 2025", "Accepted"),
-        _get_query_7_data("%Johns Hopkins%", "%Computer Science%", "Masters")
-    ]
+    query_results = await _get_dashboard_data_concurrently()
 
     return render_template('index.html', query_results=query_results)
 
+def _like_pattern(text):
+    """Returns an ILIKE pattern matching `text` anywhere, its own wildcards escaped."""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+def _metrics_etag(version, params):
+    """Returns the ETag of the metrics for `params` as of data version `version`."""
+    digest = hashlib.sha256(repr(sorted(params.items())).encode('utf-8')).hexdigest()
+    return f"{version}-{digest[:16]}"
+
+def _json_value(value):
+    """Turns a result value into something jsonify can write (Decimal -> float)."""
+    return float(value) if isinstance(value, Decimal) else value
+
+@app.route('/api/metrics')
+def api_metrics():
+    """
+    Returns the seven dashboard metrics as JSON, for the given filters.
+
+    Query parameters (all optional, defaults as on the main page):
+    semester, student_type, status and degree match exactly; university
+    and program match anywhere in the name, ignoring case. The response
+    carries an ETag built from the data version, and a request whose
+    If-None-Match holds it gets 304 Not Modified without any query running.
+    """
+    unknown = sorted(set(request.args) - set(metrics.DEFAULT_FILTERS))
+    if unknown:
+        return jsonify(error=f"Unknown parameter(s): {', '.join(unknown)}"), 400
+    params = {**metrics.DEFAULT_FILTERS,
+              **{key: _like_pattern(value) if key in SUBSTRING_FILTERS else value
+                 for key, value in request.args.items()}}
+
+    current = _current_snapshot()
+    version = current.version if current is not None else query_cache.data_version()
+    etag = _metrics_etag(version, params) if version is not None else None
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        results = (current.dashboard_results(**params) if current is not None
+                   else metrics.fetch_dashboard_results(execute_query, **params))
+        if not results[0]:
+            return jsonify(error="The metrics are unavailable right now."), 503
+        values = [_json_value(value) for result in results for value in result[0]]
+        response = jsonify(data_version=version, filters=params,
+                           metrics=dict(zip(metrics.METRIC_NAMES, values)))
+    if etag is not None:
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # revalidate with If-None-Match every time
+    return response
+
+@app.route('/cache-stats')
+def cache_stats():
+    """Returns the query cache's hit/miss counters as JSON."""
+    return jsonify(query_cache.stats())
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8080)
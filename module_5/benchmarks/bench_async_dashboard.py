@@ -0,0 +1,79 @@
+# benchmarks/bench_async_dashboard.py
+"""
+Latency benchmark: seven dashboard queries run one after another versus concurrently.
+
+Sends requests from several client threads for a fixed time to three pages
+of the Flask app and reports requests/sec and p50/p99 latency for each:
+
+- serial: the seven per-question helpers called one after another (a sync
+  view registered here, as the original index page worked).
+- async: /async, which runs the same seven queries concurrently on the
+  pool.
+- aggregate: /, the single aggregate query over the summary table.
+
+The result cache is disabled so every request reaches the database.
+Requests go through Flask's test client, so only the app and the database
+are measured, not an HTTP server.
+
+Needs DATABASE_URL pointing at a (preferably local) PostgreSQL server with
+the applicants table loaded, and Flask's async extra.
+
+Usage (from module_5):
+    python -m benchmarks.bench_async_dashboard [--seconds 10] [--clients 1 8]
+        [--pool 20]
+"""
+# Benchmarks drive load_data.py's (and app.py's) internal steps directly
+# pylint: disable=protected-access
+import argparse
+import os
+import statistics
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from flask import render_template
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import app  # noqa: E402  # pylint: disable=wrong-import-position
+import db  # noqa: E402  # pylint: disable=wrong-import-position
+from benchmarks.bench_dashboard_requests import _run_clients  # noqa: E402  # pylint: disable=wrong-import-position
+
+PAGES = (("serial", "/serial"), ("async", "/async"), ("aggregate", "/"))
+
+
+def _index_serial():
+    query_results = [get_data(*args) for get_data, args in app._question_calls()]
+    return render_template('index.html', query_results=query_results)
+
+
+def main():
+    """Runs each page under load and prints throughput and latency percentiles."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--seconds", type=float, default=10.0)
+    arg_parser.add_argument("--clients", type=int, nargs="+", default=[1, 8])
+    arg_parser.add_argument("--pool", type=int, default=20)
+    args = arg_parser.parse_args()
+    if not os.environ.get("DATABASE_URL"):
+        sys.exit("DATABASE_URL is not set; point it at a local PostgreSQL server.")
+
+    app.app.add_url_rule("/serial", "index_serial", _index_serial)
+    app.query_cache.ttl_seconds = 0.0  # measure the queries, not the result cache
+    db.configure_pool(minconn=args.pool, maxconn=args.pool)
+    app.query_executor = ThreadPoolExecutor(max_workers=args.pool,
+                                            thread_name_prefix="dashboard-query")
+    try:
+        print(f"{'page':<10} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for clients in args.clients:
+            for label, path in PAGES:
+                _run_clients(1, clients, path)  # warm up connections and plans
+                latencies, wall_seconds, _ = _run_clients(args.seconds, clients, path)
+                quantiles = statistics.quantiles(latencies, n=100)
+                print(f"{label:<10} {clients:>7} {len(latencies) / wall_seconds:>8.1f} "
+                      f"{quantiles[49] * 1000:>8.1f} {quantiles[98] * 1000:>8.1f}")
+    finally:
+        app.query_executor.shutdown()
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_clean_scores.py
+"""
+Cleaning benchmark: record-by-record versus NumPy columnar score validation.
+
+Builds N synthetic records with realistic score values (mostly valid, some
+blank, space-separated, out of range or unparsable), cleans an identical copy
+with each path in batches of CLEAN_BATCH_ROWS, checks that the results and
+per-field reject counts match, and reports records/sec.
+
+Usage (from module_5):
+    python -m benchmarks.bench_clean_scores [--records 1000000]
+"""
+# Benchmarks drive load_data.py's (and app.py's) internal steps directly
+# pylint: disable=protected-access
+import argparse
+import gc
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import load_data  # noqa: E402  # pylint: disable=wrong-import-position
+
+DIRTY_VALUES = ["N/A", "N/A", "N/A", "", "3 7", "4.3", "175", "12", "abc", "3.5 "]
+
+
+def _synthetic_records(record_count, seed=5):
+    rng = random.Random(seed)
+    records = []
+    for n in range(record_count):
+        record = {"URL": f"https://www.thegradcafe.com/result/{n}"}
+        for key, (low, high) in load_data.VALIDATION_RANGES.items():
+            if rng.random() < 0.3:
+                record[key] = rng.choice(DIRTY_VALUES)
+            else:
+                record[key] = f"{rng.uniform(low, high):.2f}"
+        records.append(record)
+    return records
+
+
+def _clean(records, columnar):
+    rejects = dict.fromkeys(load_data.VALIDATION_RANGES, 0)
+    gc.collect()
+    gc.disable()  # as timeit does; a million live dicts make collections dominate otherwise
+    start = time.perf_counter()
+    for offset in range(0, len(records), load_data.CLEAN_BATCH_ROWS):
+        batch = records[offset:offset + load_data.CLEAN_BATCH_ROWS]
+        load_data._clean_batch(batch, rejects, columnar=columnar)
+    seconds = time.perf_counter() - start
+    gc.enable()
+    digest = hashlib.sha256(json.dumps(records).encode("utf-8")).hexdigest()
+    return seconds, rejects, digest
+
+
+def main():
+    """Times both cleaning paths on the same synthetic records."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--records", type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+    if load_data.np is None:
+        sys.exit("NumPy is not installed; only the record-by-record cleaner is available.")
+
+    results = {}
+    for label, columnar in (("scalar", False), ("columnar", True)):
+        records = _synthetic_records(args.records)
+        results[label] = _clean(records, columnar)
+        del records
+        seconds = results[label][0]
+        print(f"{label:<9} {seconds:8.2f}s {args.records / seconds:>12,.0f} records/sec")
+
+    assert results["scalar"][1:] == results["columnar"][1:], "cleaning paths disagree"
+    print(f"Results match. Rejects: {results['columnar'][1]}")
+    print(f"Speedup: {results['scalar'][0] / results['columnar'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_dashboard_requests.py
+"""
+Load test: dashboard requests/sec with a connection per query versus the shared pool.
+
+Sends GET / to the Flask app from several client threads for a fixed time,
+first with the old execute_query (psycopg2.connect for each of the seven
+queries), then with the pooled one from db.py, and reports requests/sec
+and latency percentiles for each. Requests go through Flask's test client,
+so only the app and the database are measured, not an HTTP server.
+
+Needs DATABASE_URL pointing at a (preferably local) PostgreSQL server with
+the applicants table loaded.
+
+Usage (from module_5):
+    python -m benchmarks.bench_dashboard_requests [--seconds 10] [--clients 8]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import app  # noqa: E402  # pylint: disable=wrong-import-position
+import db  # noqa: E402  # pylint: disable=wrong-import-position
+
+FAILURE_MARKER = "Query Failed"  # what the dashboard shows in place of a failed answer
+
+
+def _execute_query_unpooled(query, params=None):
+    """The original app.execute_query: a new connection for every query."""
+    try:
+        with psycopg2.connect(os.environ.get('DATABASE_URL')) as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                return cur.fetchall()
+    except psycopg2.Error as e:
+        print(f"Database query error: {e}")
+    return []
+
+
+def _run_clients(seconds, clients, path="/"):
+    """
+    Requests `path` from `clients` threads for `seconds`.
+
+    The pages render "Query Failed" with a 200 when a query errors, so a
+    response only counts if it has neither an error status nor that text;
+    any failed response aborts the run rather than timing errors.
+
+    Returns:
+        tuple: (latencies in seconds, wall seconds, body of the last response)
+    """
+    latencies, failures, bodies, lock = [], [], [], threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        test_client = app.app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = test_client.get(path)
+            elapsed = time.perf_counter() - start
+            body = response.get_data(as_text=True)
+            with lock:
+                if response.status_code != 200 or FAILURE_MARKER in body:
+                    failures.append(response.status_code)
+                    return
+                latencies.append(elapsed)
+                bodies[:] = [body]
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if failures or not latencies:
+        sys.exit(f"GET {path}: {len(failures)} failed response(s) "
+                 f"(status {sorted(set(failures))}) after {len(latencies)} good ones; "
+                 "not reporting a rate.")
+    return latencies, time.perf_counter() - start, bodies[0]
+
+
+def _report(label, latencies, wall_seconds):
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{label:<10} {len(latencies) / wall_seconds:>8.1f} req/s   "
+          f"p50 {quantiles[49] * 1000:>7.1f} ms   p95 {quantiles[94] * 1000:>7.1f} ms")
+
+
+def main():
+    """Runs the load test with and without the pool."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--seconds", type=float, default=10.0)
+    arg_parser.add_argument("--clients", type=int, default=8)
+    args = arg_parser.parse_args()
+    if not os.environ.get("DATABASE_URL"):
+        sys.exit("DATABASE_URL is not set; point it at a local PostgreSQL server.")
+
+    app.query_cache.ttl_seconds = 0.0  # measure the connections, not the result cache
+    pooled_execute_query = app.execute_query
+    app.execute_query = _execute_query_unpooled
+    *unpooled, unpooled_page = _run_clients(args.seconds, args.clients)
+    _report("unpooled", *unpooled)
+
+    app.execute_query = pooled_execute_query
+    db.configure_pool(minconn=args.clients, maxconn=args.clients)
+    try:
+        _run_clients(1, args.clients)  # open the connections before timing
+        *pooled, pooled_page = _run_clients(args.seconds, args.clients)
+    finally:
+        db.close_pool()
+    if pooled_page != unpooled_page:
+        sys.exit("The pooled dashboard differs from the unpooled one; not reporting a rate.")
+    _report("pooled", *pooled)
+
+
+if __name__ == "__main__":
+    main()
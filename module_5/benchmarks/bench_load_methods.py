@@ -0,0 +1,156 @@
+# benchmarks/bench_load_methods.py
+"""
+Load benchmark: json_array_elements insert, COPY FROM STDIN and parallel COPY.
+
+Writes N synthetic applicant records to a JSON file, then loads them with each
+method of load_data.py in a fresh child process and reports rows/sec and the
+child's peak RSS (the parallel method's server-side work is not included in
+the RSS figure). Every load goes into a scratch schema that is dropped
+afterwards, so the real applicants table is never touched.
+
+Needs DATABASE_URL pointing at a (preferably local) PostgreSQL server.
+
+Usage (from module_5):
+    python -m benchmarks.bench_load_methods [--rows 100000 1000000]
+        [--workers 4] [--chunk-rows 50000]
+"""
+# Benchmarks drive load_data.py's (and app.py's) internal steps directly
+# pylint: disable=protected-access
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import load_data  # noqa: E402  # pylint: disable=wrong-import-position
+
+METHODS = load_data.LOAD_METHODS
+UNIVERSITIES = ["Johns Hopkins University", "MIT", "Stanford University",
+                "University of Michigan", "Georgia Institute of Technology"]
+PROGRAMS = ["Computer Science", "Statistics", "Electrical Engineering", "Physics"]
+STATUSES = ["Accepted", "Rejected", "Wait listed", "Interview"]
+STUDENT_TYPES = ["American", "International", "Other"]
+
+
+def _synthetic_applicant(rng, n):
+    def score(low, high, digits=0):
+        return "N/A" if rng.random() < 0.3 else str(round(rng.uniform(low, high), digits or None))
+    return {
+        "University": rng.choice(UNIVERSITIES), "Program Name": rng.choice(PROGRAMS),
+        "Degree": rng.choice(["Masters", "PhD"]), "Applicant Status": rng.choice(STATUSES),
+        "Decision Date": "12 Feb", "Date Added": f"2025-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+        "Semester Start": rng.choice(["Fall 2025", "Spring 2026", "Fall 2024"]),
+        "Student Type": rng.choice(STUDENT_TYPES), "GPA": score(2.5, 4.0, 2),
+        "GRE Total": score(290, 340), "GRE V": score(140, 170), "GRE Q": score(140, 170),
+        "GRE AW": score(3.0, 6.0, 1), "Comment": f"Synthetic comment {n}",
+        "URL": f"https://www.thegradcafe.com/result/{n}",
+    }
+
+
+def _write_dataset(path, row_count, seed=11):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for n in range(row_count):
+            f.write(("," if n else "") + json.dumps(_synthetic_applicant(rng, n)))
+        f.write("]")
+
+
+@contextlib.contextmanager
+def _scratch_schema():
+    """
+    Yields a connection to DATABASE_URL whose search_path is only a new schema.
+
+    Nothing else is on the path, so load_data.py's DROP TABLE applicants and
+    friends can never reach the real tables in public. Connections opened
+    inside the block (the parallel loader's workers) get the same path
+    through PGOPTIONS. The schema is dropped afterwards.
+    """
+    schema = f"bench_{uuid.uuid4().hex[:12]}"
+    previous_options = os.environ.get("PGOPTIONS")
+    os.environ["PGOPTIONS"] = f"-c search_path={schema}"
+    conn = psycopg2.connect(os.environ["DATABASE_URL"])
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {schema}")
+        conn.commit()
+        yield conn
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        conn.commit()
+        conn.close()
+        if previous_options is None:
+            del os.environ["PGOPTIONS"]
+        else:
+            os.environ["PGOPTIONS"] = previous_options
+
+
+def _load_once(method, json_path, parallel_options):
+    """Loads `json_path` into a scratch schema with one method (run in a child process)."""
+    load_data.JSON_FILE_PATH = json_path
+    with _scratch_schema() as conn, conn.cursor() as cur:
+        load_data._create_applicants_table(cur)
+        conn.commit()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            load_data._load_rows(cur, method, load_data.TABLE_NAME,
+                                 **(parallel_options if method == "parallel" else {}))
+            conn.commit()
+            seconds = time.perf_counter() - start
+        cur.execute("SELECT COUNT(*) FROM applicants")
+        rows = cur.fetchone()[0]
+    peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": seconds, "rows": rows, "peak_rss_kib": peak_rss_kib}))
+
+
+def _run_child(method, json_path, args):
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_load_methods", "--child", method, str(json_path),
+         "--workers", str(args.workers), "--chunk-rows", str(args.chunk_rows)],
+        cwd=Path(__file__).resolve().parent.parent, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Runs the benchmark for each requested dataset size and prints a table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    arg_parser.add_argument("--workers", type=int, default=load_data.PARALLEL_WORKERS)
+    arg_parser.add_argument("--chunk-rows", type=int, default=load_data.PARALLEL_CHUNK_ROWS)
+    arg_parser.add_argument("--child", nargs=2, metavar=("METHOD", "JSON_FILE"),
+                            help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+    if args.child:
+        _load_once(*args.child, {"workers": args.workers, "chunk_rows": args.chunk_rows})
+        return
+    if not os.environ.get("DATABASE_URL"):
+        sys.exit("DATABASE_URL is not set; point it at a local PostgreSQL server.")
+
+    print(f"{'rows':>9}  {'method':<8} {'seconds':>8} {'rows/sec':>10} {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for row_count in args.rows:
+            json_path = Path(temp_dir) / f"applicants_{row_count}.json"
+            _write_dataset(json_path, row_count)
+            for method in METHODS:
+                result = _run_child(method, json_path, args)
+                assert result["rows"] == row_count, result
+                print(f"{row_count:>9,}  {method:<8} {result['seconds']:>8.2f} "
+                      f"{row_count / result['seconds']:>10,.0f} "
+                      f"{result['peak_rss_kib'] / 1024:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_query_plans.py
+"""
+Query plans: EXPLAIN ANALYZE of the seven dashboard queries without and with indexes.
+
+Loads N synthetic applicants into a scratch schema, runs EXPLAIN ANALYZE on
+each of app.py's seven per-question queries, builds load_data.py's secondary
+indexes (composite B-trees and pg_trgm GIN indexes) and runs them again. The
+plans are printed for both runs, followed by a table of the best execution
+time of each query. The scratch schema is dropped afterwards.
+
+Needs DATABASE_URL pointing at a (preferably local) PostgreSQL server.
+
+Usage (from module_5):
+    python -m benchmarks.bench_query_plans [--rows 1000000] [--repeat 3]
+"""
+# Benchmarks drive load_data.py's (and app.py's) internal steps directly
+# pylint: disable=protected-access
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import app  # noqa: E402  # pylint: disable=wrong-import-position
+import load_data  # noqa: E402  # pylint: disable=wrong-import-position
+from benchmarks.bench_load_methods import _scratch_schema, _synthetic_applicant  # noqa: E402  # pylint: disable=wrong-import-position
+
+EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+
+
+def _dashboard_queries():
+    """Returns the (query, params) each of app.py's seven helpers executes."""
+    captured = []
+    original_execute_query = app.execute_query
+    app.execute_query = lambda query, params=None: captured.append((query, params)) or []
+    try:
+        for get_data, args in app._question_calls():
+            get_data(*args)
+    finally:
+        app.execute_query = original_execute_query
+    return captured
+
+
+def _load_rows(cur, row_count, seed=11):
+    rng = random.Random(seed)
+    applicants = (load_data._clean_applicant(_synthetic_applicant(rng, n))
+                  for n in range(row_count))
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_data._create_applicants_table(cur)
+        load_data._copy_data(cur, applicants)
+    cur.execute("ANALYZE applicants")
+
+
+def _explain(cur, queries, repeat):
+    """EXPLAIN ANALYZEs each query `repeat` times; returns its plan and best time in ms."""
+    results = []
+    for query, params in queries:
+        best_ms, plan = float("inf"), ""
+        for _ in range(repeat):
+            cur.execute(b"EXPLAIN (ANALYZE, BUFFERS) " + cur.mogrify(query, params))
+            lines = [row[0] for row in cur.fetchall()]
+            elapsed_ms = float(EXECUTION_TIME.search(lines[-1]).group(1))
+            if elapsed_ms < best_ms:
+                best_ms, plan = elapsed_ms, "\n".join(lines)
+        results.append((plan, best_ms))
+    return results
+
+
+def _print_plans(label, results):
+    print(f"=== {label} ===")
+    for number, (plan, _) in enumerate(results, start=1):
+        print(f"--- Query {number} ---")
+        print(plan)
+    print()
+
+
+def _parse_args(description):
+    """Parses --rows and --repeat; exits unless DATABASE_URL is set."""
+    arg_parser = argparse.ArgumentParser(description=description)
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+    if not os.environ.get("DATABASE_URL"):
+        sys.exit("DATABASE_URL is not set; point it at a local PostgreSQL server.")
+    return args
+
+
+def main():
+    """Runs the seven queries before and after indexing and prints plans and timings."""
+    args = _parse_args(__doc__.splitlines()[1])
+
+    queries = _dashboard_queries()
+    with _scratch_schema() as conn, conn.cursor() as cur:
+        print(f"Loading {args.rows:,} synthetic applicants...")
+        _load_rows(cur, args.rows)
+        conn.commit()
+        before = _explain(cur, queries, args.repeat)
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_data._create_indexes(cur, "applicants")
+        conn.commit()
+        after = _explain(cur, queries, args.repeat)
+
+    _print_plans("Without secondary indexes", before)
+    _print_plans("With secondary indexes", after)
+    print(f"{'query':>5}  {'no index ms':>12} {'indexed ms':>11} {'speedup':>8}")
+    for number, ((_, before_ms), (_, after_ms)) in enumerate(zip(before, after), start=1):
+        print(f"{number:>5}  {before_ms:>12.2f} {after_ms:>11.2f} "
+              f"{before_ms / after_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_schema_layouts.py
+"""
+Schema benchmark: table size and query time of the flat and normalized layouts.
+
+Writes N synthetic applicants to a JSON file and loads it into two scratch
+schemas, once as the flat 'applicants' table and once as load_data.py's
+normalized layout (dimension tables, a fact table and an 'applicants' view).
+It reports the on-disk size of each layout, then the best EXPLAIN ANALYZE
+execution time of app.py's seven queries and of a per-university grouping
+on each. Both schemas are dropped afterwards.
+
+Needs DATABASE_URL pointing at a (preferably local) PostgreSQL server.
+
+Usage (from module_5):
+    python -m benchmarks.bench_schema_layouts [--rows 1000000] [--repeat 3]
+"""
+# Benchmarks drive load_data.py's (and app.py's) internal steps directly
+# pylint: disable=protected-access
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+from psycopg2 import sql
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import load_data  # noqa: E402  # pylint: disable=wrong-import-position
+from benchmarks.bench_load_methods import _scratch_schema, _write_dataset  # noqa: E402  # pylint: disable=wrong-import-position
+from benchmarks.bench_query_plans import _dashboard_queries, _explain, _parse_args  # noqa: E402  # pylint: disable=wrong-import-position
+
+GROUPING_QUERY = sql.SQL("SELECT university, COUNT(*), AVG(gpa) FROM applicants"
+                         " GROUP BY university;")
+SIZE_QUERY = sql.SQL("SELECT COALESCE(SUM(pg_total_relation_size(c.oid)), 0)"
+                     " FROM pg_class AS c JOIN pg_namespace AS n ON n.oid = c.relnamespace"
+                     " WHERE n.nspname = current_schema() AND c.relkind = 'r';")
+
+
+def _load_layout(cur, layout):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if layout == "normalized":
+            load_data._load_normalized(cur, "copy")
+            load_data._create_normalized_indexes(cur)
+        else:
+            load_data._create_applicants_table(cur)
+            load_data._load_rows(cur, "copy", load_data.TABLE_NAME)
+            load_data._create_indexes(cur, load_data.TABLE_NAME)
+
+
+def _measure(layout, queries, repeat):
+    """Loads one layout into a scratch schema; returns its size in bytes and query times."""
+    with _scratch_schema() as conn, conn.cursor() as cur:
+        _load_layout(cur, layout)
+        conn.commit()
+        cur.execute(SIZE_QUERY)
+        size = cur.fetchone()[0]
+        timings = [best_ms for _, best_ms in _explain(cur, queries, repeat)]
+    return size, timings
+
+
+def main():
+    """Loads both layouts and prints their sizes and query timings side by side."""
+    args = _parse_args(__doc__.splitlines()[1])
+
+    queries = _dashboard_queries() + [(GROUPING_QUERY, None)]
+    labels = [f"query {n}" for n in range(1, 8)] + ["group by university"]
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        load_data.JSON_FILE_PATH = str(Path(temp_dir) / "applicant_data.json")
+        print(f"Writing {args.rows:,} synthetic applicants...")
+        _write_dataset(load_data.JSON_FILE_PATH, args.rows)
+        for layout in load_data.LAYOUTS:
+            print(f"Loading the {layout} layout...")
+            results[layout] = _measure(layout, queries, args.repeat)
+
+    (flat_size, flat_ms), (normalized_size, normalized_ms) = results["flat"], results["normalized"]
+    print(f"\n{'':<20} {'flat':>12} {'normalized':>12}")
+    print(f"{'size (MiB)':<20} {flat_size / 2**20:>12.1f} {normalized_size / 2**20:>12.1f}")
+    for label, flat_time, normalized_time in zip(labels, flat_ms, normalized_ms):
+        print(f"{label + ' (ms)':<20} {flat_time:>12.2f} {normalized_time:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
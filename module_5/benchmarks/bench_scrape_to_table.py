@@ -0,0 +1,119 @@
+# benchmarks/bench_scrape_to_table.py
+"""
+End-to-end benchmark: saved GradCafe pages to rows in the applicants table.
+
+Parses module_2's fixture survey pages (repeated to N pages) with the
+scraper's own parser and loads the entries into a scratch schema three ways:
+
+- reshape: scraper JSON file, a separate pass re-keying it into a second
+  file in the loader's format, then load_data.py on that file (the old way).
+- mapped file: scraper JSON Lines file loaded as is, with field_map.py
+  applied while the file streams in.
+- pipe: AdmissionEntry.to_loader_dict() straight into the cleaner and COPY,
+  no file at all.
+
+Each pipeline is timed from the raw HTML to the committed rows, and the
+parse time alone is printed for reference. The scratch schema is dropped
+afterwards.
+
+Needs DATABASE_URL pointing at a (preferably local) PostgreSQL server, and
+module_2's requirements (requests, beautifulsoup4).
+
+Usage (from module_5):
+    python -m benchmarks.bench_scrape_to_table [--pages 2000] [--repeat 3]
+"""
+# Benchmarks drive load_data.py's (and app.py's) internal steps directly
+# pylint: disable=protected-access
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+MODULE_2_DIR = Path(__file__).resolve().parent.parent.parent / "module_2"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(1, str(MODULE_2_DIR))
+# module_2's modules come first: pylint sees them as third party
+import scrape  # noqa: E402  # pylint: disable=wrong-import-position,import-error
+from clean import iter_clean_data  # noqa: E402  # pylint: disable=wrong-import-position,import-error
+from field_map import loader_record_from_dict  # noqa: E402  # pylint: disable=wrong-import-position,import-error
+from file_ops import iter_data, save_data  # noqa: E402  # pylint: disable=wrong-import-position,import-error
+import load_data  # noqa: E402  # pylint: disable=wrong-import-position
+from benchmarks.bench_load_methods import _scratch_schema  # noqa: E402  # pylint: disable=wrong-import-position
+
+FIXTURE_PAGES = ("survey_page_1.html", "survey_page_2.html")
+
+
+def _parse(pages, parser):
+    """Yields the AdmissionEntry records of every page, in order."""
+    for html in pages:
+        yield from scrape._parse_page_html(html, parser)
+
+
+def _reshape(pages, parser, temp_dir):
+    scraped_path, loader_path = temp_dir / "scraped.json", temp_dir / "applicant_data.json"
+    save_data(iter_clean_data(_parse(pages, parser)), str(scraped_path))
+    save_data(map(loader_record_from_dict, iter_data(str(scraped_path))), str(loader_path))
+    return load_data._iter_clean_applicants(loader_path)
+
+
+def _mapped_file(pages, parser, temp_dir):
+    scraped_path = temp_dir / "scraped.jsonl"
+    save_data(iter_clean_data(_parse(pages, parser)), str(scraped_path))
+    return load_data._iter_clean_applicants(scraped_path)
+
+
+def _pipe(pages, parser, _):
+    return load_data._iter_cleaned(entry.to_loader_dict() for entry in _parse(pages, parser))
+
+
+PIPELINES = (("reshape", _reshape), ("mapped file", _mapped_file), ("pipe", _pipe))
+
+
+def _run(conn, pipeline, pages, parser):
+    """Runs one pipeline into a fresh table; returns (seconds, rows)."""
+    with tempfile.TemporaryDirectory() as temp_dir, conn.cursor() as cur, \
+            contextlib.redirect_stdout(io.StringIO()):
+        load_data._create_applicants_table(cur)
+        conn.commit()
+        start = time.perf_counter()
+        rows = load_data._copy_data(cur, pipeline(pages, parser, Path(temp_dir)))
+        conn.commit()
+        return time.perf_counter() - start, rows
+
+
+def main():
+    """Times the three pipelines and prints seconds and rows/sec for each."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--pages", type=int, default=2000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--parser", default=scrape.DEFAULT_PARSER,
+                            choices=scrape.PARSER_BACKENDS)
+    args = arg_parser.parse_args()
+    if not os.environ.get("DATABASE_URL"):
+        sys.exit("DATABASE_URL is not set; point it at a local PostgreSQL server.")
+
+    fixtures = [(MODULE_2_DIR / "tests" / "fixtures" / name).read_bytes() for name in FIXTURE_PAGES]
+    pages = list(itertools.islice(itertools.cycle(fixtures), args.pages))
+    parser = scrape._resolve_parser(args.parser)
+    start = time.perf_counter()
+    entry_count = sum(1 for _ in _parse(pages, parser))
+    parse_seconds = time.perf_counter() - start
+    print(f"{args.pages:,} pages, {entry_count:,} entries; parsing alone ({parser}): "
+          f"{parse_seconds:.2f}s")
+
+    with _scratch_schema() as conn:
+        print(f"\n{'pipeline':<12} {'best s':>8} {'rows/sec':>12}")
+        for label, pipeline in PIPELINES:
+            best_seconds, rows = min(_run(conn, pipeline, pages, parser)
+                                     for _ in range(args.repeat))
+            assert rows == entry_count, f"{label} loaded {rows} of {entry_count} rows"
+            print(f"{label:<12} {best_seconds:>8.2f} {rows / best_seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_snapshot_metrics.py
+"""
+Snapshot benchmark: dashboard metrics from the in-memory snapshot versus SQL.
+
+Builds a snapshot.ApplicantSnapshot of N synthetic applicants and reports
+its build time, its size and the median time of dashboard_row for the
+default filters and for a few others (first call per ILIKE pattern
+included). With DATABASE_URL set, the same rows are also loaded into a
+scratch schema, and the round-trip time of metrics.DASHBOARD_QUERY and
+SUMMARY_QUERY is printed next to them. The scratch schema is dropped
+afterwards.
+
+Usage (from module_5):
+    python -m benchmarks.bench_snapshot_metrics [--rows 1000000] [--repeat 200]
+"""
+# Benchmarks drive load_data.py's (and app.py's) internal steps directly
+# pylint: disable=protected-access
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import load_data  # noqa: E402  # pylint: disable=wrong-import-position
+import metrics  # noqa: E402  # pylint: disable=wrong-import-position
+from benchmarks.bench_load_methods import _scratch_schema, _synthetic_applicant  # noqa: E402  # pylint: disable=wrong-import-position
+from snapshot import ApplicantSnapshot  # noqa: E402  # pylint: disable=wrong-import-position
+
+FILTERS = (
+    {},
+    {"semester": "Spring 2026", "student_type": "International", "status": "Rejected"},
+    {"university": "%MIT%", "program": "%Physics%", "degree": "PhD"},
+)
+
+
+def _median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _sql_timings(applicants, repeat):
+    """Loads the rows into a scratch schema; returns median ms per query and filters."""
+    timings = {}
+    with _scratch_schema() as conn, conn.cursor() as cur:
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_data._create_applicants_table(cur)
+            load_data._copy_data(cur, applicants)
+            load_data._refresh_summary(cur)
+        cur.execute("ANALYZE")
+        conn.commit()
+        for label, query in (("DASHBOARD_QUERY", metrics.DASHBOARD_QUERY),
+                             ("SUMMARY_QUERY", metrics.SUMMARY_QUERY)):
+            for n, filters in enumerate(FILTERS):
+                params = {**metrics.DEFAULT_FILTERS, **filters}
+                timings[label, n] = _median_ms(
+                    lambda query=query, params=params: (cur.execute(query, params),
+                                                        cur.fetchall()),
+                    max(1, repeat // 20))
+    return timings
+
+
+def main():
+    """Builds the snapshot, times its answers and, with a database, the SQL ones."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    arg_parser.add_argument("--repeat", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(11)
+    applicants = [load_data._clean_applicant(_synthetic_applicant(rng, n))
+                  for n in range(args.rows)]
+    start = time.perf_counter()
+    built = ApplicantSnapshot.from_records(applicants)
+    build_seconds = time.perf_counter() - start
+    size = sum(codes.nbytes for codes, _ in built.columns.values())
+    size += sum(array.nbytes for part in ("sums", "counts")
+                for array in built._groups[part].values())
+    size += sum(bitmap.nbytes for bitmaps in built.bitmaps.values() for bitmap in bitmaps.values())
+    print(f"{args.rows:,} applicants: snapshot built in {build_seconds:.2f}s, "
+          f"{size / 2**20:.1f} MiB of arrays")
+
+    sql_timings = {}
+    if os.environ.get("DATABASE_URL"):
+        print("Loading the same rows into PostgreSQL...")
+        sql_timings = _sql_timings(applicants, args.repeat)
+    else:
+        print("DATABASE_URL is not set; timing the snapshot only.")
+
+    print(f"\n{'filters':<8} {'first ms':>9} {'snapshot ms':>12} {'DASHBOARD ms':>13} "
+          f"{'SUMMARY ms':>11}")
+    for n, filters in enumerate(FILTERS):
+        start = time.perf_counter()
+        built.dashboard_row(**filters)
+        first_ms = (time.perf_counter() - start) * 1000
+        snapshot_ms = _median_ms(lambda filters=filters: built.dashboard_row(**filters),
+                                 args.repeat)
+        dashboard_ms = sql_timings.get(("DASHBOARD_QUERY", n), float("nan"))
+        summary_ms = sql_timings.get(("SUMMARY_QUERY", n), float("nan"))
+        print(f"{n:<8} {first_ms:>9.3f} {snapshot_ms:>12.3f} {dashboard_ms:>13.2f} "
+              f"{summary_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# module_5/db.py
+"""
+Process-wide PostgreSQL connection pool shared by app.py and query_data.py.
+
+Connections are opened once and reused across queries and request threads
+instead of paying a TCP connect and authentication handshake per query.
+The pool is created lazily on first use (and again after a fork), connections
+that sat idle for a while are checked with `SELECT 1` before being handed
+out, and a connection that breaks mid-query is discarded and the query
+retried once on a fresh one.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool
+
+POOL_MIN_CONNECTIONS = int(os.environ.get('DB_POOL_MIN', 1))
+POOL_MAX_CONNECTIONS = int(os.environ.get('DB_POOL_MAX', 10))
+POOL_TIMEOUT_SECONDS = 10.0  # how long a caller waits for a free connection
+HEALTH_CHECK_IDLE_SECONDS = 30.0  # connections idle longer than this are pinged first
+
+_pool = None  # pylint: disable=invalid-name
+_pool_pid = None  # pylint: disable=invalid-name
+_pool_sizes = (POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS)
+_pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+_pool_lock = threading.Lock()
+_last_used = {}  # id(connection) -> time it was returned to the pool
+
+
+def configure_pool(minconn=POOL_MIN_CONNECTIONS, maxconn=POOL_MAX_CONNECTIONS):
+    """
+    Sets the pool size and closes any open pool so the next query uses it.
+
+    Args:
+        minconn (int, optional): Connections opened up front and kept open.
+        maxconn (int, optional): Upper bound on open connections; callers
+                                 beyond it wait up to POOL_TIMEOUT_SECONDS.
+    """
+    global _pool_sizes, _pool_slots  # pylint: disable=global-statement
+    if not 0 <= minconn <= maxconn or maxconn < 1:
+        raise ValueError(f"Invalid pool size: minconn={minconn}, maxconn={maxconn}")
+    close_pool()
+    with _pool_lock:
+        _pool_sizes = (minconn, maxconn)
+        _pool_slots = threading.BoundedSemaphore(maxconn)
+
+
+def get_pool():
+    """Returns this process's pool, creating it from DATABASE_URL if needed."""
+    global _pool, _pool_pid  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            db_url = os.environ.get('DATABASE_URL')
+            if not db_url:
+                raise psycopg2.OperationalError("DATABASE_URL secret not found.")
+            _pool = pool.ThreadedConnectionPool(*_pool_sizes, dsn=db_url)
+            _pool_pid = os.getpid()
+            _last_used.clear()
+        return _pool
+
+
+def close_pool():
+    """Closes every pooled connection of this process."""
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+        _last_used.clear()
+
+
+def _is_healthy(conn):
+    if conn.closed:
+        return False
+    if time.monotonic() - _last_used.get(id(conn), 0.0) < HEALTH_CHECK_IDLE_SECONDS:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1;")
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _release(connection_pool, conn, discard=False):
+    if discard or conn.closed:
+        _last_used.pop(id(conn), None)
+        connection_pool.putconn(conn, close=True)
+    else:
+        _last_used[id(conn)] = time.monotonic()
+        connection_pool.putconn(conn)
+
+
+def _checkout(connection_pool):
+    """
+    Takes a healthy autocommit connection from the pool.
+
+    Autocommit is set before the health check so its `SELECT 1` does not
+    leave a transaction open; a connection that fails either step is closed
+    rather than returned to the pool.
+    """
+    while True:
+        conn = connection_pool.getconn()
+        try:
+            if not conn.closed:
+                conn.autocommit = True  # read-only queries; saves the BEGIN round trip
+            if _is_healthy(conn):
+                return conn
+        except BaseException:
+            _release(connection_pool, conn, discard=True)
+            raise
+        _release(connection_pool, conn, discard=True)
+
+
+@contextmanager
+def connection():
+    """
+    Checks a healthy autocommit connection out of the pool for a `with` block.
+
+    Waits up to POOL_TIMEOUT_SECONDS when all connections are in use, and
+    raises psycopg2.pool.PoolError if none frees up in time.
+    """
+    slots = _pool_slots
+    if not slots.acquire(timeout=POOL_TIMEOUT_SECONDS):
+        raise pool.PoolError("Timed out waiting for a database connection.")
+    try:
+        connection_pool = get_pool()
+        conn = _checkout(connection_pool)
+        try:
+            yield conn
+        finally:
+            _release(connection_pool, conn)
+    finally:
+        slots.release()
+
+
+def execute_query(query, params=None):
+    """
+    Executes a query on a pooled connection and returns all rows.
+
+    If the connection turns out to be broken (server restart, dropped
+    socket), it is thrown away and the query retried once on a new one.
+
+    Args:
+        query (psycopg2.sql.SQL): The SQL query object to be executed.
+        params (tuple, optional): Parameters substituted into the query.
+
+    Returns:
+        list: A list of tuples containing the query results.
+
+    Raises:
+        psycopg2.Error: If the query fails for any other reason.
+    """
+    for attempt in range(2):
+        with connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(query, params)
+                    return cur.fetchall()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if not conn.closed or attempt:
+                    raise
+    raise AssertionError("unreachable")
@@ -1,72 +1,404 @@
 # module_5/load_data.py
+# pylint: disable=too-many-lines
 """
 Module 5 Data Loading Script
 
 Description:
 This script connects to a PostgreSQL database using credentials from environment
-variables. It first drops any existing 'applicants' table, then creates a new
-one with a defined schema. Finally, it loads data from a local JSON file,
-cleans and validates the data in Python, and inserts the sanitized records
-into the database.
+variables. It loads data from a local JSON file, cleans and validates the data
+in Python, and writes the sanitized records to the 'applicants' table in one of
+three modes:
+
+- replace: drop and recreate the table, then load everything (the original
+  behaviour; readers see an empty table until the load commits).
+- upsert: keep the table and insert new or update changed rows, matched on a
+  unique key over `url`.
+- swap: load into 'applicants_staging' and rename it over 'applicants' in the
+  same transaction, so readers switch from the old rows to the new ones at once.
+
+After the rows are in, the filter columns are indexed (B-tree composites, and
+pg_trgm GIN indexes for the ILIKE searches) and the table is analyzed. Every
+mode finishes by rebuilding the 'applicant_summary' rollup the dashboard
+reads (see metrics.py); `--verify-summary` also checks its answers against the
+raw table and rolls the load back if they differ.
+
+`--layout normalized` (replace mode) stores university, program, degree, term,
+status and student type once each in dimension tables, and the records as a
+fact table of their keys, the decision date as loaded plus a real DATE for
+it, and SMALLINT GRE scores. A view named 'applicants' joins them back into
+the flat columns and values.
 
 Prerequisites:
 - A `DATABASE_URL` secret configured in the environment.
 - Required Python packages: `psycopg2-binary`.
-- `applicant_data.json` file present in the same directory.
+- module_2 next to this module: files are read with module_2/json_stream.py.
+- `applicant_data.json` file present in the same directory. It may hold the
+  loader's records or module_2's scraper output as written (JSON array or
+  JSON Lines); the latter is mapped with module_2/field_map.py while loading.
 
 Usage:
-From the shell, run: `python load_data.py`
+From the shell, run:
+`python load_data.py [--mode {replace,upsert,swap}] [--method {copy,insert}]
+[--layout {flat,normalized}] [--verify-summary]`
 """
+import argparse
+import datetime
+import importlib.util
+import io
+import itertools
 import os
 import json
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import psycopg2
+from psycopg2 import sql
 
-JSON_FILE_PATH = 'applicant_data.json'
+import metrics
+
+try:
+    import numpy as np
+except ImportError:  # the record-by-record cleaner is used instead
+    np = None
 
-def _create_applicants_table(cur):
-    """Drops and recreates the 'applicants' table."""
-    cur.execute("DROP TABLE IF EXISTS applicants;")
-    print("Dropped existing 'applicants' table.")
+JSON_FILE_PATH = 'applicant_data.json'
+# module_2's modules shared with the scraper: the mapping from its output keys
+# to the ones read here, and the streaming reader for JSON arrays and JSON Lines
+MODULE_2_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'module_2')
+FIELD_MAP_PATH = os.path.join(MODULE_2_DIR, 'field_map.py')
+JSON_STREAM_PATH = os.path.join(MODULE_2_DIR, 'json_stream.py')
+# Key only the scraper's records have (field_map.SCRAPER_MARKER_KEY), to spot
+# scraper output even when field_map.py is not there to map it
+SCRAPER_MARKER_KEY = 'Program Field'
+TABLE_NAME = 'applicants'
+STAGING_TABLE_NAME = 'applicants_staging'
+INCOMING_TABLE_NAME = 'applicants_incoming'
+PARALLEL_TABLE_NAME = 'applicants_parallel_load'  # suffixed with the loading process's pid
+FACT_TABLE_NAME = 'applicant_facts'
+DECISION_DATES_TABLE_NAME = 'decision_dates'
+LOAD_MODES = ('replace', 'upsert', 'swap')
+LAYOUTS = ('flat', 'normalized')
+LOAD_METHODS = ('copy', 'insert', 'parallel')
+PARALLEL_WORKERS = 4
+PARALLEL_CHUNK_ROWS = 50000
+COPY_CHUNK_ROWS = 5000
+CLEAN_BATCH_ROWS = 5000
+VALIDATION_RANGES = {
+    'GPA': (0.0, 4.0), 'GRE Total': (260, 340), 'GRE V': (130, 170),
+    'GRE Q': (130, 170), 'GRE AW': (0.0, 6.0)
+}
+# (column, JSON key, whether 'N/A' becomes NULL) in table order, minus `id`.
+APPLICANT_COLUMNS = (
+    ('university', 'University', False), ('program_name', 'Program Name', False),
+    ('degree', 'Degree', False), ('applicant_status', 'Applicant Status', False),
+    ('decision_date', 'Decision Date', False), ('date_added', 'Date Added', True),
+    ('semester_start', 'Semester Start', False), ('student_type', 'Student Type', False),
+    ('gpa', 'GPA', True), ('gre_total', 'GRE Total', True), ('gre_v', 'GRE V', True),
+    ('gre_q', 'GRE Q', True), ('gre_aw', 'GRE AW', True), ('comment', 'Comment', False),
+    ('url', 'URL', False)
+)
+# (name suffix, index method, columns, operator class) of the indexes built
+# after each load; the trigram ones serve the ILIKE '%...%' filters.
+SECONDARY_INDEXES = (
+    ('semester_status_idx', 'btree', ('semester_start', 'applicant_status'), None),
+    ('type_semester_idx', 'btree', ('student_type', 'semester_start'), None),
+    ('university_trgm_idx', 'gin', ('university',), 'gin_trgm_ops'),
+    ('program_trgm_idx', 'gin', ('program_name',), 'gin_trgm_ops'),
+)
+# (dimension table, key type, fact column, 'applicants' column) of the
+# normalized layout; each text value is stored once and referenced by key.
+DIMENSIONS = (
+    ('universities', 'INTEGER', 'university_id', 'university'),
+    ('programs', 'INTEGER', 'program_id', 'program_name'),
+    ('degrees', 'SMALLINT', 'degree_id', 'degree'),
+    ('terms', 'SMALLINT', 'term_id', 'semester_start'),
+    ('applicant_statuses', 'SMALLINT', 'status_id', 'applicant_status'),
+    ('student_types', 'SMALLINT', 'student_type_id', 'student_type'),
+)
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
 
-    create_table_query = """
-    CREATE TABLE applicants (
+_APPLICANTS_SCHEMA = """(
         id SERIAL PRIMARY KEY, university TEXT, program_name TEXT,
         degree TEXT, applicant_status TEXT, decision_date TEXT,
         date_added DATE, semester_start TEXT, student_type TEXT,
         gpa FLOAT, gre_total INTEGER, gre_v INTEGER,
         gre_q INTEGER, gre_aw FLOAT, comment TEXT, url TEXT
-    );"""
-    cur.execute(create_table_query)
-    print("Table 'applicants' created.")
+    )"""
 
-def _load_and_clean_json_data(filepath):
-    """Loads JSON data from a file and cleans it."""
+def _import_module_2(path):
+    """Imports one of module_2's modules from `path`, or returns None if it is not there."""
+    if not os.path.exists(path):
+        return None
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+field_map = _import_module_2(FIELD_MAP_PATH)
+json_stream = _import_module_2(JSON_STREAM_PATH)
+
+def _drop_table_or_view(cur, name):
+    """Drops `name` if it exists, be it a table or the normalized layout's view."""
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s);", (name,))
+    row = cur.fetchone()
+    if row is not None:
+        kind = "VIEW" if row[0] == 'v' else "TABLE"
+        cur.execute(sql.SQL("DROP " + kind + " {};").format(sql.Identifier(name)))
+
+def _create_applicants_table(cur, table=TABLE_NAME):
+    """Drops and recreates the 'applicants' table (or a table of the same shape)."""
+    _drop_table_or_view(cur, table)
+    print(f"Dropped existing '{table}' table.")
+
+    create_table_query = sql.SQL("CREATE TABLE {} " + _APPLICANTS_SCHEMA + ";")
+    cur.execute(create_table_query.format(sql.Identifier(table)))
+    print(f"Table '{table}' created.")
+
+def _ensure_applicants_table(cur):
+    """Creates the 'applicants' table if needed and makes sure it has its url key."""
+    create_table_query = sql.SQL("CREATE TABLE IF NOT EXISTS {} " + _APPLICANTS_SCHEMA + ";")
+    cur.execute(create_table_query.format(sql.Identifier(TABLE_NAME)))
+    _add_url_key(cur, TABLE_NAME)
+
+def _add_url_key(cur, table):
+    """
+    Adds the unique key on `url` that upserts match rows on.
+
+    Rows without a link ('N/A' or NULL) cannot be matched, so the index is
+    partial and leaves them out. If the table already holds duplicate links,
+    only the row with the lowest id (the first one loaded) of each is kept.
+    """
+    index = sql.Identifier(f"{table}_url_key")
+    cur.execute(sql.SQL("SELECT to_regclass(%s);"), (f"{table}_url_key",))
+    if cur.fetchone()[0] is not None:
+        return
+    cur.execute(sql.SQL("DELETE FROM {0} AS a USING {0} AS b"
+                        " WHERE a.url = b.url AND a.url <> 'N/A' AND a.id > b.id;")
+                .format(sql.Identifier(table)))
+    if cur.rowcount:
+        print(f"Removed {cur.rowcount} duplicate rows from '{table}'.")
+    cur.execute(sql.SQL("CREATE UNIQUE INDEX {} ON {} (url) WHERE url <> 'N/A';")
+                .format(index, sql.Identifier(table)))
+
+def _ensure_pg_trgm(cur):
+    """
+    Makes sure the pg_trgm extension is installed.
+
+    Returns:
+        str: The schema holding its operator classes, or None if the
+             extension is unavailable (e.g. not permitted for this role),
+             in which case the transaction carries on without it.
+    """
+    cur.execute("SAVEPOINT ensure_pg_trgm;")
+    try:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    except psycopg2.Error as e:
+        cur.execute("ROLLBACK TO SAVEPOINT ensure_pg_trgm;")
+        print(f"pg_trgm is unavailable, skipping trigram indexes: {str(e).strip()}")
+        return None
+    cur.execute("RELEASE SAVEPOINT ensure_pg_trgm;")
+    cur.execute("SELECT extnamespace::regnamespace::text FROM pg_extension"
+                " WHERE extname = 'pg_trgm';")
+    return cur.fetchone()[0]
+
+def _create_indexes(cur, table):
+    """
+    Builds SECONDARY_INDEXES on a loaded table and refreshes its statistics.
+
+    Building them once after the bulk load is much cheaper than keeping them
+    up to date row by row during it. Indexes that already exist (upsert
+    mode) are left alone.
+    """
+    trgm_schema = _ensure_pg_trgm(cur)
+    for suffix, method, columns, opclass in SECONDARY_INDEXES:
+        if opclass and trgm_schema is None:
+            continue
+        column_list = sql.SQL(", ").join(
+            sql.SQL("{} {}.{}").format(sql.Identifier(column), sql.Identifier(trgm_schema),
+                                       sql.Identifier(opclass))
+            if opclass else sql.Identifier(column)
+            for column in columns)
+        cur.execute(sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} USING {} ({});").format(
+            sql.Identifier(f"{table}_{suffix}"), sql.Identifier(table), sql.SQL(method),
+            column_list))
+    cur.execute(sql.SQL("ANALYZE {};").format(sql.Identifier(table)))
+    print(f"Indexed and analyzed '{table}'.")
+
+def _clean_applicant(applicant, rejects=None):
+    """
+    Normalizes the scores of one record, replacing invalid ones with 'N/A'.
+
+    Args:
+        applicant (dict): The record, modified in place.
+        rejects (dict, optional): Per-field reject counts to add to.
+
+    Returns:
+        dict: The same record.
+    """
+    for key, (min_val, max_val) in VALIDATION_RANGES.items():
+        if key in applicant and applicant[key] not in [None, 'N/A', '']:
+            if isinstance(applicant[key], str):
+                applicant[key] = applicant[key].replace(' ', '.')
+            try:
+                value = float(applicant[key])
+                if not min_val <= value <= max_val:
+                    applicant[key] = 'N/A'
+            except (ValueError, TypeError):
+                applicant[key] = 'N/A'
+            if rejects is not None and applicant[key] == 'N/A':
+                rejects[key] += 1
+    return applicant
+
+def _to_float_or_nan(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float('nan')
+
+def _as_text(values):
+    """Returns an object column as a NumPy string array ('' for nested lists)."""
+    try:
+        return values.astype(str)
+    except ValueError:
+        return np.array([value if isinstance(value, str) else '' for value in values], dtype=str)
+
+def _clean_scores_columnar(applicants, rejects):
+    """
+    Column-at-a-time equivalent of `_clean_applicant` over a list of records.
+
+    Each score is pulled into a NumPy column once. Presence, space
+    normalization and the range check are array operations, and values that
+    are plain decimals ('3.85', '320') are converted in a single astype call;
+    only the rest ('1e2', 'abc', numbers from the JSON) go through float()
+    one by one. Records are only written back to where the value changes.
+
+    Args:
+        applicants (list): Records, modified in place.
+        rejects (dict): Per-field reject counts to add to.
+    """
+    for key, (min_val, max_val) in VALIDATION_RANGES.items():
+        column = np.fromiter(map(dict.get, applicants, itertools.repeat(key)), dtype=object,
+                             count=len(applicants))
+        present = np.flatnonzero(np.not_equal(column, None) & np.not_equal(column, 'N/A')
+                                 & np.not_equal(column, ''))
+        if not present.size:
+            continue
+        values = column[present]
+        text = _as_text(values)
+        spaced = np.flatnonzero(np.char.find(text, ' ') >= 0)
+        if spaced.size:
+            text[spaced] = np.char.replace(text[spaced], ' ', '.')
+            for i in spaced.tolist():
+                if isinstance(values[i], str):
+                    values[i] = applicants[present[i]][key] = values[i].replace(' ', '.')
+
+        numbers = np.empty(values.size, dtype=np.float64)
+        plain = np.char.isdecimal(np.char.replace(text, '.', '', 1))
+        try:
+            numbers[plain] = values[plain].astype(np.float64)  # float() on each, in C
+        except (ValueError, TypeError):  # e.g. a trailing NUL, which NumPy strings drop
+            plain[:] = False
+        numbers[~plain] = [_to_float_or_nan(value) for value in values[~plain]]
+
+        rejected = present[~((numbers >= min_val) & (numbers <= max_val))]  # NaN fails both
+        for i in rejected.tolist():
+            applicants[i][key] = 'N/A'
+        rejects[key] += rejected.size
+
+def _clean_batch(applicants, rejects, columnar=None):
+    """
+    Cleans a list of records in place, column-wise when NumPy is available.
+
+    Args:
+        applicants (list): Records to clean.
+        rejects (dict): Per-field reject counts to add to.
+        columnar (bool, optional): Force the NumPy (True) or record-by-record
+                                   (False) cleaner. Defaults to NumPy if installed.
+    """
+    if columnar is None:
+        columnar = np is not None
+    if columnar and applicants:
+        _clean_scores_columnar(applicants, rejects)
+    else:
+        for applicant in applicants:
+            _clean_applicant(applicant, rejects)
+
+def _print_reject_report(rejects):
+    report = ", ".join(f"{key}: {count}" for key, count in rejects.items())
+    print(f"Values rejected as invalid or out of range -> {report}")
+
+def _as_loader_records(records):
+    """
+    Passes loader-format records through and maps the scraper's ones on the fly.
+
+    module_2's output (JSON array or JSON Lines) uses its own key names, so
+    when the first record is in that format every record goes through
+    field_map.loader_record_from_dict as it streams past; no re-shaped copy
+    of the file is written.
+
+    Args:
+        records (iterator): Records as decoded from the file.
+
+    Returns:
+        iterator: Records with the keys in APPLICANT_COLUMNS.
+
+    Raises:
+        ValueError: If the records are scraper output but field_map.py could
+                    not be imported to map them.
+    """
+    first = next(records, None)
+    if first is None:
+        return iter(())
+    records = itertools.chain((first,), records)
+    if field_map is None:
+        if isinstance(first, dict) and SCRAPER_MARKER_KEY in first:
+            raise ValueError(f"The file holds scraper output, but {FIELD_MAP_PATH} was not "
+                             "found to map it to the loader's fields.")
+        return records
+    if not field_map.is_scraper_record(first):
+        return records
+    print("Mapping scraper output to the loader's fields...")
+    return map(field_map.loader_record_from_dict, records)
+
+def _iter_cleaned(applicants, batch_rows=CLEAN_BATCH_ROWS):
+    """Cleans records a batch at a time as they stream past, then reports the rejects."""
+    rejects = dict.fromkeys(VALIDATION_RANGES, 0)
+    while batch := list(itertools.islice(applicants, batch_rows)):
+        _clean_batch(batch, rejects)
+        yield from batch
+    _print_reject_report(rejects)
+
+def _iter_clean_applicants(filepath, batch_rows=CLEAN_BATCH_ROWS):
+    """
+    Yields the cleaned records of a JSON or JSON Lines file, a batch at a time.
+
+    The file is parsed incrementally with module_2's json_stream.py, so only
+    one batch of records is held in memory however large the file is. A
+    JSON Lines file may still be being written by the scraper: a half-written
+    last line is left for the next load. Scraper output is mapped to the
+    loader's fields in the same pass.
+
+    Raises:
+        FileNotFoundError: If `filepath` or module_2's json_stream.py is missing.
+    """
+    if json_stream is None:
+        raise FileNotFoundError(f"{JSON_STREAM_PATH} is needed to read {filepath}.")
     print(f"Loading and cleaning data from {filepath}...")
     with open(filepath, 'r', encoding='utf-8') as f:
-        applicants_list = json.load(f)
-
-    validation_ranges = {
-        'GPA': (0.0, 4.0), 'GRE Total': (260, 340), 'GRE V': (130, 170),
-        'GRE Q': (130, 170), 'GRE AW': (0.0, 6.0)
-    }
-    for applicant in applicants_list:
-        for key, (min_val, max_val) in validation_ranges.items():
-            if key in applicant and applicant[key] not in [None, 'N/A', '']:
-                if isinstance(applicant[key], str):
-                    applicant[key] = applicant[key].replace(' ', '.')
-                try:
-                    value = float(applicant[key])
-                    if not min_val <= value <= max_val:
-                        applicant[key] = 'N/A'
-                except (ValueError, TypeError):
-                    applicant[key] = 'N/A'
+        records = json_stream.iter_json_records(f, partial=True)
+        yield from _iter_cleaned(_as_loader_records(records), batch_rows)
+
+def _load_and_clean_json_data(filepath):
+    """Loads JSON data from a file and cleans it, as one JSON string."""
+    applicants_list = list(_iter_clean_applicants(filepath))
     print(f"Cleaning complete. Found {len(applicants_list)} records.")
     return json.dumps(applicants_list)
 
-def _insert_data(cur, json_data_string):
-    """Inserts the cleaned JSON data into the applicants table."""
-    insert_query = """
-    INSERT INTO applicants (
+def _insert_data(cur, json_data_string, table=TABLE_NAME):
+    """Inserts cleaned records, given as a JSON array string; returns the row count."""
+    insert_query = sql.SQL("""
+    INSERT INTO {} (
         university, program_name, degree, applicant_status, decision_date,
         date_added, semester_start, student_type, gpa, gre_total, gre_v,
         gre_q, gre_aw, comment, url
@@ -81,38 +413,639 @@ def _insert_data(cur, json_data_string):
         (NULLIF(d->>'GRE Q', 'N/A'))::integer,
         (NULLIF(d->>'GRE AW', 'N/A'))::float, d->>'Comment', d->>'URL'
     FROM json_array_elements(%s) AS d;
-    """
+    """).format(sql.Identifier(table))
     cur.execute(insert_query, (json_data_string,))
-    print(f"Executing insert. {cur.rowcount} records were processed.")
+    return cur.rowcount
+
+def _insert_in_chunks(cur, applicants, table=TABLE_NAME, chunk_rows=COPY_CHUNK_ROWS):
+    """Inserts records with `_insert_data`, one JSON parameter per `chunk_rows` records."""
+    applicants = iter(applicants)
+    rows = 0
+    while chunk := list(itertools.islice(applicants, chunk_rows)):
+        rows += _insert_data(cur, json.dumps(chunk), table=table)
+    print(f"Executing insert. {rows} records were processed.")
+
+def _copy_value(value, null_if_missing):
+    """Formats one value for COPY's text format, where \\N stands for NULL."""
+    if value is None or (null_if_missing and value == 'N/A'):
+        return '\\N'
+    return str(value).translate(_COPY_ESCAPES)
+
+def _to_copy_line(applicant):
+    """
+    Formats one cleaned record as a tab-separated COPY line.
+
+    Mirrors the casts in `_insert_data`: a missing key becomes NULL, and 'N/A'
+    becomes NULL for the date and numeric columns only.
+    """
+    values = (_copy_value(applicant.get(key), null_if_missing)
+              for _, key, null_if_missing in APPLICANT_COLUMNS)
+    return '\t'.join(values) + '\n'
+
+class ApplicantCopyStream(io.TextIOBase):
+    """
+    File-like reader that feeds cleaned records to `cursor.copy_expert`.
+
+    Records are pulled from the iterable and formatted `chunk_rows` at a time,
+    so only one chunk of COPY text is held in memory however large the
+    dataset is.
+
+    Args:
+        applicants (iterable): Cleaned applicant records (dicts).
+        chunk_rows (int, optional): Records formatted per chunk.
+        first_id (int, optional): If given, each line starts with an id
+                                  column numbered from here.
+    """
+
+    def __init__(self, applicants, chunk_rows=COPY_CHUNK_ROWS, first_id=None):
+        super().__init__()
+        self._applicants = iter(applicants)
+        self._chunk_rows = chunk_rows
+        self.first_id = first_id
+        self._buffer = ''
+        self._offset = 0
+        self.rows_read = 0
+
+    def _next_chunk(self):
+        lines = []
+        for applicant in self._applicants:
+            lines.append(_to_copy_line(applicant))
+            if len(lines) == self._chunk_rows:
+                break
+        if self.first_id is not None:
+            first_id = self.first_id + self.rows_read
+            lines = [f"{first_id + n}\t{line}" for n, line in enumerate(lines)]
+        self.rows_read += len(lines)
+        return ''.join(lines)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        """Returns up to `size` characters of COPY text, or '' once exhausted."""
+        if self._offset >= len(self._buffer):
+            self._buffer, self._offset = self._next_chunk(), 0
+        end = len(self._buffer) if size is None or size < 0 else self._offset + size
+        data = self._buffer[self._offset:end]
+        self._offset += len(data)
+        return data
+
+def _copy_data(cur, applicants, chunk_rows=COPY_CHUNK_ROWS, table=TABLE_NAME):
+    """
+    Bulk loads cleaned records into the applicants table with COPY FROM STDIN.
+
+    Args:
+        cur (psycopg2.extensions.cursor): Cursor of the open transaction.
+        applicants (iterable): Cleaned applicant records, e.g. a generator.
+        chunk_rows (int, optional): Records formatted and sent per chunk.
+        table (str, optional): Table to load into. Defaults to 'applicants'.
+
+    Returns:
+        int: The number of records loaded.
+    """
+    rows = _copy_rows(cur, ApplicantCopyStream(applicants, chunk_rows), table)
+    print(f"Executing COPY. {rows} records were processed.")
+    return rows
+
+def _copy_rows(cur, stream, table):
+    """Runs COPY FROM STDIN for an ApplicantCopyStream and returns the rows sent."""
+    columns = [column for column, _, _ in APPLICANT_COLUMNS]
+    if stream.first_id is not None:
+        columns.insert(0, 'id')
+    copy_query = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        sql.Identifier(table), sql.SQL(', ').join(map(sql.Identifier, columns)))
+    cur.copy_expert(copy_query, stream)
+    return stream.rows_read
+
+def _create_parallel_table(conn, parallel_table):
+    """(Re)creates the unlogged table that the parallel workers COPY into, and commits."""
+    parallel_schema = _APPLICANTS_SCHEMA.replace("id SERIAL PRIMARY KEY", "id BIGINT")
+    with conn.cursor() as cur:
+        cur.execute(sql.SQL("DROP TABLE IF EXISTS {};").format(sql.Identifier(parallel_table)))
+        cur.execute(sql.SQL("CREATE UNLOGGED TABLE {} " + parallel_schema + ";")
+                    .format(sql.Identifier(parallel_table)))
+    conn.commit()
 
-def main():
-    """Main function to run the entire data loading process."""
+def _parallel_table_name():
+    """Name of this process's unlogged table, so concurrent loads do not share one."""
+    return f"{PARALLEL_TABLE_NAME}_{os.getpid()}"
+
+def _drop_parallel_table(conn, parallel_table):
+    """
+    Rolls back `conn` and drops the unlogged table left by a failed run.
+
+    Reports rather than raises any error, so the original failure is the
+    one that surfaces.
+    """
+    try:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("SET lock_timeout = '5s';")
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {};").format(sql.Identifier(parallel_table)))
+        conn.commit()
+    except psycopg2.Error as e:
+        print(f"Could not drop '{parallel_table}', drop it by hand: {e}")
+
+def _load_chunk(idle_connections, chunk_index, chunk, first_id, parallel_table):
+    """
+    COPYs one chunk into the unlogged table on a free connection and commits.
+
+    Returns:
+        tuple: (chunk_index, rows, seconds) for the timing report.
+    """
+    conn = idle_connections.get()
+    try:
+        start = time.perf_counter()
+        with conn.cursor() as cur:
+            rows = _copy_rows(cur, ApplicantCopyStream(chunk, first_id=first_id),
+                              parallel_table)
+        conn.commit()
+        return chunk_index, rows, time.perf_counter() - start
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+    finally:
+        idle_connections.put(conn)
+
+def _report_chunk(future):
+    chunk_index, rows, seconds = future.result()
+    print(f"  chunk {chunk_index}: {rows} rows in {seconds:.2f}s "
+          f"({rows / seconds if seconds else 0:,.0f} rows/sec)")
+    return rows
+
+def _parallel_load(cur, table, workers=PARALLEL_WORKERS, chunk_rows=PARALLEL_CHUNK_ROWS):
+    """
+    Loads the cleaned JSON file into `table` over several connections at once.
+
+    Records are cut into chunks of `chunk_rows` that `workers` connections
+    COPY concurrently into an unlogged table (no WAL, no indexes), each
+    committing its own chunk. The rows are then moved into `table` in file
+    order with one INSERT ... SELECT on `cur`, so they become visible with
+    the rest of the load transaction and any indexes on `table` are built
+    in a single pass. At most two chunks per worker are held in memory.
+
+    The unlogged table is named after this process, so concurrent loads do
+    not share one. It is dropped here if staging or the move fails, and
+    otherwise by the move itself, inside the load transaction: a later step
+    that fails rolls that DROP back, so main() drops the table again once
+    the transaction is over.
+
+    Args:
+        cur (psycopg2.extensions.cursor): Cursor of the load transaction.
+        table (str): Table to load into.
+        workers (int, optional): Number of concurrent connections.
+        chunk_rows (int, optional): Records per chunk.
+    """
+    connections = [psycopg2.connect(os.environ.get('DATABASE_URL')) for _ in range(workers)]
+    idle_connections = queue.Queue()
+    for conn in connections:
+        idle_connections.put(conn)
+    parallel_table = _parallel_table_name()
+    print(f"Loading in chunks of {chunk_rows} rows over {workers} connections...")
+    try:
+        _create_parallel_table(connections[0], parallel_table)
+        start = time.perf_counter()
+        rows = _stage_chunks(idle_connections, parallel_table, workers, chunk_rows)
+        print(f"Staged {rows} records in {time.perf_counter() - start:.2f}s.")
+        _move_parallel_rows(cur, table, parallel_table)
+    except BaseException:
+        _drop_parallel_table(connections[0], parallel_table)
+        raise
+    finally:
+        for conn in connections:
+            conn.close()
+
+def _stage_chunks(idle_connections, parallel_table, workers, chunk_rows):
+    """COPYs the cleaned JSON file into the unlogged table chunk by chunk; returns the rows."""
+    rows, pending = 0, set()
+    applicants = _iter_clean_applicants(JSON_FILE_PATH)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk_index in itertools.count():
+            chunk = list(itertools.islice(applicants, chunk_rows))
+            if not chunk:
+                break
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                rows += sum(_report_chunk(future) for future in done)
+            pending.add(executor.submit(_load_chunk, idle_connections, chunk_index, chunk,
+                                        chunk_index * chunk_rows, parallel_table))
+        rows += sum(_report_chunk(future) for future in pending)
+    return rows
+
+def _move_parallel_rows(cur, table, parallel_table):
+    """
+    Moves the staged rows into `table` in file order and drops the unlogged table.
+
+    If the move fails, rolling back its savepoint releases the lock on the
+    unlogged table, so that _drop_parallel_table can drop it elsewhere.
+    """
+    start = time.perf_counter()
+    columns = sql.SQL(', ').join(sql.Identifier(column) for column, _, _ in APPLICANT_COLUMNS)
+    cur.execute("SAVEPOINT parallel_move;")
+    try:
+        cur.execute(sql.SQL("INSERT INTO {} ({columns}) SELECT {columns} FROM {} ORDER BY id;")
+                    .format(sql.Identifier(table), sql.Identifier(parallel_table),
+                            columns=columns))
+        rows = cur.rowcount
+        cur.execute(sql.SQL("DROP TABLE {};").format(sql.Identifier(parallel_table)))
+    except psycopg2.Error:
+        cur.execute("ROLLBACK TO SAVEPOINT parallel_move;")
+        raise
+    cur.execute("RELEASE SAVEPOINT parallel_move;")
+    print(f"Moved {rows} records into '{table}' in {time.perf_counter() - start:.2f}s.")
+
+def _load_rows(cur, method, table, **parallel_options):
+    """Loads the cleaned JSON file into `table` with the chosen method."""
+    if method == 'copy':
+        _copy_data(cur, _iter_clean_applicants(JSON_FILE_PATH), table=table)
+    elif method == 'parallel':
+        _parallel_load(cur, table, **parallel_options)
+    else:
+        _insert_in_chunks(cur, _iter_clean_applicants(JSON_FILE_PATH), table=table)
+
+def _upsert_incoming(cur):
+    """
+    Merges the incoming rows into 'applicants' on their url.
+
+    New links are inserted and rows whose other columns differ are updated;
+    identical rows are left alone so that they are not rewritten. When a
+    link appears more than once in the incoming data, its first row wins.
+
+    Returns:
+        tuple: (inserted, updated, unchanged, skipped) row counts, where
+               skipped rows had no link to match on.
+    """
+    columns = [column for column, _, _ in APPLICANT_COLUMNS]
+    compared = [column for column in columns if column != 'url']
+    upsert_query = sql.SQL("""
+    WITH upserted AS (
+        INSERT INTO {table} ({columns})
+        SELECT DISTINCT ON (url) {columns} FROM {incoming}
+        WHERE url IS NOT NULL AND url <> 'N/A'
+        ORDER BY url, id
+        ON CONFLICT (url) WHERE url <> 'N/A' DO UPDATE SET {updates}
+        WHERE ({current}) IS DISTINCT FROM ({excluded})
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted),
+        (SELECT COUNT(DISTINCT url) FROM {incoming} WHERE url <> 'N/A'),
+        (SELECT COUNT(*) FROM {incoming} WHERE url IS NULL OR url = 'N/A')
+    FROM upserted;
+    """).format(
+        table=sql.Identifier(TABLE_NAME), incoming=sql.Identifier(INCOMING_TABLE_NAME),
+        columns=sql.SQL(', ').join(map(sql.Identifier, columns)),
+        updates=sql.SQL(', ').join(sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(column))
+                                   for column in compared),
+        current=sql.SQL(', ').join(sql.SQL("{}.{}").format(sql.Identifier(TABLE_NAME),
+                                                           sql.Identifier(column))
+                                   for column in compared),
+        excluded=sql.SQL(', ').join(sql.SQL("EXCLUDED.{}").format(sql.Identifier(column))
+                                    for column in compared))
+    cur.execute(upsert_query)
+    inserted, updated, matchable, skipped = cur.fetchone()
+    return inserted, updated, matchable - inserted - updated, skipped
+
+def _stage_incoming(cur, method, **parallel_options):
+    """Loads the JSON file into a temporary table shaped like 'applicants'."""
+    incoming = sql.Identifier('pg_temp', INCOMING_TABLE_NAME)
+    cur.execute(sql.SQL("DROP TABLE IF EXISTS {};").format(incoming))
+    create_incoming_query = sql.SQL("CREATE TEMP TABLE {} " + _APPLICANTS_SCHEMA
+                                    + " ON COMMIT DROP;")
+    cur.execute(create_incoming_query.format(incoming))
+    _load_rows(cur, method, INCOMING_TABLE_NAME, **parallel_options)
+
+def _upsert_data(cur, method, **parallel_options):
+    """Stages the JSON file in a temporary table and upserts it into 'applicants'."""
+    _ensure_applicants_table(cur)
+    _stage_incoming(cur, method, **parallel_options)
+    inserted, updated, unchanged, skipped = _upsert_incoming(cur)
+    print(f"Upsert complete. {inserted} inserted, {updated} updated, {unchanged} unchanged, "
+          f"{skipped} skipped without a URL.")
+
+def _swap_in_staging_table(cur):
+    """
+    Replaces 'applicants' with the loaded staging table by renaming it.
+
+    Runs inside the load transaction, so readers keep seeing the old rows
+    until the commit and the new ones right after it, never an empty table.
+    The staging table's index and sequence names are renamed to match, so
+    the next swap can create a fresh staging table under the same names.
+    """
+    index_renames = tuple(
+        ("ALTER INDEX IF EXISTS {} RENAME TO {};",
+         (f"{STAGING_TABLE_NAME}_{suffix}", f"{TABLE_NAME}_{suffix}"))
+        for suffix, *_ in SECONDARY_INDEXES)
+    _drop_table_or_view(cur, TABLE_NAME)
+    renames = (
+        ("ALTER TABLE {} RENAME TO {};", (STAGING_TABLE_NAME, TABLE_NAME)),
+        ("ALTER INDEX {} RENAME TO {};", (f"{STAGING_TABLE_NAME}_pkey", f"{TABLE_NAME}_pkey")),
+        ("ALTER INDEX {} RENAME TO {};",
+         (f"{STAGING_TABLE_NAME}_url_key", f"{TABLE_NAME}_url_key")),
+        ("ALTER SEQUENCE {} RENAME TO {};",
+         (f"{STAGING_TABLE_NAME}_id_seq", f"{TABLE_NAME}_id_seq")),
+    ) + index_renames
+    for statement, names in renames:
+        cur.execute(sql.SQL(statement).format(*map(sql.Identifier, names)))
+    print(f"Swapped '{STAGING_TABLE_NAME}' in as '{TABLE_NAME}'.")
+
+def _parse_decision_date(text, date_added):
+    """
+    Turns a decision date like '12 Feb' into a date.
+
+    GradCafe leaves out the year, so it is taken from the date the entry was
+    added, going back a year if that would put the decision after it.
+
+    Returns:
+        datetime.date: The date, or None if `text` is not a day and month
+                       or there is no `date_added` to take the year from.
+    """
+    if date_added is None:
+        return None
+    try:
+        decided_on = datetime.datetime.strptime(f"{text} {date_added.year}", "%d %b %Y").date()
+        if decided_on > date_added:
+            decided_on = decided_on.replace(year=date_added.year - 1)
+    except ValueError:  # not a date, or 29 Feb of a non-leap year
+        return None
+    return decided_on
+
+def _resolve_decision_dates(cur):
+    """
+    Builds a temporary (decision_date, date_added) -> DATE lookup table.
+
+    Only the distinct pairs in the staged rows are parsed, in Python, and
+    sent back with one COPY, so the facts can be filled in with a join.
+    """
+    cur.execute(sql.SQL("SELECT DISTINCT decision_date, date_added FROM {}"
+                        " WHERE decision_date <> 'N/A' AND date_added IS NOT NULL;")
+                .format(sql.Identifier(INCOMING_TABLE_NAME)))
+    lines = []
+    for text, date_added in cur.fetchall():
+        decided_on = _parse_decision_date(text, date_added)
+        if decided_on is not None:
+            lines.append(f"{_copy_value(text, False)}\t{date_added}\t{decided_on}\n")
+    lookup = sql.Identifier('pg_temp', DECISION_DATES_TABLE_NAME)
+    cur.execute(sql.SQL("DROP TABLE IF EXISTS {};").format(lookup))
+    cur.execute(sql.SQL("CREATE TEMP TABLE {} (decision_date TEXT, date_added DATE,"
+                        " decided_on DATE) ON COMMIT DROP;").format(lookup))
+    cur.copy_expert(sql.SQL("COPY {} FROM STDIN;").format(lookup).as_string(cur),
+                    io.StringIO("".join(lines)))
+
+def _create_dimension_tables(cur):
+    """Recreates the dimension tables from the distinct values of the staged rows."""
+    for dimension, key_type, _, column in DIMENSIONS:
+        cur.execute(sql.SQL(
+            "CREATE TABLE {} (id " + key_type + " GENERATED BY DEFAULT AS IDENTITY"
+            " PRIMARY KEY, name TEXT NOT NULL UNIQUE);").format(sql.Identifier(dimension)))
+        cur.execute(sql.SQL("INSERT INTO {} (name) SELECT DISTINCT {} FROM {}"
+                            " WHERE {} IS NOT NULL ORDER BY 1;")
+                    .format(sql.Identifier(dimension), sql.Identifier(column),
+                            sql.Identifier(INCOMING_TABLE_NAME), sql.Identifier(column)))
+        print(f"Table '{dimension}' holds {cur.rowcount} values.")
+
+def _create_fact_table(cur):
+    """Creates the fact table and fills it with one join per dimension."""
+    dimension_columns = sql.SQL(", ").join(
+        sql.SQL("{} " + key_type + " REFERENCES {}").format(
+            sql.Identifier(fact_column), sql.Identifier(dimension))
+        for dimension, key_type, fact_column, _ in DIMENSIONS)
+    cur.execute(sql.SQL("""
+    CREATE TABLE {} (
+        id INTEGER PRIMARY KEY, {}, decision_date TEXT, decided_on DATE, date_added DATE,
+        gpa FLOAT, gre_total SMALLINT, gre_v SMALLINT, gre_q SMALLINT,
+        gre_aw FLOAT, comment TEXT, url TEXT
+    );""").format(sql.Identifier(FACT_TABLE_NAME), dimension_columns))
+
+    fact_columns = [sql.Identifier(fact_column) for _, _, fact_column, _ in DIMENSIONS]
+    keys = [sql.SQL("{}.id").format(sql.Identifier(dimension)) for dimension, *_ in DIMENSIONS]
+    joins = sql.SQL(" ").join(
+        sql.SQL("LEFT JOIN {0} ON {0}.name = i.{1}").format(
+            sql.Identifier(dimension), sql.Identifier(column))
+        for dimension, _, _, column in DIMENSIONS)
+    cur.execute(sql.SQL("""
+    INSERT INTO {facts} (id, {fact_columns}, decision_date, decided_on, date_added,
+                         gpa, gre_total, gre_v, gre_q, gre_aw, comment, url)
+    SELECT i.id, {keys}, i.decision_date, d.decided_on, i.date_added,
+           i.gpa, i.gre_total, i.gre_v, i.gre_q, i.gre_aw, i.comment, i.url
+    FROM {incoming} AS i {joins}
+    LEFT JOIN {decision_dates} AS d
+        ON d.decision_date = i.decision_date AND d.date_added = i.date_added
+    ORDER BY i.id;""").format(
+        facts=sql.Identifier(FACT_TABLE_NAME), fact_columns=sql.SQL(", ").join(fact_columns),
+        keys=sql.SQL(", ").join(keys), incoming=sql.Identifier(INCOMING_TABLE_NAME),
+        joins=joins, decision_dates=sql.Identifier(DECISION_DATES_TABLE_NAME)))
+    print(f"Table '{FACT_TABLE_NAME}' holds {cur.rowcount} records.")
+
+def _create_applicants_view(cur):
+    """
+    Creates the 'applicants' view over the normalized tables.
+
+    It has the flat table's columns, types and values, so existing queries
+    keep working; decision_date is the text as loaded, and the view also
+    exposes the parsed decided_on DATE (NULL if unknown).
+    """
+    dimension_names = {column: dimension for dimension, _, _, column in DIMENSIONS}
+    columns = []
+    for column, _, _ in APPLICANT_COLUMNS:
+        if column in dimension_names:
+            columns.append(sql.SQL("{}.name AS {}").format(
+                sql.Identifier(dimension_names[column]), sql.Identifier(column)))
+        elif column in ('gre_total', 'gre_v', 'gre_q'):
+            columns.append(sql.SQL("f.{0}::INTEGER AS {0}").format(sql.Identifier(column)))
+        else:
+            columns.append(sql.SQL("f.{}").format(sql.Identifier(column)))
+    joins = sql.SQL(" ").join(
+        sql.SQL("LEFT JOIN {0} ON {0}.id = f.{1}").format(
+            sql.Identifier(dimension), sql.Identifier(fact_column))
+        for dimension, _, fact_column, _ in DIMENSIONS)
+    cur.execute(sql.SQL("CREATE VIEW {} AS SELECT f.id, {}, f.decided_on FROM {} AS f {};")
+                .format(sql.Identifier(TABLE_NAME), sql.SQL(", ").join(columns),
+                        sql.Identifier(FACT_TABLE_NAME), joins))
+    print(f"View '{TABLE_NAME}' created over '{FACT_TABLE_NAME}'.")
+
+def _load_normalized(cur, method, **parallel_options):
+    """
+    Replaces 'applicants' with the normalized layout: dimension tables, a
+    fact table of keys, codes and typed values, and a compatibility view.
+
+    The rows are staged once and every surrogate key is resolved with a
+    set-based join rather than a lookup per record.
+    """
+    _stage_incoming(cur, method, **parallel_options)
+    _drop_table_or_view(cur, TABLE_NAME)
+    tables = [FACT_TABLE_NAME] + [dimension for dimension, *_ in DIMENSIONS]
+    cur.execute(sql.SQL("DROP TABLE IF EXISTS {};").format(
+        sql.SQL(", ").join(map(sql.Identifier, tables))))
+    _create_dimension_tables(cur)
+    _resolve_decision_dates(cur)
+    _create_fact_table(cur)
+    _create_applicants_view(cur)
+
+def _create_normalized_indexes(cur):
+    """Indexes the fact table's filter keys and analyzes the normalized tables."""
+    for suffix, columns in (('term_status_idx', ('term_id', 'status_id')),
+                            ('type_term_idx', ('student_type_id', 'term_id'))):
+        cur.execute(sql.SQL("CREATE INDEX {} ON {} ({});").format(
+            sql.Identifier(f"{FACT_TABLE_NAME}_{suffix}"), sql.Identifier(FACT_TABLE_NAME),
+            sql.SQL(", ").join(map(sql.Identifier, columns))))
+    for dimension, *_ in DIMENSIONS:
+        cur.execute(sql.SQL("ANALYZE {};").format(sql.Identifier(dimension)))
+    cur.execute(sql.SQL("ANALYZE {};").format(sql.Identifier(FACT_TABLE_NAME)))
+    print(f"Indexed and analyzed '{FACT_TABLE_NAME}'.")
+
+def _refresh_summary(cur):
+    """
+    Rebuilds the summary table from the freshly loaded applicants.
+
+    A plain table rather than a materialized view, so swap mode can still
+    drop the old applicants table.
+    """
+    cur.execute(sql.SQL("DROP TABLE IF EXISTS {};").format(sql.Identifier(metrics.SUMMARY_TABLE)))
+    cur.execute(metrics.CREATE_SUMMARY_QUERY)
+    print(f"Rebuilt '{metrics.SUMMARY_TABLE}' with {cur.rowcount} groups.")
+
+def _verify_summary(cur, **filters):
+    """
+    Checks that the summary table answers like the raw applicants table.
+
+    Raises:
+        ValueError: If any dashboard answer differs between the two.
+    """
+    params = {**metrics.DEFAULT_FILTERS, **filters}
+    cur.execute(metrics.SUMMARY_QUERY, params)
+    summary_row = cur.fetchone()
+    cur.execute(metrics.DASHBOARD_QUERY, params)
+    mismatches = metrics.summary_mismatches(summary_row, cur.fetchone())
+    if mismatches:
+        raise ValueError(f"Summary table disagrees with '{TABLE_NAME}' "
+                         f"(column, summary, raw): {mismatches}")
+    print(f"Summary table matches '{TABLE_NAME}'.")
+
+def _bump_data_version(cur):
+    """
+    Increments the data version that readers key their cached results on.
+
+    Runs inside the load transaction, so the new version becomes visible
+    together with the rows it describes.
+
+    Returns:
+        int: The new version.
+    """
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS data_version (
+        singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+        version BIGINT NOT NULL, loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );""")
+    cur.execute("""
+    INSERT INTO data_version (version) VALUES (1)
+    ON CONFLICT (singleton) DO UPDATE
+        SET version = data_version.version + 1, loaded_at = now()
+    RETURNING version;""")
+    version = cur.fetchone()[0]
+    print(f"Data version is now {version}.")
+    return version
+
+def _load_applicants(cur, method, mode, layout, parallel_options):
+    """Loads the JSON file into 'applicants' in the given mode and layout."""
+    if layout == 'normalized':
+        _load_normalized(cur, method, **parallel_options)
+        _create_normalized_indexes(cur)
+    elif mode == 'upsert':
+        _upsert_data(cur, method, **parallel_options)
+        _create_indexes(cur, TABLE_NAME)
+    elif mode == 'swap':
+        _create_applicants_table(cur, STAGING_TABLE_NAME)
+        _load_rows(cur, method, STAGING_TABLE_NAME, **parallel_options)
+        _add_url_key(cur, STAGING_TABLE_NAME)
+        _create_indexes(cur, STAGING_TABLE_NAME)
+        _swap_in_staging_table(cur)
+    else:
+        _create_applicants_table(cur)
+        _load_rows(cur, method, TABLE_NAME, **parallel_options)
+        _create_indexes(cur, TABLE_NAME)
+
+def main(method='copy', mode='replace', layout='flat', verify_summary=False,
+         **parallel_options):
+    """
+    Main function to run the entire data loading process.
+
+    Args:
+        method (str, optional): 'copy' streams records with COPY FROM STDIN;
+                                'insert' sends them as JSON parameters, a chunk each;
+                                'parallel' COPYs chunks over several connections.
+        mode (str, optional): 'replace', 'upsert' or 'swap' (see the module
+                              docstring).
+        layout (str, optional): 'flat' keeps 'applicants' a single table;
+                                'normalized' stores dimension tables and a fact
+                                table behind an 'applicants' view (replace
+                                mode only).
+        verify_summary (bool, optional): Compare the rebuilt summary table with
+                                         the raw table before committing.
+        **parallel_options: `workers` (connections) and `chunk_rows` (records
+                            per chunk) for the 'parallel' method.
+    """
     print("--- Starting data loading script ---")
     db_url = os.environ.get('DATABASE_URL')
     if not db_url:
         raise ValueError("DATABASE_URL secret not found. Please set it up.")
+    if layout == 'normalized' and mode != 'replace':
+        raise ValueError("The normalized layout is only loaded in replace mode.")
 
-    conn = None
+    if method != 'parallel':
+        parallel_options = {}
+    conn, committed = None, False
     try:
         conn = psycopg2.connect(db_url)
         print("Database connection established.")
         with conn.cursor() as cur:
-            _create_applicants_table(cur)
-            cleaned_json_data = _load_and_clean_json_data(JSON_FILE_PATH)
-            _insert_data(cur, cleaned_json_data)
+            _load_applicants(cur, method, mode, layout, parallel_options)
+            _refresh_summary(cur)
+            if verify_summary:
+                _verify_summary(cur)
+            _bump_data_version(cur)
         conn.commit()
+        committed = True
         print("Transaction committed.")
     except psycopg2.Error as e:
         print(f"A database error occurred: {e}")
         if conn:
             conn.rollback()
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+    except (FileNotFoundError, ValueError) as e:  # includes json.JSONDecodeError
         print(f"A file or data error occurred: {e}")
     finally:
         if conn:
+            if method == 'parallel' and not committed:
+                _drop_parallel_table(conn, _parallel_table_name())
             conn.close()
             print("Database connection closed.")
         print("--- Script finished ---")
 
+def _parse_args():
+    arg_parser = argparse.ArgumentParser(description="Load applicant data into PostgreSQL.")
+    arg_parser.add_argument("--method", choices=LOAD_METHODS, default="copy",
+                            help="copy: stream rows with COPY FROM STDIN (default); "
+                                 "insert: send rows as one JSON parameter per chunk; "
+                                 "parallel: COPY chunks over several connections")
+    arg_parser.add_argument("--workers", type=int, default=PARALLEL_WORKERS,
+                            help=f"connections for --method parallel (default: {PARALLEL_WORKERS})")
+    arg_parser.add_argument("--chunk-rows", type=int, default=PARALLEL_CHUNK_ROWS,
+                            help="records per chunk for --method parallel "
+                                 f"(default: {PARALLEL_CHUNK_ROWS})")
+    arg_parser.add_argument("--mode", choices=LOAD_MODES, default="replace",
+                            help="replace: drop and reload the table (default); "
+                                 "upsert: insert new and update changed rows by url; "
+                                 "swap: load a staging table and rename it into place")
+    arg_parser.add_argument("--layout", choices=LAYOUTS, default="flat",
+                            help="flat: one 'applicants' table (default); "
+                                 "normalized: dimension and fact tables behind an "
+                                 "'applicants' view (with --mode replace)")
+    arg_parser.add_argument("--verify-summary", action="store_true",
+                            help="check the rebuilt summary table against the raw table "
+                                 "and roll back if they differ")
+    return arg_parser.parse_args()
+
 if __name__ == "__main__":
-    main()
+    args = _parse_args()
+    main(method=args.method, mode=args.mode, workers=args.workers, chunk_rows=args.chunk_rows,
+         verify_summary=args.verify_summary, layout=args.layout)
@@ -0,0 +1,150 @@
+# module_5/metrics.py
+"""
+The seven dashboard metrics, computed in a single scan of 'applicants'.
+
+Each question used to be its own query, i.e. its own pass over the table
+and its own round trip. DASHBOARD_QUERY computes all of them in one
+aggregation with FILTER clauses, and `split_results` cuts its single row
+back into the per-question result lists the individual queries returned,
+so the existing formatters in app.py and query_data.py work on either.
+
+Every question only filters on the six columns in SUMMARY_DIMENSIONS, so
+load_data.py also rebuilds SUMMARY_TABLE, one row per combination of them
+with counts and score sums. SUMMARY_QUERY answers the same questions from
+that rollup, reading one row per group instead of one per applicant.
+"""
+import math
+
+from psycopg2 import sql
+
+DASHBOARD_QUERY = sql.SQL("""
+SELECT
+    COUNT(*) FILTER (WHERE semester_start = %(semester)s),
+    100.0 * COUNT(*) FILTER (WHERE student_type = 'International') / NULLIF(COUNT(*), 0),
+    AVG(gpa), AVG(gre_total), AVG(gre_v), AVG(gre_q), AVG(gre_aw),
+    AVG(gpa) FILTER (WHERE student_type = %(student_type)s AND semester_start = %(semester)s),
+    100.0 * COUNT(*) FILTER (WHERE applicant_status = 'Accepted'
+                             AND semester_start = %(semester)s)
+        / NULLIF(COUNT(*) FILTER (WHERE semester_start = %(semester)s), 0),
+    AVG(gpa) FILTER (WHERE semester_start = %(semester)s AND applicant_status = %(status)s),
+    COUNT(*) FILTER (WHERE university ILIKE %(university)s
+                     AND program_name ILIKE %(program)s AND degree = %(degree)s)
+FROM applicants;
+""")
+
+SUMMARY_TABLE = 'applicant_summary'
+SUMMARY_DIMENSIONS = ('semester_start', 'student_type', 'applicant_status',
+                      'university', 'program_name', 'degree')
+SUMMARY_SCORES = ('gpa', 'gre_total', 'gre_v', 'gre_q', 'gre_aw')
+
+# Rebuilt by load_data.py at the end of every load, in the load's transaction.
+CREATE_SUMMARY_QUERY = sql.SQL("""
+CREATE TABLE {table} AS
+SELECT {dimensions}, COUNT(*) AS applicants, {score_columns}
+FROM applicants
+GROUP BY {dimensions};
+""").format(
+    table=sql.Identifier(SUMMARY_TABLE),
+    dimensions=sql.SQL(", ").join(map(sql.Identifier, SUMMARY_DIMENSIONS)),
+    score_columns=sql.SQL(", ").join(
+        sql.SQL("SUM({0}) AS {1}, COUNT({0}) AS {2}").format(
+            sql.Identifier(score), sql.Identifier(f"{score}_sum"),
+            sql.Identifier(f"{score}_count"))
+        for score in SUMMARY_SCORES))
+
+# Same columns as DASHBOARD_QUERY. Sums of integer scores are numeric, so the
+# averages come out exactly as AVG() over the raw rows computes them. SUM() of
+# no groups is NULL where COUNT(*) is 0, hence the COALESCE on counted columns.
+SUMMARY_QUERY = sql.SQL("""
+SELECT
+    COALESCE(SUM(applicants) FILTER (WHERE semester_start = %(semester)s), 0)::bigint,
+    100.0 * COALESCE(SUM(applicants) FILTER (WHERE student_type = 'International'), 0)
+        / NULLIF(SUM(applicants), 0),
+    SUM(gpa_sum) / NULLIF(SUM(gpa_count), 0),
+    SUM(gre_total_sum) / NULLIF(SUM(gre_total_count), 0),
+    SUM(gre_v_sum) / NULLIF(SUM(gre_v_count), 0),
+    SUM(gre_q_sum) / NULLIF(SUM(gre_q_count), 0),
+    SUM(gre_aw_sum) / NULLIF(SUM(gre_aw_count), 0),
+    SUM(gpa_sum) FILTER (WHERE student_type = %(student_type)s AND semester_start = %(semester)s)
+        / NULLIF(SUM(gpa_count) FILTER (WHERE student_type = %(student_type)s
+                                        AND semester_start = %(semester)s), 0),
+    100.0 * COALESCE(SUM(applicants) FILTER (WHERE applicant_status = 'Accepted'
+                                             AND semester_start = %(semester)s), 0)
+        / NULLIF(SUM(applicants) FILTER (WHERE semester_start = %(semester)s), 0),
+    SUM(gpa_sum) FILTER (WHERE semester_start = %(semester)s AND applicant_status = %(status)s)
+        / NULLIF(SUM(gpa_count) FILTER (WHERE semester_start = %(semester)s
+                                        AND applicant_status = %(status)s), 0),
+    COALESCE(SUM(applicants) FILTER (WHERE university ILIKE %(university)s
+                                     AND program_name ILIKE %(program)s
+                                     AND degree = %(degree)s), 0)::bigint
+FROM {};
+""").format(sql.Identifier(SUMMARY_TABLE))
+
+# Filters the dashboard shows; any of them can be overridden per call.
+DEFAULT_FILTERS = {
+    'semester': "Fall 2025", 'student_type': "American", 'status': "Accepted",
+    'university': "%Johns Hopkins%", 'program': "%Computer Science%", 'degree': "Masters",
+}
+
+# Columns of DASHBOARD_QUERY's row that answer questions 1 to 7.
+METRIC_COLUMNS = ((0,), (1,), (2, 3, 4, 5, 6), (7,), (8,), (9,), (10,))
+# A name for each column of that row, as app.py's JSON API reports them.
+METRIC_NAMES = ('semester_applicants', 'international_percent', 'average_gpa',
+                'average_gre_total', 'average_gre_v', 'average_gre_q', 'average_gre_aw',
+                'student_type_average_gpa', 'semester_acceptance_percent',
+                'status_average_gpa', 'program_applicants')
+
+
+def split_results(row):
+    """
+    Cuts the dashboard row into one result list per question.
+
+    Args:
+        row (tuple): The row returned by DASHBOARD_QUERY, or None if it failed.
+
+    Returns:
+        list: Seven lists shaped like `execute_query` results of the
+              individual queries, e.g. [(count,)]; all empty if `row` is None.
+    """
+    if row is None:
+        return [[] for _ in METRIC_COLUMNS]
+    return [[tuple(row[i] for i in columns)] for columns in METRIC_COLUMNS]
+
+
+def fetch_dashboard_results(execute_query, **filters):
+    """
+    Answers the seven questions from the summary table, or from the raw
+    table if the summary cannot be read (e.g. before the first load made it).
+
+    Args:
+        execute_query (callable): The caller's query function, e.g.
+                                  app.execute_query (empty or None on error).
+        **filters: Overrides for DEFAULT_FILTERS.
+
+    Returns:
+        list: See `split_results`.
+    """
+    params = {**DEFAULT_FILTERS, **filters}
+    result = execute_query(SUMMARY_QUERY, params) or execute_query(DASHBOARD_QUERY, params)
+    return split_results(result[0] if result else None)
+
+
+def summary_mismatches(summary_row, raw_row, rel_tol=1e-9):
+    """
+    Compares a SUMMARY_QUERY row with the DASHBOARD_QUERY row for the same filters.
+
+    Float averages are summed in a different order by the two queries, so
+    they are compared with a relative tolerance; everything else must match.
+
+    Returns:
+        list: (column, summary value, raw value) for each column that differs.
+    """
+    mismatches = []
+    for column, (summary_value, raw_value) in enumerate(zip(summary_row, raw_row)):
+        if summary_value is None or raw_value is None:
+            same = summary_value is raw_value
+        else:
+            same = math.isclose(summary_value, raw_value, rel_tol=rel_tol)
+        if not same:
+            mismatches.append((column, summary_value, raw_value))
+    return mismatches
@@ -0,0 +1,245 @@
+# module_5/query_cache.py
+"""
+Result cache for dashboard queries, invalidated by the data version.
+
+The applicants table only changes when load_data.py runs, and every load
+bumps a version number in the `data_version` table. Cached results are
+keyed by that version plus the query and its parameters, so a new load
+makes every older entry unreachable at once. Entries also expire after a
+TTL, and the in-process LRU can be backed by a directory of pickle files
+that several worker processes share.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import psycopg2
+from psycopg2 import sql
+
+import db
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_MAX_ENTRIES = 256
+VERSION_CHECK_SECONDS = 2.0  # the data version is re-read at most this often
+
+DATA_VERSION_QUERY = sql.SQL("SELECT version FROM data_version;")
+
+
+class MemoryBackend:
+    """
+    Thread-safe in-process LRU of (expires_at, value) pairs.
+
+    Args:
+        max_entries (int, optional): Least recently used entries are dropped
+                                     beyond this many.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the unexpired (expires_at, value) entry for `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, value, expires_at):
+        """Stores `value` until `expires_at` (a time.time() timestamp)."""
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class FileBackend:
+    """
+    Cache entries as pickle files in a directory shared by worker processes.
+
+    Each entry is written to a temporary file and renamed into place, so
+    readers never see a partial file. A file's mtime records its last use,
+    and the least recently used files are removed beyond `max_entries`.
+
+    Args:
+        directory (str): Where the entries live; created if missing.
+        max_entries (int, optional): Upper bound on stored entries.
+    """
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES * 4):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".pickle"))
+
+    def get(self, key):
+        """Returns the unexpired (expires_at, value) entry for `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if entry[0] <= time.time():
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # evicted by another worker meanwhile
+        return entry
+
+    def put(self, key, value, expires_at):
+        """Stores `value` until `expires_at` and evicts old entries if needed."""
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump((expires_at, value), f)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pickle"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        for _, path in sorted(entries)[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Drops every entry."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".pickle"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+class QueryCache:
+    """
+    Caches query results per data version, in memory and optionally on disk.
+
+    Args:
+        ttl_seconds (float, optional): How long a result is served at most.
+        max_entries (int, optional): Size of the in-process LRU.
+        shared_backend (FileBackend, optional): Second level shared by
+                                                worker processes.
+        execute_query (callable, optional): Runs a query and returns its rows,
+                                            raising psycopg2.Error on failure.
+                                            Defaults to db.execute_query.
+    """
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES,
+                 shared_backend=None, execute_query=None):
+        self.ttl_seconds = ttl_seconds
+        self.memory = MemoryBackend(max_entries)
+        self.shared = shared_backend
+        self.execute_query = execute_query or db.execute_query
+        self.counters = {'hits': 0, 'shared_hits': 0, 'misses': 0}
+        self._version = (None, float('-inf'))  # (version, time.monotonic() it was read)
+        self._lock = threading.Lock()
+
+    @property
+    def hits(self):
+        """Results served from the cache (either level)."""
+        return self.counters['hits']
+
+    @property
+    def misses(self):
+        """Results that had to be computed by the database."""
+        return self.counters['misses']
+
+    def data_version(self):
+        """
+        Returns the version stamped by the last load (None if never stamped).
+
+        The value is re-read from the database at most every
+        VERSION_CHECK_SECONDS, so a new load shows up within that time.
+        """
+        version, checked_at = self._version
+        now = time.monotonic()
+        if now - checked_at >= VERSION_CHECK_SECONDS:
+            try:
+                rows = self.execute_query(DATA_VERSION_QUERY)
+                version = rows[0][0] if rows else None
+            except psycopg2.Error:
+                version = None  # table not created yet: fall back to the TTL alone
+            self._version = (version, now)
+        return version
+
+    def _key(self, query, params):
+        text = repr((self.data_version(), repr(query), repr(params)))
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def execute(self, query, params=None):
+        """
+        Returns the rows of `query`, from the cache when possible.
+
+        Failed queries raise as usual and are not cached.
+        """
+        key = self._key(query, params)
+        entry = self.memory.get(key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.memory.put(key, entry[1], entry[0])
+                self._count('shared_hits')
+        if entry is not None:
+            self._count('hits')
+            return entry[1]
+
+        self._count('misses')
+        rows = self.execute_query(query, params)
+        expires_at = time.time() + self.ttl_seconds
+        self.memory.put(key, rows, expires_at)
+        if self.shared is not None:
+            self.shared.put(key, rows, expires_at)
+        return rows
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def stats(self):
+        """Returns the hit/miss counters and sizes as a dict."""
+        return {
+            **self.counters,
+            'memory_entries': len(self.memory),
+            'shared_entries': len(self.shared) if self.shared is not None else None,
+            'data_version': self._version[0],
+        }
+
+    def clear(self):
+        """Drops every cached result (counters are kept)."""
+        self.memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
@@ -9,9 +9,15 @@ import os
 import psycopg2
 from psycopg2 import sql
 
+import db
+import metrics
+import snapshot
+
 def execute_query(query, params=None):
     """
-    Connects to the database, executes a given SQL query, and returns results.
+    Executes a given SQL query on a pooled connection and returns results.
+
+    Uses the same process-wide pool as app.py (see db.py).
 
     Args:
         query (psycopg2.sql.SQL): The SQL query object to be executed.
@@ -27,37 +33,25 @@ def execute_query(query, params=None):
         print("Error: DATABASE_URL secret not found.")
         return None
     try:
-        with psycopg2.connect(db_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, params)
-                return cur.fetchall()
+        return db.execute_query(query, params)
     except psycopg2.Error as e:
         print(f"Database query error: {e}")
     return None
 
-# --- Helper functions to get formatted output for each query ---
+# --- Formatters for each query's result ---
 
-def _get_query_1_output():
-    """Fetches and formats the output for Query 1."""
-    query = sql.SQL("SELECT COUNT(*) FROM applicants WHERE semester_start = %s;")
-    result = execute_query(query, ("Fall 2025",))
+def _format_query_1_output(result):
+    """Formats the output for Query 1."""
     answer = f"{result[0][0]:,}" if result else "Query Failed"
     return f"1. Applicants for Fall 2025: {answer}"
 
-def _get_query_2_output():
-    """Fetches and formats the output for Query 2."""
-    query = sql.SQL("SELECT 100.0 * COUNT(*) FILTER"
-                    " (WHERE student_type = 'International') / COUNT(*)"
-                    " FROM applicants;")
-    result = execute_query(query)
+def _format_query_2_output(result):
+    """Formats the output for Query 2."""
     answer = f"{result[0][0]:.2f}%" if result and result[0][0] is not None else "Query Failed"
     return f"2. Percentage of International Students: {answer}"
 
-def _get_query_3_output():
-    """Fetches and formats the output for Query 3."""
-    query = sql.SQL("SELECT AVG(gpa), AVG(gre_total), AVG(gre_v), "
-                    "AVG(gre_q), AVG(gre_aw) FROM applicants;")
-    result = execute_query(query)
+def _format_query_3_output(result):
+    """Formats the output for Query 3."""
     output = "3. Average Scores (All Terms):\n"
     if result and result[0]:
         gpa, total, v, q, aw = result[0]
@@ -70,59 +64,103 @@ def _get_query_3_output():
         output += "   Query Failed or No Data"
     return output
 
+def _format_query_4_output(result):
+    """Formats the output for Query 4."""
+    answer = f"{result[0][0]:.2f}" if result and result[0][0] is not None else "No Data"
+    return f"4. Avg GPA of American Students in Fall 2025: {answer}"
+
+def _format_query_5_output(result):
+    """Formats the output for Query 5."""
+    answer = f"{result[0][0]:.2f}%" if result and result[0][0] is not None else "No Data"
+    return f"5. Percent Acceptances for Fall 2025: {answer}"
+
+def _format_query_6_output(result):
+    """Formats the output for Query 6."""
+    answer = f"{result[0][0]:.2f}" if result and result[0][0] is not None else "No Data"
+    return f"6. Average GPA of Accepted Students in Fall 2025: {answer}"
+
+def _format_query_7_output(result):
+    """Formats the output for Query 7."""
+    answer = result[0][0] if result else "Query Failed"
+    label = "7. Johns Hopkins Masters in Computer Science Applicants:"
+    return f"{label} {answer}"
+
+OUTPUT_FORMATTERS = (_format_query_1_output, _format_query_2_output, _format_query_3_output,
+                     _format_query_4_output, _format_query_5_output, _format_query_6_output,
+                     _format_query_7_output)
+
+def _get_dashboard_outputs():
+    """
+    Fetches all seven outputs with the single aggregate query in metrics.py,
+    or from an in-memory snapshot of SNAPSHOT_SOURCE (the database or a JSON
+    file) when METRICS_BACKEND=snapshot, as in app.py. If the snapshot
+    cannot be read from the database, the query answers instead.
+    """
+    results = None
+    if os.environ.get('METRICS_BACKEND') == 'snapshot':
+        source = os.environ.get('SNAPSHOT_SOURCE', snapshot.DATABASE_SOURCE)
+        try:
+            results = snapshot.SnapshotStore(source).current().dashboard_results()
+        except psycopg2.Error as e:
+            print(f"Snapshot unavailable, answering from SQL: {e}")
+    if results is None:
+        results = metrics.fetch_dashboard_results(execute_query)
+    return [format_output(result) for format_output, result in zip(OUTPUT_FORMATTERS, results)]
+
+# --- Helper functions to get formatted output for each query (one query each) ---
+
+def _get_query_1_output():
+    """Fetches and formats the output for Query 1."""
+    query = sql.SQL("SELECT COUNT(*) FROM applicants WHERE semester_start = %s;")
+    return _format_query_1_output(execute_query(query, ("Fall 2025",)))
+
+def _get_query_2_output():
+    """Fetches and formats the output for Query 2."""
+    query = sql.SQL("SELECT 100.0 * COUNT(*) FILTER"
+                    " (WHERE student_type = 'International') / COUNT(*)"
+                    " FROM applicants;")
+    return _format_query_2_output(execute_query(query))
+
+def _get_query_3_output():
+    """Fetches and formats the output for Query 3."""
+    query = sql.SQL("SELECT AVG(gpa), AVG(gre_total), AVG(gre_v), "
+                    "AVG(gre_q), AVG(gre_aw) FROM applicants;")
+    return _format_query_3_output(execute_query(query))
+
 def _get_query_4_output():
     """Fetches and formats the output for Query 4."""
     query = sql.SQL("SELECT AVG(gpa) FROM applicants"
                     " WHERE student_type = %s AND semester_start = %s;")
-    result = execute_query(query, ("American", "Fall 2025"))
-    answer = f"{result[0][0]:.2f}" if result and result[0][0] is not None else "No Data"
-    return f"4. Avg GPA of American Students in Fall 2025: {answer}"
+    return _format_query_4_output(execute_query(query, ("American", "Fall 2025")))
 
 def _get_query_5_output():
     """Fetches and formats the output for Query 5."""
     query = sql.SQL("SELECT 100.0 * COUNT(*) FILTER"
                     " (WHERE applicant_status = 'Accepted') / NULLIF(COUNT(*), 0)"
                     " FROM applicants WHERE semester_start = %s;")
-    result = execute_query(query, ("Fall 2025",))
-    answer = f"{result[0][0]:.2f}%" if result and result[0][0] is not None else "No Data"
-    return f"5. Percent Acceptances for Fall 2025: {answer}"
+    return _format_query_5_output(execute_query(query, ("Fall 2025",)))
 
 def _get_query_6_output():
     """Fetches and formats the output for Query 6."""
     query = sql.SQL("SELECT AVG(gpa) FROM applicants"
                     " WHERE semester_start = %s AND applicant_status = %s;")
-    result = execute_query(query, ("Fall 2025", "Accepted"))
-    answer = f"{result[0][0]:.2f}" if result and result[0][0] is not None else "No Data"
-    return f"6. Average GPA of Accepted Students in Fall 2025: {answer}"
+    return _format_query_6_output(execute_query(query, ("Fall 2025", "Accepted")))
 
 def _get_query_7_output():
     """Fetches and formats the output for Query 7."""
     query = sql.SQL("SELECT COUNT(*) FROM applicants"
                     " WHERE university ILIKE %s AND program_name ILIKE %s"
                     " AND degree = %s;")
-    result = execute_query(query, ("%Johns Hopkins%", "%Computer Science%", "Masters"))
-    answer = result[0][0] if result else "Query Failed"
-    label = "7. Johns Hopkins Masters in Computer Science Applicants:"
-    return f"{label} {answer}"
+    return _format_query_7_output(
+        execute_query(query, ("%Johns Hopkins%", "%Computer Science%", "Masters")))
 
 def main():
     """Main function to run and print all predefined queries."""
     print("Running database queries...")
     print("=" * 30)
-    print(_get_query_1_output())
-    print("-" * 30)
-    print(_get_query_2_output())
-    print("-" * 30)
-    print(_get_query_3_output())
-    print("-" * 30)
-    print(_get_query_4_output())
-    print("-" * 30)
-    print(_get_query_5_output())
-    print("-" * 30)
-    print(_get_query_6_output())
-    print("-" * 30)
-    print(_get_query_7_output())
+    print(("\n" + "-" * 30 + "\n").join(_get_dashboard_outputs()))
     print("=" * 30)
+    db.close_pool()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,304 @@
+# module_5/snapshot.py
+"""
+In-process columnar snapshot of 'applicants' that answers the dashboard
+metrics without a database round trip.
+
+The six columns the metrics filter on are dictionary-encoded: each distinct
+text is stored once and rows hold its integer code. Semester, student type,
+status and degree also get a bitmap index, one packed bit array per distinct
+value, so an equality filter is a lookup and a conjunction of filters is a
+bitwise AND. University and program are matched against their distinct
+values once per ILIKE pattern. Scores are summed at build time per
+combination of the four indexed columns, so an average is a sum over the few
+hundred matching groups rather than over every row.
+
+A snapshot is built on first use from `applicant_data.json` (or any file
+load_data.py reads) or from the applicants table, and `dashboard_row`
+returns the same eleven values as metrics.DASHBOARD_QUERY.
+"""
+import functools
+import os
+import re
+import threading
+
+import numpy as np
+from psycopg2 import sql
+
+import db
+import load_data
+import metrics
+from query_cache import DATA_VERSION_QUERY
+
+DATABASE_SOURCE = 'database'
+PATTERN_CACHE_SIZE = 256  # (column, ILIKE pattern) bitmaps kept per snapshot
+CATEGORY_COLUMNS = ('semester_start', 'student_type', 'applicant_status', 'degree',
+                    'university', 'program_name')
+BITMAP_COLUMNS = ('semester_start', 'student_type', 'applicant_status', 'degree')
+SCORE_COLUMNS = metrics.SUMMARY_SCORES
+SNAPSHOT_QUERY = sql.SQL("SELECT {} FROM applicants;").format(
+    sql.SQL(", ").join(map(sql.Identifier, CATEGORY_COLUMNS + SCORE_COLUMNS)))
+
+_JSON_KEYS = {column: key for column, key, _ in load_data.APPLICANT_COLUMNS}
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+def _count(bitmap):
+    """Returns the number of set bits in a packed bitmap."""
+    if hasattr(np, 'bitwise_count'):  # NumPy 2.0+
+        return int(np.bitwise_count(bitmap).sum(dtype=np.int64))
+    return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+
+def _like_to_regex(pattern):
+    """
+    Compiles an ILIKE pattern into an equivalent case-insensitive regex.
+
+    '%' matches any run of characters, '_' any one character, and a
+    backslash makes the next character literal, as in PostgreSQL.
+    """
+    parts, chars = [], iter(pattern)
+    for char in chars:
+        if char == '\\':
+            parts.append(re.escape(next(chars, '\\')))
+        elif char == '%':
+            parts.append('.*')
+        elif char == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def _encode(values):
+    """
+    Dictionary-encodes a column of texts.
+
+    Returns:
+        tuple: (codes, lookup), where codes is an int32 array with -1 for
+               NULL and lookup maps each distinct text to its code, in
+               code order.
+    """
+    lookup = {}
+    codes = np.fromiter((-1 if value is None else lookup.setdefault(value, len(lookup))
+                         for value in values), dtype=np.int32, count=len(values))
+    return codes, lookup
+
+
+def _score(value):
+    """Reads a score the way the table stores it: NaN where it would be NULL."""
+    if value is None or value == 'N/A':
+        return float('nan')
+    return float(str(value))
+
+
+class ApplicantSnapshot:
+    """
+    Columnar, read-only copy of the applicants table.
+
+    Args:
+        categories (dict): Column name -> list of texts (None for NULL), for
+                           every name in CATEGORY_COLUMNS.
+        scores (dict): Column name -> sequence of floats (NaN for NULL), for
+                       every name in SCORE_COLUMNS.
+        version (object, optional): What the snapshot was built from, e.g.
+                                    the data version of the load.
+    """
+
+    def __init__(self, categories, scores, version=None):
+        self.version = version
+        self.columns = {column: _encode(categories[column]) for column in CATEGORY_COLUMNS}
+        self.bitmaps = {column: {value: np.packbits(self.columns[column][0] == code)
+                                 for value, code in self.columns[column][1].items()}
+                        for column in BITMAP_COLUMNS}
+        self._empty = np.packbits(np.zeros(self.row_count, dtype=bool))
+        self._groups = self._aggregate_groups(scores)
+        self._pattern_bitmap = functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)(
+            self._build_pattern_bitmap)
+
+    def _aggregate_groups(self, scores):
+        """
+        Sums the scores per combination of the BITMAP_COLUMNS values.
+
+        Every average the metrics ask for filters on those columns only, so
+        it is a sum over the few hundred matching groups instead of over
+        the rows.
+
+        Returns:
+            dict: 'codes' (column -> code of each group, -1 for NULL),
+                  'sums' and 'counts' (score column -> per-group sum and
+                  number of non-NULL values).
+        """
+        group_key, radix = np.zeros(self.row_count, dtype=np.int64), 1
+        for column in BITMAP_COLUMNS:
+            codes, lookup = self.columns[column]
+            group_key += (codes.astype(np.int64) + 1) * radix  # 0 stands for NULL
+            radix *= len(lookup) + 1
+        keys, group_of_row = np.unique(group_key, return_inverse=True)
+        groups = {'codes': {}, 'sums': {}, 'counts': {}}
+        for column in BITMAP_COLUMNS:
+            size = len(self.columns[column][1]) + 1
+            groups['codes'][column] = (keys % size - 1).astype(np.int32)
+            keys = keys // size
+        for column in SCORE_COLUMNS:
+            values = np.asarray(scores[column], dtype=np.float64)
+            present = ~np.isnan(values)
+            groups['sums'][column] = np.bincount(group_of_row, np.where(present, values, 0.0),
+                                                 minlength=len(keys))
+            groups['counts'][column] = np.bincount(group_of_row, present, minlength=len(keys))
+        return groups
+
+    @property
+    def row_count(self):
+        """Number of applicants in the snapshot."""
+        return len(self.columns[CATEGORY_COLUMNS[0]][0])
+
+    @classmethod
+    def from_records(cls, applicants, version=None):
+        """
+        Builds a snapshot from cleaned records, as load_data.py would load them.
+
+        Args:
+            applicants (iterable): Records with the keys in
+                                   load_data.APPLICANT_COLUMNS.
+            version (object, optional): See the class.
+        """
+        categories = {column: [] for column in CATEGORY_COLUMNS}
+        scores = {column: [] for column in SCORE_COLUMNS}
+        for applicant in applicants:
+            for column, values in categories.items():
+                value = applicant.get(_JSON_KEYS[column])
+                values.append(None if value is None else str(value))
+            for column, values in scores.items():
+                values.append(_score(applicant.get(_JSON_KEYS[column])))
+        return cls(categories, scores, version)
+
+    @classmethod
+    def from_file(cls, path):
+        """Builds a snapshot from a file load_data.py can load, cleaned the same way."""
+        return cls.from_records(load_data._iter_clean_applicants(path),  # pylint: disable=protected-access
+                                version=f"file-{os.stat(path).st_mtime_ns}")
+
+    @classmethod
+    def from_database(cls, execute_query=None):
+        """
+        Builds a snapshot from the applicants table, stamped with its data version.
+
+        Args:
+            execute_query (callable, optional): Runs a query and returns its
+                                                rows. Defaults to db.execute_query.
+        """
+        execute_query = execute_query or db.execute_query
+        version_rows = execute_query(DATA_VERSION_QUERY)
+        rows = execute_query(SNAPSHOT_QUERY)
+        columns = list(zip(*rows)) or [()] * (len(CATEGORY_COLUMNS) + len(SCORE_COLUMNS))
+        categories = dict(zip(CATEGORY_COLUMNS, columns))
+        scores = {column: [float('nan') if value is None else float(value) for value in values]
+                  for column, values in zip(SCORE_COLUMNS, columns[len(CATEGORY_COLUMNS):])}
+        return cls(categories, scores, version_rows[0][0] if version_rows else None)
+
+    def _equals(self, column, value):
+        return self.bitmaps[column].get(value, self._empty)
+
+    def _build_pattern_bitmap(self, column, pattern):
+        regex = _like_to_regex(pattern)
+        codes, lookup = self.columns[column]
+        matching = [code for value, code in lookup.items() if regex.fullmatch(value)]
+        return np.packbits(np.isin(codes, matching))
+
+    def _average(self, column, **equals):
+        """Average of a score over the rows where each column=value in `equals` holds."""
+        groups = np.ones(len(self._groups['sums'][column]), dtype=bool)
+        for filter_column, value in equals.items():
+            code = self.columns[filter_column][1].get(value)
+            if code is None:
+                return None
+            groups &= self._groups['codes'][filter_column] == code
+        count = self._groups['counts'][column][groups].sum()
+        if not count:
+            return None
+        return float(self._groups['sums'][column][groups].sum() / count)
+
+    def dashboard_row(self, **filters):
+        """
+        Computes the eleven values of metrics.DASHBOARD_QUERY's row.
+
+        Args:
+            **filters: Overrides for metrics.DEFAULT_FILTERS.
+
+        Returns:
+            tuple: The row, with floats where PostgreSQL returns numerics.
+        """
+        params = {**metrics.DEFAULT_FILTERS, **filters}
+        semester = self._equals('semester_start', params['semester'])
+        semester_count = _count(semester)
+        accepted = _count(self._equals('applicant_status', 'Accepted') & semester)
+        program = (self._pattern_bitmap('university', params['university'])
+                   & self._pattern_bitmap('program_name', params['program'])
+                   & self._equals('degree', params['degree']))
+        return (
+            semester_count,
+            (100.0 * _count(self._equals('student_type', 'International')) / self.row_count
+             if self.row_count else None),
+            *(self._average(column) for column in SCORE_COLUMNS),
+            self._average('gpa', semester_start=params['semester'],
+                          student_type=params['student_type']),
+            100.0 * accepted / semester_count if semester_count else None,
+            self._average('gpa', semester_start=params['semester'],
+                          applicant_status=params['status']),
+            _count(program),
+        )
+
+    def dashboard_results(self, **filters):
+        """Returns `dashboard_row` cut into per-question results (see metrics.split_results)."""
+        return metrics.split_results(self.dashboard_row(**filters))
+
+
+class SnapshotStore:
+    """
+    Holds the snapshot of `source` and rebuilds it after a new load.
+
+    Nothing is read until the first call to `current`, so creating a store
+    never needs the database. A snapshot of the database is rebuilt on the
+    first request that sees a new data version; a file snapshot stays as
+    built.
+
+    Args:
+        source (str): DATABASE_SOURCE or the path of a JSON / JSON Lines file.
+        data_version (callable, optional): Returns the current data version,
+                                           e.g. QueryCache.data_version.
+    """
+
+    def __init__(self, source, data_version=None):
+        self.source = source
+        self._data_version = data_version
+        self._lock = threading.Lock()
+        self.snapshot = None
+
+    def refresh(self):
+        """Rebuilds the snapshot from the source and returns it."""
+        if self.source == DATABASE_SOURCE:
+            self.snapshot = ApplicantSnapshot.from_database()
+        else:
+            self.snapshot = ApplicantSnapshot.from_file(self.source)
+        return self.snapshot
+
+    def current(self):
+        """
+        Returns the snapshot, first building it on first use or rebuilding it
+        if the data has changed.
+
+        Raises:
+            psycopg2.Error: If the snapshot has to be read from an
+                            unreachable database.
+        """
+        if self.snapshot is None:
+            with self._lock:
+                if self.snapshot is None:
+                    self.refresh()
+        elif self.source == DATABASE_SOURCE and self._data_version is not None:
+            version = self._data_version()
+            if version is not None and version != self.snapshot.version:
+                with self._lock:
+                    if version != self.snapshot.version:
+                        self.refresh()
+        return self.snapshot
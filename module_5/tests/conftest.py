@@ -0,0 +1,82 @@
+# tests/conftest.py
+"""
+Shared fixtures: sample applicant records and throwaway schemas on the
+DATABASE_URL server for the tests that need PostgreSQL.
+"""
+
+import os
+import uuid
+
+import psycopg2
+import pytest
+
+SAMPLE_APPLICANTS = [
+    {"University": "Johns Hopkins University", "Program Name": "Computer Science",
+     "Degree": "Masters", "Applicant Status": "Accepted", "Decision Date": "12 Feb",
+     "Date Added": "2025-02-14", "Semester Start": "Fall 2025", "Student Type": "American",
+     "GPA": "3.85", "GRE Total": "325", "GRE V": "160", "GRE Q": "165", "GRE AW": "4.5",
+     "Comment": "Got the email\tat 9am\nvery happy", "URL": "https://www.thegradcafe.com/result/1"},
+    {"University": "MIT", "Program Name": "Electrical Engineering", "Degree": "PhD",
+     "Applicant Status": "Rejected", "Decision Date": "N/A", "Date Added": "N/A",
+     "Semester Start": "Fall 2025", "Student Type": "International", "GPA": "3 9",
+     "GRE Total": "N/A", "GRE V": "171", "GRE Q": "N/A", "GRE AW": "N/A",
+     "Comment": "back\\slash", "URL": "https://www.thegradcafe.com/result/2"},
+    {"University": "Stanford University", "Program Name": "Statistics", "Degree": "Masters",
+     "Applicant Status": "Wait listed", "Semester Start": "Spring 2026",
+     "Student Type": "Other", "GPA": "abc", "URL": "https://www.thegradcafe.com/result/3"},
+]
+
+
+def sample_applicants():
+    """Returns fresh copies of the sample records (cleaning modifies them in place)."""
+    return [dict(applicant) for applicant in SAMPLE_APPLICANTS]
+
+
+@pytest.fixture
+def db_cursor():
+    """
+    A cursor inside a throwaway schema on the DATABASE_URL server.
+
+    Everything runs in one transaction that is rolled back afterwards, so
+    the real applicants table is never touched.
+    """
+    db_url = os.environ.get("DATABASE_URL")
+    if not db_url:
+        pytest.skip("DATABASE_URL is not set")
+    conn = psycopg2.connect(db_url)
+    schema = f"pytest_{uuid.uuid4().hex[:12]}"
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {schema}")
+            cur.execute(f"SET LOCAL search_path TO {schema}")
+            yield cur
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+@pytest.fixture
+def committed_schema(monkeypatch):
+    """
+    A connection whose search_path is a committed throwaway schema.
+
+    For code that opens connections of its own (the parallel loader): PGOPTIONS
+    points every new connection at the schema, which is dropped afterwards.
+    """
+    db_url = os.environ.get("DATABASE_URL")
+    if not db_url:
+        pytest.skip("DATABASE_URL is not set")
+    schema = f"pytest_{uuid.uuid4().hex[:12]}"
+    monkeypatch.setenv("PGOPTIONS", f"-c search_path={schema}")
+    conn = psycopg2.connect(db_url)
+    with conn.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+    conn.commit()
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.commit()
+        conn.close()
@@ -0,0 +1,81 @@
+# tests/test_api.py
+"""
+Tests for app.py's /api/metrics: parameters, ETag revalidation and errors.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+import app
+import metrics
+
+ROW = (8, Decimal("37.5"), 3.6, Decimal("325.0"), 160.5, 165.0, 4.5, 3.85, Decimal("50.0"), None, 2)
+
+
+@pytest.fixture(name="fake_metrics")
+def fixture_fake_metrics(monkeypatch):
+    """Serves ROW for every metrics query at data version 3; records the params sent."""
+    calls = []
+
+    def execute_query(_query, params=None):
+        calls.append(params)
+        return [ROW]
+
+    monkeypatch.setattr(app, "execute_query", execute_query)
+    monkeypatch.setattr(app.query_cache, "data_version", lambda: 3)
+    return calls
+
+
+@pytest.mark.api
+def test_metrics_are_returned_as_json(fake_metrics):
+    """Tests that every column comes back under its name, with Decimals as numbers."""
+    response = app.app.test_client().get("/api/metrics?semester=Spring%202026&university=MIT")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["data_version"] == 3
+    expected = [8, 37.5, 3.6, 325.0, 160.5, 165.0, 4.5, 3.85, 50.0, None, 2]
+    assert body["metrics"] == dict(zip(metrics.METRIC_NAMES, expected))
+    assert fake_metrics[0] == dict(metrics.DEFAULT_FILTERS, semester="Spring 2026",
+                                   university="%MIT%")
+    assert body["filters"] == fake_metrics[0]
+
+
+@pytest.mark.api
+def test_substring_filters_escape_wildcards(fake_metrics):
+    """Tests that % and _ in university and program are matched literally."""
+    app.app.test_client().get("/api/metrics", query_string={"program": "100%_CS\\"})
+    assert fake_metrics[0]["program"] == "%100\\%\\_CS\\\\%"
+
+
+@pytest.mark.api
+def test_matching_etag_gets_304_without_a_query(fake_metrics, monkeypatch):
+    """Tests that a poll with the current ETag is answered 304 and a new load changes the ETag."""
+    client = app.app.test_client()
+    first = client.get("/api/metrics?degree=PhD")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    again = client.get("/api/metrics?degree=PhD", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["ETag"] == etag and not again.data
+    assert len(fake_metrics) == 1
+    response = client.get("/api/metrics?degree=Masters", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+    monkeypatch.setattr(app.query_cache, "data_version", lambda: 4)
+    reloaded = client.get("/api/metrics?degree=PhD", headers={"If-None-Match": etag})
+    assert reloaded.status_code == 200 and reloaded.headers["ETag"] != etag
+
+
+@pytest.mark.api
+@pytest.mark.usefixtures("fake_metrics")
+def test_bad_requests_and_failures(monkeypatch):
+    """Tests that unknown parameters get 400 and a failed query 503 without an ETag."""
+    client = app.app.test_client()
+    response = client.get("/api/metrics?semster=Fall%202025")
+    assert response.status_code == 400 and "semster" in response.get_json()["error"]
+
+    monkeypatch.setattr(app, "execute_query", lambda query, params=None: [])
+    monkeypatch.setattr(app.query_cache, "data_version", lambda: None)
+    response = client.get("/api/metrics")
+    assert response.status_code == 503 and "ETag" not in response.headers
@@ -0,0 +1,172 @@
+# tests/test_db.py
+"""
+Tests for the shared connection pool in db.py.
+"""
+# The tests exercise module internals directly
+# pylint: disable=protected-access
+
+import os
+import threading
+
+import psycopg2
+import pytest
+from psycopg2 import pool
+
+import db
+
+
+@pytest.fixture(name="small_pool")
+def fixture_small_pool():
+    """Configures a two-connection pool for the test and closes it afterwards."""
+    if not os.environ.get("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+    db.configure_pool(minconn=1, maxconn=2)
+    yield
+    db.configure_pool()
+
+
+@pytest.mark.pool
+def test_configure_pool_rejects_bad_sizes():
+    """Tests that impossible pool sizes are refused."""
+    with pytest.raises(ValueError):
+        db.configure_pool(minconn=3, maxconn=2)
+    with pytest.raises(ValueError):
+        db.configure_pool(minconn=0, maxconn=0)
+
+
+@pytest.mark.pool
+def test_execute_query_without_database_url(monkeypatch):
+    """Tests that a missing DATABASE_URL surfaces as a psycopg2 error the callers already catch."""
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    db.close_pool()
+    with pytest.raises(psycopg2.Error):
+        db.execute_query("SELECT 1;")
+
+
+@pytest.mark.pool
+@pytest.mark.db
+@pytest.mark.usefixtures("small_pool")
+def test_queries_reuse_pooled_connection():
+    """Tests that consecutive queries run on the same backend instead of reconnecting."""
+    backend_pids = {db.execute_query("SELECT pg_backend_pid();")[0][0] for _ in range(5)}
+    assert len(backend_pids) == 1
+
+
+@pytest.mark.pool
+@pytest.mark.db
+@pytest.mark.usefixtures("small_pool")
+def test_broken_connection_is_replaced():
+    """Tests that a query still succeeds after the server kills the pooled connection."""
+    old_pid = db.execute_query("SELECT pg_backend_pid();")[0][0]
+    with psycopg2.connect(os.environ["DATABASE_URL"]) as admin:
+        with admin.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(%s);", (old_pid,))
+    new_pid = db.execute_query("SELECT pg_backend_pid();")[0][0]
+    assert new_pid != old_pid
+
+
+@pytest.mark.pool
+@pytest.mark.db
+@pytest.mark.usefixtures("small_pool")
+def test_exhausted_pool_waits_then_times_out(monkeypatch):
+    """Tests that callers beyond maxconn wait for a free connection instead of failing at once."""
+    monkeypatch.setattr(db, "POOL_TIMEOUT_SECONDS", 0.2)
+    with db.connection(), db.connection():
+        with pytest.raises(pool.PoolError):
+            db.execute_query("SELECT 1;")
+
+    results = []
+    with db.connection():
+        waiter = threading.Thread(target=lambda: results.append(db.execute_query("SELECT 1;")))
+        with db.connection():
+            waiter.start()
+        waiter.join()
+    assert results == [[(1,)]]
+
+
+@pytest.mark.pool
+@pytest.mark.db
+@pytest.mark.parametrize("idle_seconds", [db.HEALTH_CHECK_IDLE_SECONDS, 0.0])
+@pytest.mark.usefixtures("small_pool")
+def test_more_queries_than_pool_slots(monkeypatch, idle_seconds):
+    """Tests that every checkout is returned, with and without the health check ping."""
+    monkeypatch.setattr(db, "HEALTH_CHECK_IDLE_SECONDS", idle_seconds)
+    monkeypatch.setattr(db, "POOL_TIMEOUT_SECONDS", 0.2)
+    for _ in range(3 * db.get_pool().maxconn):
+        assert db.execute_query("SELECT 1;") == [(1,)]
+
+
+class _FakeConnection:
+    """Records the order of calls the pool makes on a connection."""
+
+    def __init__(self, calls, fail_ping=False):
+        self.calls, self.fail_ping, self.closed = calls, fail_ping, 0
+        self._autocommit = False
+
+    @property
+    def autocommit(self):
+        """Mirrors psycopg2's attribute."""
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, value):
+        self.calls.append("autocommit")
+        self._autocommit = value
+
+    def cursor(self):
+        """Returns a cursor whose execute records a ping."""
+        connection = self
+
+        class _Cursor:  # pylint: disable=too-few-public-methods
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def execute(self, _query):
+                """Pings, failing if the connection was made to."""
+                connection.calls.append(("ping", connection.autocommit))
+                if connection.fail_ping:
+                    raise psycopg2.OperationalError("server closed the connection")
+        return _Cursor()
+
+
+class _FakePool:
+    """Hands out queued connections and records which are returned or closed."""
+
+    def __init__(self, connections):
+        self.connections, self.returned, self.discarded = list(connections), [], []
+
+    def getconn(self):
+        """Returns the next queued connection."""
+        return self.connections.pop(0)
+
+    def putconn(self, conn, close=False):
+        """Records the connection as returned or discarded."""
+        (self.discarded if close else self.returned).append(conn)
+
+
+@pytest.mark.pool
+def test_checkout_sets_autocommit_before_health_check(monkeypatch):
+    """Tests that the ping runs in autocommit mode and a failing connection is discarded."""
+    monkeypatch.setattr(db, "HEALTH_CHECK_IDLE_SECONDS", 0.0)
+    calls = []
+    broken, healthy = _FakeConnection(calls, fail_ping=True), _FakeConnection(calls)
+    fake_pool = _FakePool([broken, healthy])
+    assert db._checkout(fake_pool) is healthy  # pylint: disable=protected-access
+    assert calls == ["autocommit", ("ping", True), "autocommit", ("ping", True)]
+    assert fake_pool.discarded == [broken]
+
+
+@pytest.mark.pool
+def test_checkout_discards_connection_on_error(monkeypatch):
+    """Tests that a connection failing during checkout is closed rather than leaked."""
+    def refuse(_conn):
+        raise psycopg2.InterfaceError("connection already closed")
+    monkeypatch.setattr(db, "_is_healthy", refuse)
+    conn = _FakeConnection([])
+    fake_pool = _FakePool([conn])
+    with pytest.raises(psycopg2.InterfaceError):
+        db._checkout(fake_pool)  # pylint: disable=protected-access
+    assert fake_pool.discarded == [conn] and not fake_pool.returned
@@ -0,0 +1,365 @@
+# tests/test_load_data.py
+"""
+Tests for load_data.py: cleaning, the load methods and modes, and indexing.
+"""
+# The tests exercise module internals directly
+# pylint: disable=protected-access
+
+import copy
+import datetime
+import json
+import random
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+import load_data
+from tests.conftest import sample_applicants
+
+# Unlogged tables the parallel loader left behind in the test's schema
+PARALLEL_TABLES_QUERY = ("SELECT tablename FROM pg_tables WHERE schemaname = current_schema()"
+                         " AND tablename LIKE 'applicants\\_parallel\\_load%'")
+SCRAPER_FIXTURE = (Path(__file__).resolve().parents[2] / "module_2" / "tests" / "fixtures"
+                   / "expected_entries.json")
+
+
+@pytest.mark.load
+def test_clean_applicant_normalizes_scores():
+    """Tests that spaces become decimal points and invalid scores become 'N/A'."""
+    mit, stanford = [load_data._clean_applicant(a) for a in sample_applicants()[1:]]
+    assert mit["GPA"] == "3.9"
+    assert mit["GRE V"] == "N/A"  # above 170
+    assert stanford["GPA"] == "N/A"  # not a number
+    assert "GRE Q" not in stanford
+
+
+EDGE_SCORES = ["3.5", "3 5", "3.5 ", " 3.5", "4.01", "-1", "1_0", "1e2", ".5", "nan", "inf",
+               "\u0663", "3.5\x00", "abc", "", "N/A", None, 3.9, 4, 325, True, [3], 170.0]
+
+
+def _random_applicants(count, seed):
+    rng = random.Random(seed)
+    keys = list(load_data.VALIDATION_RANGES)
+    applicants = []
+    for n in range(count):
+        applicant = {"URL": f"https://www.thegradcafe.com/result/{n}"}
+        for key in keys:
+            roll = rng.random()
+            if roll < 0.2:
+                continue  # key missing
+            if roll < 0.5:
+                applicant[key] = rng.choice(EDGE_SCORES)
+            else:
+                low, high = load_data.VALIDATION_RANGES[key]
+                applicant[key] = f"{rng.uniform(low - 1, high + 1):.2f}"
+        applicants.append(applicant)
+    return applicants
+
+
+@pytest.mark.load
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_columnar_cleaning_matches_scalar(seed):
+    """Tests that the NumPy cleaner gives the same records and reject counts as the scalar one."""
+    scalar = _random_applicants(2000, seed)
+    columnar = copy.deepcopy(scalar)
+    scalar_rejects = dict.fromkeys(load_data.VALIDATION_RANGES, 0)
+    columnar_rejects = dict.fromkeys(load_data.VALIDATION_RANGES, 0)
+    load_data._clean_batch(scalar, scalar_rejects, columnar=False)
+    load_data._clean_batch(columnar, columnar_rejects, columnar=True)
+    assert columnar == scalar
+    assert columnar_rejects == scalar_rejects
+    assert all(scalar_rejects.values())
+
+
+@pytest.mark.load
+def test_iter_clean_applicants_reports_rejects(tmp_path, capsys):
+    """Tests that streaming cleaning works across batches and prints per-field reject counts."""
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(sample_applicants() * 3), encoding="utf-8")
+    cleaned = list(load_data._iter_clean_applicants(path, batch_rows=2))
+    assert cleaned == [load_data._clean_applicant(a) for a in sample_applicants() * 3]
+    assert "GPA: 3, GRE Total: 0, GRE V: 3, GRE Q: 0, GRE AW: 0" in capsys.readouterr().out
+
+
+@pytest.mark.load
+def test_copy_line_nulls_and_escaping():
+    """Tests that COPY lines turn missing values into NULL and escape special characters."""
+    jhu, mit, stanford = [load_data._to_copy_line(load_data._clean_applicant(a))
+                          for a in sample_applicants()]
+    assert jhu.endswith("Got the email\\tat 9am\\nvery happy"
+                        "\thttps://www.thegradcafe.com/result/1\n")
+    assert jhu.count("\t") == len(load_data.APPLICANT_COLUMNS) - 1
+    mit_values = mit.rstrip("\n").split("\t")
+    assert mit_values[4] == "N/A"  # decision_date is text, so 'N/A' is kept
+    assert mit_values[5] == "\\N"  # date_added
+    assert mit_values[13] == "back\\\\slash"
+    assert stanford.split("\t")[5] == "\\N"  # missing key
+
+
+@pytest.mark.load
+def test_copy_stream_reads_in_chunks():
+    """Tests that the COPY stream yields the same text however it is read."""
+    applicants = [load_data._clean_applicant(a) for a in sample_applicants()] * 5
+    lines = [load_data._to_copy_line(a) for a in applicants]
+    expected = "".join(lines)
+
+    stream = load_data.ApplicantCopyStream(iter(applicants), chunk_rows=2)
+    pieces = []
+    while piece := stream.read(7):
+        pieces.append(piece)
+    assert "".join(pieces) == expected
+    assert stream.rows_read == 15
+    assert load_data.ApplicantCopyStream(applicants, chunk_rows=4).read() == "".join(lines[:4])
+
+
+@pytest.mark.load
+def test_iter_clean_applicants_matches_json_path(tmp_path):
+    """Tests that the streaming cleaner yields what the JSON insert path sends."""
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(sample_applicants()), encoding="utf-8")
+    assert list(load_data._iter_clean_applicants(path)) == json.loads(
+        load_data._load_and_clean_json_data(path))
+
+
+@pytest.mark.load
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_scraper_output_is_mapped_while_streaming(tmp_path, suffix):
+    """Tests that module_2's output files load as is, mapped to the loader's fields."""
+    assert load_data.field_map is not None
+    scraped = json.loads(SCRAPER_FIXTURE.read_text(encoding="utf-8"))["survey_page_1.html"]
+    path = tmp_path / f"applicant_data{suffix}"
+    if suffix == ".jsonl":
+        path.write_text("".join(json.dumps(entry) + "\n" for entry in scraped), encoding="utf-8")
+    else:
+        path.write_text(json.dumps(scraped, indent=2), encoding="utf-8")
+
+    cleaned = list(load_data._iter_clean_applicants(path, batch_rows=2))
+    assert len(cleaned) == len(scraped)
+    loader_keys = [key for _, key, _ in load_data.APPLICANT_COLUMNS]
+    assert [list(record) for record in cleaned] == [loader_keys] * len(scraped)
+    assert cleaned[0]["Program Name"] == "Computer Science" and cleaned[0]["Degree"] == "Masters"
+    assert cleaned[0]["Date Added"] == "2025-05-28" and cleaned[0]["GRE AW"] == "4.5"
+    assert cleaned[0]["URL"] == scraped[0]["URL Link"]
+
+
+@pytest.mark.load
+def test_json_lines_being_written_loads_complete_lines(tmp_path):
+    """Tests that a half-written last line, as while the scraper runs, is left out, not an error."""
+    path = tmp_path / "applicant_data.jsonl"
+    lines = [json.dumps(applicant) for applicant in sample_applicants()]
+    path.write_text("\n".join(lines[:2]) + "\n" + lines[2][:20], encoding="utf-8")
+    assert len(list(load_data._iter_clean_applicants(path))) == 2
+    path.write_text("\n".join(lines), encoding="utf-8")  # complete, without a final newline
+    assert len(list(load_data._iter_clean_applicants(path))) == 3
+
+
+@pytest.mark.load
+def test_scraper_output_without_field_map_is_rejected(tmp_path, monkeypatch):
+    """Tests that scraper output is not loaded unmapped when field_map.py is missing."""
+    scraped = json.loads(SCRAPER_FIXTURE.read_text(encoding="utf-8"))["survey_page_1.html"]
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(scraped), encoding="utf-8")
+    monkeypatch.setattr(load_data, "field_map", None)
+
+    with pytest.raises(ValueError, match="scraper output"):
+        list(load_data._iter_clean_applicants(path))
+    path.write_text(json.dumps(sample_applicants()), encoding="utf-8")
+    assert len(list(load_data._iter_clean_applicants(path))) == len(sample_applicants())
+
+
+@pytest.mark.load
+@pytest.mark.db
+def test_copy_matches_json_insert(db_cursor):
+    """Tests that COPY loads exactly the rows the json_array_elements insert does."""
+    select_rows = "SELECT * FROM applicants ORDER BY id"
+    load_data._create_applicants_table(db_cursor)
+    applicants = [load_data._clean_applicant(a) for a in sample_applicants()]
+    load_data._insert_data(db_cursor, json.dumps(applicants))
+    db_cursor.execute(select_rows)
+    inserted = [row[1:] for row in db_cursor.fetchall()]
+
+    db_cursor.execute("TRUNCATE applicants")
+    load_data._copy_data(db_cursor, iter(applicants), chunk_rows=2)
+    db_cursor.execute(select_rows)
+    copied = [row[1:] for row in db_cursor.fetchall()]
+    assert copied == inserted
+    assert len(copied) == 3
+
+
+@pytest.mark.load
+@pytest.mark.db
+def test_upsert_inserts_new_and_updates_changed_rows(db_cursor, tmp_path, monkeypatch):
+    """Tests that upsert mode only touches new or changed rows, matched on url."""
+    path = tmp_path / "applicant_data.json"
+    monkeypatch.setattr(load_data, "JSON_FILE_PATH", str(path))
+    first_run = sample_applicants()
+    first_run[2]["URL"] = "N/A"
+    path.write_text(json.dumps(first_run), encoding="utf-8")
+    load_data._upsert_data(db_cursor, "copy")
+    db_cursor.execute("SELECT id, url, applicant_status FROM applicants ORDER BY id")
+    before = db_cursor.fetchall()
+    assert [row[1] for row in before] == [a["URL"] for a in first_run[:2]]
+
+    second_run = sample_applicants()
+    second_run[1]["Applicant Status"] = "Accepted"
+    second_run.append(dict(second_run[0], **{"Comment": "duplicate link, ignored"}))
+    path.write_text(json.dumps(second_run), encoding="utf-8")
+    load_data._upsert_data(db_cursor, "copy")
+    assert load_data._upsert_incoming(db_cursor) == (0, 0, 3, 0)  # nothing left to change
+
+    db_cursor.execute("SELECT id, url, applicant_status, comment FROM applicants ORDER BY id")
+    after = db_cursor.fetchall()
+    assert [row[:2] for row in after[:2]] == [row[:2] for row in before]  # ids kept
+    assert after[1][2] == "Accepted"
+    assert after[0][3] == second_run[0]["Comment"]  # first row per url wins
+    assert after[2][1] == second_run[2]["URL"]
+
+
+@pytest.mark.load
+@pytest.mark.db
+def test_swap_replaces_table_contents(db_cursor, tmp_path, monkeypatch):
+    """Tests that swap mode renames the staging table into place, twice in a row."""
+    path = tmp_path / "applicant_data.json"
+    monkeypatch.setattr(load_data, "JSON_FILE_PATH", str(path))
+    load_data._create_applicants_table(db_cursor)
+    load_data._copy_data(db_cursor, [{"URL": "https://www.thegradcafe.com/result/old"}])
+
+    for applicants in (sample_applicants(), sample_applicants()[:1]):
+        path.write_text(json.dumps(applicants), encoding="utf-8")
+        load_data._create_applicants_table(db_cursor, load_data.STAGING_TABLE_NAME)
+        load_data._load_rows(db_cursor, "copy", load_data.STAGING_TABLE_NAME)
+        load_data._add_url_key(db_cursor, load_data.STAGING_TABLE_NAME)
+        load_data._create_indexes(db_cursor, load_data.STAGING_TABLE_NAME)
+        load_data._swap_in_staging_table(db_cursor)
+        db_cursor.execute("SELECT url FROM applicants ORDER BY id")
+        assert [row[0] for row in db_cursor.fetchall()] == [a["URL"] for a in applicants]
+
+    db_cursor.execute("SELECT to_regclass('applicants_staging'), to_regclass('applicants_url_key'),"
+                      " to_regclass('applicants_semester_status_idx')")
+    assert db_cursor.fetchone() == (None, "applicants_url_key", "applicants_semester_status_idx")
+
+
+@pytest.mark.load
+@pytest.mark.db
+def test_create_indexes_builds_secondary_indexes_once(db_cursor):
+    """Tests that the filter-column indexes are built and a second run leaves them alone."""
+    load_data._create_applicants_table(db_cursor)
+    load_data._copy_data(db_cursor, [load_data._clean_applicant(a) for a in sample_applicants()])
+    load_data._create_indexes(db_cursor, "applicants")
+    load_data._create_indexes(db_cursor, "applicants")
+    db_cursor.execute("SELECT indexname FROM pg_indexes"
+                      " WHERE tablename = 'applicants' AND schemaname = current_schema()")
+    indexes = {row[0] for row in db_cursor.fetchall()}
+    db_cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    have_trgm = db_cursor.fetchone() is not None
+    expected = {f"applicants_{suffix}" for suffix, _, _, opclass in load_data.SECONDARY_INDEXES
+                if opclass is None or have_trgm}
+    assert expected <= indexes
+
+
+@pytest.mark.load
+def test_copy_stream_numbers_rows_from_first_id():
+    """Tests that the parallel loader's chunks carry their position in the file as the id."""
+    applicants = [load_data._clean_applicant(a) for a in sample_applicants()]
+    stream = load_data.ApplicantCopyStream(applicants, chunk_rows=2, first_id=100)
+    lines = stream.read().splitlines() + stream.read().splitlines()
+    assert [line.split("\t", 1)[0] for line in lines] == ["100", "101", "102"]
+    assert lines[0].split("\t", 1)[1] + "\n" == load_data._to_copy_line(applicants[0])
+
+
+@pytest.mark.load
+@pytest.mark.db
+def test_parallel_load_keeps_file_order(committed_schema, tmp_path, monkeypatch, capsys):
+    """Tests that the parallel loader stores every record, in file order, and times each chunk."""
+    applicants = sample_applicants() * 7
+    for n, applicant in enumerate(applicants):
+        applicant["URL"] = f"https://www.thegradcafe.com/result/{n}"
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(applicants), encoding="utf-8")
+    monkeypatch.setattr(load_data, "JSON_FILE_PATH", str(path))
+
+    with committed_schema.cursor() as cur:
+        load_data._create_applicants_table(cur)
+        load_data._load_rows(cur, "parallel", "applicants", workers=3, chunk_rows=4)
+        cur.execute("SELECT url FROM applicants ORDER BY id")
+        assert [row[0] for row in cur.fetchall()] == [a["URL"] for a in applicants]
+        cur.execute(PARALLEL_TABLES_QUERY)
+        assert cur.fetchall() == []
+    assert capsys.readouterr().out.count("  chunk ") == 6
+
+
+@pytest.mark.load
+@pytest.mark.db
+def test_failed_parallel_load_drops_its_table(committed_schema, tmp_path, monkeypatch):
+    """Tests that the unlogged table is dropped when moving the staged rows fails."""
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(sample_applicants()), encoding="utf-8")
+    monkeypatch.setattr(load_data, "JSON_FILE_PATH", str(path))
+
+    with committed_schema.cursor() as cur:
+        with pytest.raises(psycopg2.Error):  # no table to move the rows into
+            load_data._load_rows(cur, "parallel", "applicants", workers=2, chunk_rows=2)
+        cur.execute(PARALLEL_TABLES_QUERY)
+        assert cur.fetchall() == []
+
+
+@pytest.mark.load
+@pytest.mark.db
+def test_failure_after_the_move_drops_the_table(committed_schema, tmp_path, monkeypatch):
+    """Tests that a step failing after the move does not roll the unlogged table back in."""
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(sample_applicants()), encoding="utf-8")
+    monkeypatch.setattr(load_data, "JSON_FILE_PATH", str(path))
+
+    def mismatched_summary(cur):
+        raise ValueError("summary mismatch")
+
+    monkeypatch.setattr(load_data, "_verify_summary", mismatched_summary)
+    load_data.main(method="parallel", verify_summary=True, workers=2, chunk_rows=2)
+    with committed_schema.cursor() as cur:
+        cur.execute(PARALLEL_TABLES_QUERY)
+        assert cur.fetchall() == []
+        cur.execute("SELECT to_regclass('applicants')")
+        assert cur.fetchone() == (None,)
+
+
+@pytest.mark.load
+def test_parse_decision_date_takes_year_from_date_added():
+    """Tests that year-less decision dates get the year they most likely fell in."""
+    added = datetime.date(2025, 2, 14)
+    assert load_data._parse_decision_date("12 Feb", added) == datetime.date(2025, 2, 12)
+    assert load_data._parse_decision_date("20 Dec", added) == datetime.date(2024, 12, 20)
+    assert load_data._parse_decision_date("29 Feb", datetime.date(2024, 3, 1)) == \
+        datetime.date(2024, 2, 29)
+    assert load_data._parse_decision_date("30 Feb", added) is None
+    assert load_data._parse_decision_date("12 Feb", None) is None
+
+
+@pytest.mark.load
+@pytest.mark.db
+def test_normalized_view_matches_flat_table(db_cursor, tmp_path, monkeypatch):
+    """Tests that the normalized layout's 'applicants' view returns the flat table's rows."""
+    applicants = sample_applicants() * 2
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(applicants), encoding="utf-8")
+    monkeypatch.setattr(load_data, "JSON_FILE_PATH", str(path))
+    columns = ", ".join(column for column, _, _ in load_data.APPLICANT_COLUMNS)
+
+    load_data._create_applicants_table(db_cursor)
+    load_data._load_rows(db_cursor, "copy", "applicants")
+    db_cursor.execute(f"SELECT id, {columns} FROM applicants ORDER BY id")
+    flat = db_cursor.fetchall()
+
+    load_data._load_normalized(db_cursor, "copy")
+    load_data._create_normalized_indexes(db_cursor)
+    db_cursor.execute(f"SELECT id, {columns} FROM applicants ORDER BY id")
+    assert db_cursor.fetchall() == flat
+    db_cursor.execute("SELECT decision_date, decided_on FROM applicants ORDER BY id LIMIT 2")
+    assert db_cursor.fetchall() == [("12 Feb", datetime.date(2025, 2, 12)), ("N/A", None)]
+    db_cursor.execute("SELECT COUNT(*) FROM universities")
+    assert db_cursor.fetchone()[0] == 3
+
+    load_data._create_applicants_table(db_cursor)  # back to the flat layout
+    db_cursor.execute("SELECT relkind FROM pg_class WHERE oid = 'applicants'::regclass")
+    assert db_cursor.fetchone()[0] == "r"
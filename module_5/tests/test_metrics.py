@@ -0,0 +1,164 @@
+# tests/test_metrics.py
+"""
+Tests for the dashboard metrics: formatting, the aggregate and summary
+queries, and the sync, async and JSON views that serve them.
+"""
+# The tests exercise module internals directly
+# pylint: disable=protected-access
+
+import asyncio
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+
+import app
+import db
+import load_data
+import metrics
+import query_data
+from tests.conftest import sample_applicants
+
+
+@pytest.fixture(name="loaded_schema")
+def fixture_loaded_schema(committed_schema):
+    """A committed throwaway schema holding the sample applicants, queried through the pool."""
+    with committed_schema.cursor() as cur:
+        load_data._create_applicants_table(cur)
+        applicants = sample_applicants() * 4
+        applicants[1] = dict(applicants[1], **{"Semester Start": "Fall 2025", "GPA": "3.2"})
+        load_data._copy_data(cur, [load_data._clean_applicant(a) for a in applicants])
+        load_data._refresh_summary(cur)
+    committed_schema.commit()
+    db.close_pool()  # reopen so pooled connections pick up the schema's search_path
+    app.query_cache.clear()
+    yield committed_schema
+    db.close_pool()
+    app.query_cache.clear()
+
+
+@pytest.mark.metrics
+def test_split_results_shapes_each_question():
+    """Tests that the single dashboard row is cut into the seven per-query result shapes."""
+    row = tuple(range(11))
+    assert metrics.split_results(row) == [[(0,)], [(1,)], [(2, 3, 4, 5, 6)], [(7,)], [(8,)],
+                                          [(9,)], [(10,)]]
+    assert metrics.split_results(None) == [[]] * 7
+
+
+@pytest.mark.metrics
+def test_summary_mismatches_tolerates_float_rounding_only():
+    """Tests that summed-in-another-order averages match but real differences are reported."""
+    raw = (8, Decimal("25.0"), 3.5000000000000004, None)
+    assert not metrics.summary_mismatches((8, Decimal("25.0"), 3.5, None), raw)
+    assert metrics.summary_mismatches((7, Decimal("25.0"), 3.5, 0), raw) == [(0, 7, 8),
+                                                                              (3, 0, None)]
+
+
+@pytest.mark.metrics
+def test_failed_dashboard_query_formats_like_failed_queries():
+    """Tests that a failed aggregate query shows the same messages the seven queries did."""
+    answers = [format_result(result) for format_result, result
+               in zip(app.QUERY_FORMATTERS, metrics.split_results(None))]
+    assert [answer for _, answer in answers] == [
+        "Query Failed", "Query Failed", "No Data", "No Data", "No Data", "No Data", "Query Failed"]
+    assert query_data._format_query_3_output([]).endswith("Query Failed or No Data")
+
+
+@pytest.mark.metrics
+def test_async_dashboard_runs_queries_concurrently(monkeypatch):
+    """Tests that the async page's seven queries overlap and come back in question order."""
+    threads = set()
+
+    def slow_execute_query(_query, _params=None):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.1)
+        return [(1,) * 5]
+
+    monkeypatch.setattr(app, "execute_query", slow_execute_query)
+    start = time.perf_counter()
+    concurrent = asyncio.run(app._get_dashboard_data_concurrently(semester="Spring 2026"))
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.4
+    assert len(threads) == 7 and all(name.startswith("dashboard-query") for name in threads)
+    assert concurrent == [get_data(*args) for get_data, args
+                          in app._question_calls(semester="Spring 2026")]
+
+
+@pytest.mark.metrics
+def test_async_route_renders_the_dashboard(monkeypatch):
+    """Tests that /async renders the same page as the concurrent answers."""
+    pytest.importorskip("asgiref")
+    monkeypatch.setattr(app, "execute_query", lambda query, params=None: [(1,) * 5])
+    response = app.app.test_client().get("/async")
+    assert response.status_code == 200
+    assert b"1. How many applicants for Fall 2025?" in response.data
+
+
+@pytest.mark.metrics
+@pytest.mark.db
+@pytest.mark.usefixtures("loaded_schema")
+def test_dashboard_query_matches_individual_queries():
+    """Tests that the one-scan dashboard gives the same answers as the seven separate queries."""
+    individual = [
+        app._get_query_1_data("Fall 2025"),
+        app._get_query_2_data(),
+        app._get_query_3_data(),
+        app._get_query_4_data("American", "Fall 2025"),
+        app._get_query_5_data("Fall 2025"),
+        app._get_query_6_data("Fall 2025", "Accepted"),
+        app._get_query_7_data("%Johns Hopkins%", "%Computer Science%", "Masters"),
+    ]
+    assert app._get_dashboard_data() == individual
+    assert asyncio.run(app._get_dashboard_data_concurrently()) == individual
+    assert individual[0] == ("1. How many applicants for Fall 2025?", "8")
+
+    outputs = [query_data._get_query_1_output(), query_data._get_query_2_output(),
+               query_data._get_query_3_output(), query_data._get_query_4_output(),
+               query_data._get_query_5_output(), query_data._get_query_6_output(),
+               query_data._get_query_7_output()]
+    assert query_data._get_dashboard_outputs() == outputs
+
+
+@pytest.mark.metrics
+@pytest.mark.db
+@pytest.mark.parametrize("filters", [
+    {},
+    {"semester": "Spring 2026", "student_type": "International", "status": "Rejected"},
+    {"university": "%MIT%", "program": "%", "degree": "PhD"},
+    {"semester": "Fall 1999"},
+])
+def test_summary_query_matches_raw_table(db_cursor, filters):
+    """Tests that the rollup answers every question like the raw applicants table."""
+    load_data._create_applicants_table(db_cursor)
+    load_data._copy_data(db_cursor,
+                         [load_data._clean_applicant(a) for a in sample_applicants() * 3])
+    load_data._refresh_summary(db_cursor)
+    load_data._verify_summary(db_cursor, **filters)
+
+
+@pytest.mark.metrics
+@pytest.mark.db
+def test_stale_summary_fails_verification(db_cursor):
+    """Tests that rows added after the rollup was built are caught by the check."""
+    load_data._create_applicants_table(db_cursor)
+    load_data._copy_data(db_cursor, [load_data._clean_applicant(a) for a in sample_applicants()])
+    load_data._refresh_summary(db_cursor)
+    load_data._copy_data(db_cursor, [load_data._clean_applicant(sample_applicants()[0])])
+    with pytest.raises(ValueError):
+        load_data._verify_summary(db_cursor)
+
+
+@pytest.mark.metrics
+@pytest.mark.db
+@pytest.mark.usefixtures("loaded_schema")
+def test_api_metrics_match_dashboard_results():
+    """Tests that /api/metrics reports the dashboard's numbers for the same filters."""
+    response = app.app.test_client().get("/api/metrics?university=johns%20hopkins")
+    assert response.status_code == 200
+    expected = [value for result in metrics.fetch_dashboard_results(app.execute_query)
+                for value in result[0]]
+    payload = response.get_json()["metrics"]  # jsonify sorts the keys, so compare by name
+    assert [payload[name] for name in metrics.METRIC_NAMES] == pytest.approx(
+        [float(value) if value is not None else None for value in expected])
@@ -0,0 +1,128 @@
+# tests/test_query_cache.py
+"""
+Tests for query_cache.py's per-data-version result cache.
+"""
+# The tests exercise module internals directly
+# pylint: disable=protected-access
+
+import psycopg2
+import pytest
+
+import load_data
+import query_cache
+from query_cache import FileBackend, MemoryBackend, QueryCache
+
+
+class FakeDatabase:  # pylint: disable=too-few-public-methods
+    """Stands in for db.execute_query: counts queries and reports a data version."""
+
+    def __init__(self):
+        self.version = 1
+        self.queries = []
+        self.fail = False
+
+    def execute_query(self, query, params=None):
+        """Returns the data version or a row echoing the params."""
+        if query is query_cache.DATA_VERSION_QUERY:
+            return [(self.version,)]
+        if self.fail:
+            raise psycopg2.OperationalError("server went away")
+        self.queries.append((query, params))
+        return [(params, len(self.queries))]
+
+
+@pytest.fixture(name="fake_db")
+def fixture_fake_db(monkeypatch):
+    """A FakeDatabase whose version changes are noticed immediately."""
+    monkeypatch.setattr(query_cache, "VERSION_CHECK_SECONDS", 0.0)
+    return FakeDatabase()
+
+
+@pytest.mark.cache
+def test_memory_backend_evicts_least_recently_used():
+    """Tests that the in-process LRU keeps the most recently used entries."""
+    backend = MemoryBackend(max_entries=2)
+    backend.put("a", 1, float("inf"))
+    backend.put("b", 2, float("inf"))
+    backend.get("a")
+    backend.put("c", 3, float("inf"))
+    assert backend.get("a") == (float("inf"), 1)
+    assert backend.get("b") is None
+    assert len(backend) == 2
+
+
+@pytest.mark.cache
+def test_expired_entries_are_not_served(fake_db):
+    """Tests that results older than the TTL are computed again."""
+    cache = QueryCache(ttl_seconds=0.0, execute_query=fake_db.execute_query)
+    cache.execute("SELECT 1", ("x",))
+    cache.execute("SELECT 1", ("x",))
+    assert len(fake_db.queries) == 2
+    assert cache.hits == 0
+
+
+@pytest.mark.cache
+def test_hits_and_misses_are_counted(fake_db):
+    """Tests that repeated queries are served from memory and counted."""
+    cache = QueryCache(execute_query=fake_db.execute_query)
+    first = cache.execute("SELECT 1", ("x",))
+    assert cache.execute("SELECT 1", ("x",)) == first
+    cache.execute("SELECT 1", ("y",))
+    assert len(fake_db.queries) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.stats()["memory_entries"] == 2
+
+
+@pytest.mark.cache
+def test_new_data_version_invalidates_results(fake_db):
+    """Tests that a load bumping the data version makes cached results stale."""
+    cache = QueryCache(execute_query=fake_db.execute_query)
+    cache.execute("SELECT 1", ("x",))
+    fake_db.version += 1
+    cache.execute("SELECT 1", ("x",))
+    assert len(fake_db.queries) == 2
+    assert cache.stats()["data_version"] == 2
+
+
+@pytest.mark.cache
+def test_failed_queries_are_not_cached(fake_db):
+    """Tests that an error is raised every time instead of being cached."""
+    cache = QueryCache(execute_query=fake_db.execute_query)
+    fake_db.fail = True
+    with pytest.raises(psycopg2.OperationalError):
+        cache.execute("SELECT 1")
+    fake_db.fail = False
+    cache.execute("SELECT 1")
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+@pytest.mark.cache
+def test_file_backend_is_shared_between_caches(fake_db, tmp_path):
+    """Tests that a result computed by one worker is served to another."""
+    first = QueryCache(shared_backend=FileBackend(tmp_path), execute_query=fake_db.execute_query)
+    second = QueryCache(shared_backend=FileBackend(tmp_path), execute_query=fake_db.execute_query)
+    rows = first.execute("SELECT 1", ("x",))
+    assert second.execute("SELECT 1", ("x",)) == rows
+    assert len(fake_db.queries) == 1
+    assert second.counters["shared_hits"] == 1
+    second.clear()
+    assert len(FileBackend(tmp_path)) == 0
+
+
+@pytest.mark.cache
+def test_file_backend_evicts_beyond_max_entries(tmp_path):
+    """Tests that the shared directory does not grow past its limit."""
+    backend = FileBackend(tmp_path, max_entries=3)
+    for n in range(5):
+        backend.put(f"key{n}", n, float("inf"))
+    assert len(backend) == 3
+
+
+@pytest.mark.cache
+@pytest.mark.db
+def test_each_load_bumps_the_data_version(db_cursor):
+    """Tests that the version stamp increases with every load."""
+    first = load_data._bump_data_version(db_cursor)
+    assert load_data._bump_data_version(db_cursor) == first + 1
+    db_cursor.execute(query_cache.DATA_VERSION_QUERY)
+    assert db_cursor.fetchall() == [(first + 1,)]
@@ -0,0 +1,234 @@
+# tests/test_snapshot.py
+"""
+Tests for snapshot.py's in-memory metrics snapshot against a reference
+evaluator and, with a database, against the SQL answers.
+"""
+# The tests exercise module internals directly
+# pylint: disable=protected-access
+
+import json
+import math
+import random
+import re
+
+import pytest
+
+import app
+import db
+import load_data
+import metrics
+import query_data
+import snapshot
+from snapshot import ApplicantSnapshot, _like_to_regex
+from tests.conftest import sample_applicants
+
+SEMESTERS = ["Fall 2025", "Spring 2026", "Fall 2024", "N/A"]
+STUDENT_TYPES = ["American", "International", "Other", "N/A"]
+STATUSES = ["Accepted", "Rejected", "Wait listed", "Interview"]
+UNIVERSITIES = ["Johns Hopkins University", "johns hopkins", "MIT", "Stanford University",
+                "100% U_niv"]
+PROGRAMS = ["Computer Science", "Applied Computer Science", "Statistics", "N/A"]
+FILTERS = [
+    {},
+    {"semester": "Spring 2026", "student_type": "International", "status": "Rejected"},
+    {"university": "%MIT%", "program": "%", "degree": "PhD"},
+    {"university": "%100\\%%", "program": "%sci%", "degree": "Masters"},
+    {"university": "_IT", "program": "Statistics", "degree": "PhD"},
+    {"semester": "Fall 1999", "student_type": "Nobody"},
+]
+
+
+def _synthetic_applicants(count, seed):
+    """Random records with every kind of missing and out-of-range value."""
+    rng = random.Random(seed)
+
+    def score(low, high):
+        return rng.choice(["N/A", None, str(round(rng.uniform(low, high), 2)), "abc"])
+
+    applicants = []
+    for n in range(count):
+        applicant = {
+            "University": rng.choice(UNIVERSITIES), "Program Name": rng.choice(PROGRAMS),
+            "Degree": rng.choice(["Masters", "PhD", "N/A"]),
+            "Applicant Status": rng.choice(STATUSES),
+            "Semester Start": rng.choice(SEMESTERS), "Student Type": rng.choice(STUDENT_TYPES),
+            "GPA": score(2.0, 4.5), "GRE Total": score(250, 345), "GRE V": score(125, 175),
+            "GRE Q": score(125, 175), "GRE AW": score(0, 6.5), "URL": f"https://example.com/{n}",
+        }
+        for key in rng.sample(sorted(applicant), 2):
+            del applicant[key]  # a missing key is NULL in the table
+        applicants.append(load_data._clean_applicant(applicant))
+    return applicants
+
+
+def _reference_row(applicants, **filters):
+    """DASHBOARD_QUERY evaluated record by record, with SQL's NULL semantics."""
+    params = {**metrics.DEFAULT_FILTERS, **filters}
+
+    def ilike(value, pattern):
+        return value is not None and _like_to_regex(pattern).fullmatch(value) is not None
+
+    def average(key, rows):
+        values = [float(row[key]) for row in rows if row.get(key) not in (None, "N/A")]
+        return sum(values) / len(values) if values else None
+
+    semester = [row for row in applicants if row.get("Semester Start") == params["semester"]]
+    international = [row for row in applicants if row.get("Student Type") == "International"]
+    accepted = [row for row in semester if row.get("Applicant Status") == "Accepted"]
+    return (
+        len(semester),
+        100.0 * len(international) / len(applicants) if applicants else None,
+        *(average(key, applicants) for key in ("GPA", "GRE Total", "GRE V", "GRE Q", "GRE AW")),
+        average("GPA", [row for row in semester
+                        if row.get("Student Type") == params["student_type"]]),
+        100.0 * len(accepted) / len(semester) if semester else None,
+        average("GPA", [row for row in semester
+                        if row.get("Applicant Status") == params["status"]]),
+        sum(1 for row in applicants if ilike(row.get("University"), params["university"])
+            and ilike(row.get("Program Name"), params["program"])
+            and row.get("Degree") == params["degree"]),
+    )
+
+
+def _assert_rows_match(actual, expected):
+    assert len(actual) == len(expected) == len(metrics.METRIC_NAMES)
+    for name, got, want in zip(metrics.METRIC_NAMES, actual, expected):
+        if want is None:
+            assert got is None, name
+        else:
+            assert math.isclose(float(got), float(want), rel_tol=1e-9), (name, got, want)
+
+
+@pytest.mark.snapshot
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("filters", FILTERS)
+def test_snapshot_matches_record_by_record_answers(seed, filters):
+    """Tests that the vectorized answers equal a plain evaluation of the SQL for any filters."""
+    applicants = _synthetic_applicants(500, seed)
+    _assert_rows_match(ApplicantSnapshot.from_records(applicants).dashboard_row(**filters),
+                       _reference_row(applicants, **filters))
+
+
+@pytest.mark.snapshot
+def test_empty_snapshot_answers_like_an_empty_table():
+    """Tests that no rows give zero counts and no averages or percentages."""
+    row = ApplicantSnapshot.from_records([]).dashboard_row()
+    assert row == (0, None, None, None, None, None, None, None, None, None, 0)
+
+
+@pytest.mark.snapshot
+@pytest.mark.parametrize("pattern, text, matches", [
+    ("%Johns Hopkins%", "The JOHNS HOPKINS University", True),
+    ("MIT", "mit", True),
+    ("M_T", "MIT", True),
+    ("M_T", "MIIT", False),
+    ("100\\%%", "100% U", True),
+    ("100\\%%", "1000 U", False),
+    ("a.c", "abc", False),
+    ("%", "", True),
+])
+def test_like_patterns_follow_postgres(pattern, text, matches):
+    """Tests that ILIKE wildcards, escapes and case folding are translated faithfully."""
+    assert bool(_like_to_regex(pattern).fullmatch(text)) is matches
+
+
+@pytest.mark.snapshot
+def test_bitmap_indexes_cover_each_value():
+    """Tests that each distinct value's bitmap marks exactly its rows."""
+    applicants = _synthetic_applicants(100, 4)
+    built = ApplicantSnapshot.from_records(applicants)
+    for column in snapshot.BITMAP_COLUMNS:
+        codes, lookup = built.columns[column]
+        assert sorted(built.bitmaps[column]) == sorted(lookup)
+        for value, bitmap in built.bitmaps[column].items():
+            assert snapshot._count(bitmap) == int((codes == lookup[value]).sum())
+
+
+@pytest.mark.snapshot
+def test_snapshot_from_file_reads_like_the_loader(tmp_path):
+    """Tests that a file snapshot is cleaned like load_data.py would load it."""
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(sample_applicants() * 2), encoding="utf-8")
+    built = ApplicantSnapshot.from_file(path)
+    assert built.row_count == 6 and built.version.startswith("file-")
+    _assert_rows_match(built.dashboard_row(), _reference_row(
+        [load_data._clean_applicant(a) for a in sample_applicants() * 2]))
+
+
+@pytest.mark.snapshot
+def test_app_serves_metrics_from_the_snapshot(tmp_path, monkeypatch):
+    """Tests that the page and the API answer from the snapshot without touching the database."""
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(sample_applicants() * 2), encoding="utf-8")
+
+    def no_database(query, params=None):
+        raise AssertionError("queried the database")
+
+    monkeypatch.setattr(app, "execute_query", no_database)
+    monkeypatch.setattr(app, "snapshot_store", snapshot.SnapshotStore(str(path)))
+    client = app.app.test_client()
+    assert b"How many applicants for Fall 2025?" in client.get("/").data
+    response = client.get("/api/metrics?semester=Fall%202025")
+    assert response.get_json()["metrics"]["semester_applicants"] == 4
+    assert re.fullmatch(r'"file-\d+-[0-9a-f]{16}"', response.headers["ETag"])
+
+
+@pytest.mark.snapshot
+def test_app_falls_back_to_sql_without_a_database(monkeypatch):
+    """Tests that a database snapshot is built on first use and SQL answers while it cannot be."""
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    db.close_pool()
+    store = snapshot.SnapshotStore(snapshot.DATABASE_SOURCE)  # reads nothing yet
+    assert store.snapshot is None
+    row = ApplicantSnapshot.from_records(
+        load_data._clean_applicant(a) for a in sample_applicants()).dashboard_row()
+
+    monkeypatch.setattr(app, "execute_query", lambda query, params=None: [row])
+    monkeypatch.setattr(app, "snapshot_store", store)
+    response = app.app.test_client().get("/api/metrics")
+    assert response.status_code == 200
+    assert response.get_json()["metrics"]["semester_applicants"] == row[0]
+    assert store.snapshot is None
+
+
+@pytest.mark.snapshot
+def test_script_falls_back_to_sql_without_a_database(monkeypatch, capsys):
+    """Tests that query_data.py answers with SQL when the snapshot cannot be built."""
+    monkeypatch.setenv("METRICS_BACKEND", "snapshot")
+    monkeypatch.delenv("SNAPSHOT_SOURCE", raising=False)
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    db.close_pool()
+    row = ApplicantSnapshot.from_records(
+        load_data._clean_applicant(a) for a in sample_applicants()).dashboard_row()
+
+    monkeypatch.setattr(query_data, "execute_query", lambda query, params=None: [row])
+    outputs = query_data._get_dashboard_outputs()
+    assert outputs[0] == f"1. Applicants for Fall 2025: {row[0]}"
+    assert "Snapshot unavailable" in capsys.readouterr().out
+
+
+@pytest.mark.snapshot
+@pytest.mark.db
+@pytest.mark.parametrize("filters", FILTERS)
+def test_snapshot_matches_sql_answers(db_cursor, filters):
+    """Tests that file and table snapshots give DASHBOARD_QUERY's answers."""
+    applicants = _synthetic_applicants(300, 5)
+    integer_keys = ("GRE Total", "GRE V", "GRE Q")  # INTEGER columns in the table
+    applicants = [dict(a, **{key: a[key].split(".")[0] for key in integer_keys
+                             if a.get(key) not in (None, "N/A")}) for a in applicants]
+    load_data._create_applicants_table(db_cursor)
+    load_data._copy_data(db_cursor, [dict(a) for a in applicants])
+
+    def execute_query(query, params=None):
+        db_cursor.execute(query, params)
+        return db_cursor.fetchall()
+
+    db_cursor.execute(metrics.DASHBOARD_QUERY, {**metrics.DEFAULT_FILTERS, **filters})
+    expected = db_cursor.fetchone()
+    _assert_rows_match(ApplicantSnapshot.from_records(applicants).dashboard_row(**filters),
+                       expected)
+    db_cursor.execute("CREATE TABLE data_version (version INTEGER)")
+    db_cursor.execute("INSERT INTO data_version VALUES (42)")
+    from_table = ApplicantSnapshot.from_database(execute_query)
+    assert from_table.version == 42 and from_table.row_count == len(applicants)
+    _assert_rows_match(from_table.dashboard_row(**filters), expected)